@@ -0,0 +1,80 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import func, select
+
+from airflow.api_connexion import security
+from airflow.api_connexion.exceptions import NotFound
+from airflow.api_connexion.parameters import apply_sorting, check_limit, format_parameters
+from airflow.api_connexion.schemas.dag_parsing_profile_schema import (
+    DagParsingProfileCollection,
+    dag_parsing_profile_collection_schema,
+    dag_parsing_profile_schema,
+)
+from airflow.models.dagcode import DagCode
+from airflow.models.dagparsingprofile import DagParsingProfile
+from airflow.security import permissions
+from airflow.utils.session import NEW_SESSION, provide_session
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from airflow.api_connexion.types import APIResponse
+
+
+@security.requires_access([(permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG_CODE)])
+@provide_session
+def get_dag_parsing_profile(*, file_token: str, session: Session = NEW_SESSION) -> APIResponse:
+    """Get the profile of the last parse of a DAG file."""
+    auth_s = URLSafeSerializer(current_app.config["SECRET_KEY"])
+    try:
+        path = auth_s.loads(file_token)
+    except BadSignature:
+        raise NotFound("DAG parsing profile not found")
+    profile = session.get(DagParsingProfile, DagCode.dag_fileloc_hash(path))
+    if profile is None:
+        raise NotFound(
+            "DAG parsing profile not found",
+            detail="The DAG file was not parsed since [scheduler] enable_dag_parsing_profiling was set",
+        )
+    return dag_parsing_profile_schema.dump(profile)
+
+
+@security.requires_access([(permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG_CODE)])
+@format_parameters({"limit": check_limit})
+@provide_session
+def get_dag_parsing_profiles(
+    *,
+    limit: int,
+    offset: int | None = None,
+    order_by: str = "-duration",
+    session: Session = NEW_SESSION,
+) -> APIResponse:
+    """Get the profiles of the last parse of all DAG files."""
+    allowed_filter_attrs = ["fileloc", "timestamp", "duration", "peak_rss"]
+    total_entries = session.scalars(func.count(DagParsingProfile.fileloc_hash)).one()
+    query = select(DagParsingProfile)
+    query = apply_sorting(query, order_by, allowed_attrs=allowed_filter_attrs)
+    profiles = session.scalars(query.offset(offset).limit(limit)).all()
+    return dag_parsing_profile_collection_schema.dump(
+        DagParsingProfileCollection(dag_parsing_profiles=profiles, total_entries=total_entries)
+    )
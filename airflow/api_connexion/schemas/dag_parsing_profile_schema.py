@@ -0,0 +1,58 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from marshmallow import Schema, fields
+from marshmallow_sqlalchemy import SQLAlchemySchema, auto_field
+
+from airflow.models.dagparsingprofile import DagParsingProfile
+
+
+class DagParsingProfileSchema(SQLAlchemySchema):
+    """DAG parsing profile schema."""
+
+    class Meta:
+        """Meta."""
+
+        model = DagParsingProfile
+
+    fileloc = auto_field(dump_only=True)
+    timestamp = auto_field(format="iso", dump_only=True)
+    duration = auto_field(dump_only=True)
+    peak_rss = auto_field(dump_only=True)
+    phases = fields.Dict(keys=fields.String(), values=fields.Float(), dump_only=True)
+    imports = fields.Dict(keys=fields.String(), values=fields.Float(), dump_only=True)
+
+
+class DagParsingProfileCollection(NamedTuple):
+    """List of DAG parsing profiles with metadata."""
+
+    dag_parsing_profiles: list[DagParsingProfile]
+    total_entries: int
+
+
+class DagParsingProfileCollectionSchema(Schema):
+    """DAG parsing profile collection schema."""
+
+    dag_parsing_profiles = fields.List(fields.Nested(DagParsingProfileSchema))
+    total_entries = fields.Int()
+
+
+dag_parsing_profile_schema = DagParsingProfileSchema()
+dag_parsing_profile_collection_schema = DagParsingProfileCollectionSchema()
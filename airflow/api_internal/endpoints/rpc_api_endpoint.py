@@ -40,6 +40,7 @@ def _initialize_map() -> dict[str, Callable]:
     from airflow.dag_processing.processor import DagFileProcessor
     from airflow.models import Trigger, Variable, XCom
     from airflow.models.dag import DAG, DagModel
+    from airflow.models.dagparsingprofile import DagParsingProfile
     from airflow.models.dagrun import DagRun
     from airflow.models.dagwarning import DagWarning
     from airflow.models.serialized_dag import SerializedDagModel
@@ -50,10 +51,14 @@ def _initialize_map() -> dict[str, Callable]:
         DagFileProcessor.update_import_errors,
         DagFileProcessor.manage_slas,
         DagFileProcessorManager.deactivate_stale_dags,
+        DagFileProcessorManager.get_live_dag_processor_job_ids,
         DagModel.deactivate_deleted_dags,
         DagModel.get_paused_dag_ids,
         DagModel.get_current,
         DagFileProcessorManager.clear_nonexistent_import_errors,
+        DagFileProcessorManager.mark_dags_of_unchanged_files_parsed,
+        DagParsingProfile.remove_deleted_profiles,
+        DagParsingProfile.write,
         DagWarning.purge_inactive_dag_warnings,
         Job._add_to_db,
         Job._fetch_from_db,
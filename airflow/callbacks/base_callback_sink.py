@@ -17,7 +17,7 @@
 # under the License.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
     from airflow.callbacks.callback_requests import CallbackRequest
@@ -29,3 +29,8 @@ class BaseCallbackSink:
     def send(self, callback: CallbackRequest) -> None:
         """Send callback for execution."""
         raise NotImplementedError()
+
+    def send_many(self, callbacks: Iterable[CallbackRequest]) -> None:
+        """Send callbacks for execution, in one go if the sink supports it."""
+        for callback in callbacks:
+            self.send(callback)
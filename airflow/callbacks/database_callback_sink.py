@@ -17,7 +17,7 @@
 # under the License.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from airflow.callbacks.base_callback_sink import BaseCallbackSink
 from airflow.models.db_callback_request import DbCallbackRequest
@@ -37,3 +37,8 @@ class DatabaseCallbackSink(BaseCallbackSink):
         """Send callback for execution."""
         db_callback = DbCallbackRequest(callback=callback, priority_weight=10)
         session.add(db_callback)
+
+    @provide_session
+    def send_many(self, callbacks: Iterable[CallbackRequest], session: Session = NEW_SESSION) -> None:
+        """Send callbacks for execution, in a single transaction."""
+        session.add_all(DbCallbackRequest(callback=callback, priority_weight=10) for callback in callbacks)
@@ -166,6 +166,20 @@ ARG_SUBDIR = Arg(
     ),
     default="[AIRFLOW_HOME]/dags" if BUILD_DOCS else settings.DAGS_FOLDER,
 )
+ARG_DAG_PARSING_PARALLELISM = Arg(
+    ("--parallelism",),
+    help="Number of processes to parse the DAG files with. Defaults to parsing them sequentially.",
+    type=positive_int(allow_zero=False),
+    default=1,
+)
+ARG_DAG_REPORT_PROFILE = Arg(
+    ("--profile",),
+    help=(
+        "Instead of parsing the DAG files, show where the DAG processor spent its time on the last "
+        "parse of each of them. Requires [scheduler] enable_dag_parsing_profiling to be set."
+    ),
+    action="store_true",
+)
 ARG_START_DATE = Arg(("-s", "--start-date"), help="Override start_date YYYY-MM-DD", type=parsedate)
 ARG_END_DATE = Arg(("-e", "--end-date"), help="Override end_date YYYY-MM-DD", type=parsedate)
 ARG_OUTPUT_PATH = Arg(
@@ -1023,7 +1037,7 @@ DAGS_COMMANDS = (
         name="list",
         help="List all the DAGs",
         func=lazy_load_command("airflow.cli.commands.dag_command.dag_list_dags"),
-        args=(ARG_SUBDIR, ARG_OUTPUT, ARG_VERBOSE),
+        args=(ARG_SUBDIR, ARG_DAG_PARSING_PARALLELISM, ARG_OUTPUT, ARG_VERBOSE),
     ),
     ActionCommand(
         name="list-import-errors",
@@ -1035,7 +1049,7 @@ DAGS_COMMANDS = (
         name="report",
         help="Show DagBag loading report",
         func=lazy_load_command("airflow.cli.commands.dag_command.dag_report"),
-        args=(ARG_SUBDIR, ARG_OUTPUT, ARG_VERBOSE),
+        args=(ARG_SUBDIR, ARG_DAG_PARSING_PARALLELISM, ARG_DAG_REPORT_PROFILE, ARG_OUTPUT, ARG_VERBOSE),
     ),
     ActionCommand(
         name="list-runs",
@@ -1254,6 +1268,7 @@ DAGS_COMMANDS = (
         args=(
             ARG_CLEAR_ONLY,
             ARG_SUBDIR,
+            ARG_DAG_PARSING_PARALLELISM,
             ARG_VERBOSE,
         ),
     ),
@@ -1943,6 +1958,17 @@ core_commands: list[CLICommand] = [
             '        pkill -f -USR2 "airflow scheduler"'
         ),
     ),
+    ActionCommand(
+        name="scheduler-profile",
+        help="Display the per-phase profile of the scheduler loop",
+        description=(
+            "Display the wall time, DB round-trips and rows fetched of each phase of the scheduler "
+            "loop, over the last loops of the scheduler running on this host. The scheduler must run "
+            "with [scheduler] enable_profiling set to True."
+        ),
+        func=lazy_load_command("airflow.cli.commands.scheduler_command.scheduler_profile"),
+        args=(ARG_OUTPUT, ARG_VERBOSE),
+    ),
     ActionCommand(
         name="triggerer",
         help="Start a triggerer instance",
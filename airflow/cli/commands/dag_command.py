@@ -22,13 +22,14 @@ import errno
 import json
 import logging
 import operator
+import os
 import signal
 import subprocess
 import sys
 import warnings
 from typing import TYPE_CHECKING
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, or_, select
 
 from airflow import settings
 from airflow.api.client import get_current_api_client
@@ -39,6 +40,7 @@ from airflow.exceptions import AirflowException, RemovedInAirflow3Warning
 from airflow.jobs.job import Job
 from airflow.models import DagBag, DagModel, DagRun, TaskInstance
 from airflow.models.dag import DAG
+from airflow.models.dagparsingprofile import DagParsingProfile
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.utils import cli as cli_utils, timezone
 from airflow.utils.cli import get_dag, get_dags, process_subdir, sigint_handler, suppress_logs_and_warning
@@ -353,7 +355,7 @@ def dag_next_execution(args) -> None:
 @providers_configuration_loaded
 def dag_list_dags(args) -> None:
     """Display dags with or without stats at the command line."""
-    dagbag = DagBag(process_subdir(args.subdir))
+    dagbag = DagBag(process_subdir(args.subdir), parallelism=args.parallelism)
     if dagbag.import_errors:
         from rich import print as rich_print
 
@@ -416,7 +418,10 @@ def dag_list_import_errors(args) -> None:
 @providers_configuration_loaded
 def dag_report(args) -> None:
     """Display dagbag stats at the command line."""
-    dagbag = DagBag(process_subdir(args.subdir))
+    if args.profile:
+        _dag_parsing_profile_report(args)
+        return
+    dagbag = DagBag(process_subdir(args.subdir), parallelism=args.parallelism)
     AirflowConsole().print_as(
         data=dagbag.dagbag_stats,
         output=args.output,
@@ -430,6 +435,46 @@ def dag_report(args) -> None:
     )
 
 
+@provide_session
+def _dag_parsing_profile_report(args, session: Session = NEW_SESSION) -> None:
+    """Display the profiles of the last parse of the DAG files by the DAG processor."""
+    subdir = process_subdir(args.subdir)
+    profiles = session.scalars(
+        select(DagParsingProfile)
+        .where(
+            or_(
+                DagParsingProfile.fileloc == subdir,
+                DagParsingProfile.fileloc.startswith(os.path.join(subdir, "")),
+            )
+        )
+        .order_by(DagParsingProfile.duration.desc())
+    ).all()
+    if not profiles:
+        raise SystemExit(
+            f"No DAG parsing profile found for {subdir}. "
+            "Make sure the DAG processor runs with [scheduler] enable_dag_parsing_profiling set to True."
+        )
+
+    def _format_profile(profile: DagParsingProfile) -> dict:
+        if args.output in ("json", "yaml"):
+            imports = profile.imports
+        else:
+            # Only the slowest imports fit in a table
+            imports = ", ".join(
+                f"{module}: {duration:.3f}s" for module, duration in list(profile.imports.items())[:5]
+            )
+        return {
+            "file": profile.fileloc,
+            "timestamp": profile.timestamp.isoformat(),
+            "duration": round(profile.duration, 3),
+            **{phase: round(duration, 3) for phase, duration in profile.phases.items()},
+            "peak_rss_mb": round(profile.peak_rss / 2**20, 1) if profile.peak_rss is not None else None,
+            "slowest_imports": imports,
+        }
+
+    AirflowConsole().print_as(data=profiles, output=args.output, mapper=_format_profile)
+
+
 @cli_utils.action_cli
 @suppress_logs_and_warning
 @providers_configuration_loaded
@@ -543,5 +588,5 @@ def dag_reserialize(args, session: Session = NEW_SESSION) -> None:
     session.execute(delete(SerializedDagModel).execution_options(synchronize_session=False))
 
     if not args.clear_only:
-        dagbag = DagBag(process_subdir(args.subdir))
+        dagbag = DagBag(process_subdir(args.subdir), parallelism=args.parallelism)
         dagbag.sync_to_db(session=session)
@@ -27,14 +27,23 @@ from daemon.pidfile import TimeoutPIDLockFile
 
 from airflow import settings
 from airflow.api_internal.internal_api_call import InternalApiConfig
+from airflow.cli.simple_table import AirflowConsole
 from airflow.configuration import conf
 from airflow.executors.executor_loader import ExecutorLoader
 from airflow.jobs.job import Job, run_job
 from airflow.jobs.scheduler_job_runner import SchedulerJobRunner
 from airflow.utils import cli as cli_utils
-from airflow.utils.cli import process_subdir, setup_locations, setup_logging, sigint_handler, sigquit_handler
+from airflow.utils.cli import (
+    process_subdir,
+    setup_locations,
+    setup_logging,
+    sigint_handler,
+    sigquit_handler,
+    suppress_logs_and_warning,
+)
 from airflow.utils.providers_configuration_loader import providers_configuration_loaded
 from airflow.utils.scheduler_health import serve_health_check
+from airflow.utils.scheduler_profiler import get_profile_path, read_profile
 
 log = logging.getLogger(__name__)
 
@@ -85,6 +94,29 @@ def scheduler(args):
         _run_scheduler_job(job_runner, skip_serve_logs=args.skip_serve_logs)
 
 
+@cli_utils.action_cli(check_db=False)
+@suppress_logs_and_warning
+@providers_configuration_loaded
+def scheduler_profile(args):
+    """Display the per-phase profile of the scheduler loop of the scheduler running on this host."""
+    profile = read_profile()
+    if profile is None:
+        raise SystemExit(
+            f"No scheduler profile found at {get_profile_path()}. "
+            "Make sure the scheduler runs with [scheduler] enable_profiling set to True."
+        )
+    if args.output in ("table", "plain"):
+        print(
+            f"Scheduler (pid {profile['pid']}) profile over the last {profile['window_loops']} of "
+            f"{profile['total_loops']} loops, updated at {profile['updated_at']}"
+        )
+    AirflowConsole().print_as(
+        data=list(profile["phases"].items()),
+        output=args.output,
+        mapper=lambda x: {"phase": x[0], **x[1]},
+    )
+
+
 @contextmanager
 def _serve_logs(skip_serve_logs: bool = False):
     """Start serve_logs sub-process."""
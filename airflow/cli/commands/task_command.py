@@ -209,7 +209,11 @@ def _run_task_by_selected_method(args, dag: DAG, ti: TaskInstance) -> None | Tas
     - using LocalTaskJob
     - as raw task
     - by executor
+
+    The LocalExecutor can also ask for a lightweight task to be run in process rather than by a LocalTaskJob.
     """
+    if args.local and getattr(args, "lightweight", False):
+        return _run_task_in_process(args, ti)
     if args.local:
         return _run_task_by_local_task_job(args, ti)
     if args.raw:
@@ -282,6 +286,34 @@ def _run_task_by_local_task_job(args, ti: TaskInstance) -> TaskReturnCode | None
     return None
 
 
+def _run_task_in_process(args, ti: TaskInstance) -> TaskReturnCode | None:
+    """
+    Run the task in the current process, without a LocalTaskJob monitoring it.
+
+    This saves the job and the process it starts to run the task, which dominate the runtime of very
+    short tasks. As the task does not heartbeat, it is not detected as a zombie if its process dies, and
+    it is not stopped when its state is changed externally.
+    """
+    if not ti.check_and_change_state_before_execution(
+        mark_success=args.mark_success,
+        ignore_all_deps=args.ignore_all_dependencies,
+        ignore_depends_on_past=should_ignore_depends_on_past(args),
+        wait_for_past_depends_before_skipping=(args.depends_on_past == "wait"),
+        ignore_task_deps=args.ignore_dependencies,
+        ignore_ti_state=args.force,
+        pool=args.pool,
+        external_executor_id=_extract_external_executor_id(args),
+    ):
+        log.info("Task is not able to be run")
+        return None
+    return_code = ti._run_raw_task(mark_success=args.mark_success, pool=args.pool)
+    if return_code != TaskReturnCode.DEFERRED and conf.getboolean(
+        "scheduler", "schedule_after_task_execution", fallback=True
+    ):
+        ti.schedule_downstream_tasks()
+    return return_code
+
+
 RAW_TASK_UNSUPPORTED_OPTION = [
     "ignore_all_dependencies",
     "ignore_depends_on_past",
@@ -0,0 +1,334 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Watchers reporting the changes of the files in the DAGs directory, so it does not need to be re-listed."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno as errno_codes
+import logging
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Generator, NamedTuple
+
+from airflow.configuration import conf
+from airflow.utils.file import walk_not_ignored
+
+log = logging.getLogger(__name__)
+
+IGNORE_FILE_NAME = ".airflowignore"
+
+
+class DagDirectoryChanges(NamedTuple):
+    """
+    Changes of the DAGs directory since they were last read from a watcher.
+
+    :param paths: Paths of the files created, modified or deleted, and of the directories deleted.
+    :param rescan: Whether the directory must be listed again, as the watcher could not keep track of
+        its changes, e.g. when it was just started.
+    """
+
+    paths: set[str]
+    rescan: bool
+
+
+class BaseDagDirectoryWatcher:
+    """
+    Watch the files of a directory and its subdirectories, following symbolic links.
+
+    The directories and files ignored by the ``.airflowignore`` files are not watched, except for the
+    ``.airflowignore`` files themselves.
+
+    :param directory: Directory to watch.
+    :param ignore_file_syntax: Syntax of the patterns of the ``.airflowignore`` files: regexp or glob.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        ignore_file_syntax: str = conf.get_mandatory_value(
+            "core", "DAG_IGNORE_FILE_SYNTAX", fallback="regexp"
+        ),
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.ignore_file_syntax = ignore_file_syntax
+
+    def _walk(self, directory: str | None = None) -> Generator[tuple[str, list[str]], None, None]:
+        """Walk the directory, or one of its subdirectories, yielding the files not ignored in each."""
+        for root, files, is_ignored in walk_not_ignored(
+            self.directory, IGNORE_FILE_NAME, self.ignore_file_syntax, start_dir_path=directory
+        ):
+            yield root, [
+                file for file in files if file == IGNORE_FILE_NAME or not is_ignored(Path(root) / file)
+            ]
+
+    def get_changes(self) -> DagDirectoryChanges:
+        """
+        Return the changes of the directory since the last call.
+
+        The first call starts watching the directory, and asks for it to be listed.
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """Stop watching the directory."""
+
+
+class PollingDagDirectoryWatcher(BaseDagDirectoryWatcher):
+    """
+    Find the changes of the files of a directory by comparing their modification times and sizes.
+
+    This walks the directory at most once every ``poll_interval`` seconds, but does not read the files
+    themselves, unlike listing the DAG files.
+
+    :param directory: Directory to watch.
+    :param poll_interval: Minimum number of seconds between two walks of the directory.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], poll_interval: float, **kwargs) -> None:
+        super().__init__(directory, **kwargs)
+        self.poll_interval = poll_interval
+        self._snapshot: dict[str, tuple[float, int]] | None = None
+        self._last_poll_time = 0.0
+
+    def _take_snapshot(self) -> dict[str, tuple[float, int]]:
+        snapshot = {}
+        for root, files in self._walk():
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # Deleted while walking the directory, or a broken link
+                    continue
+                snapshot[path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    def get_changes(self) -> DagDirectoryChanges:
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._last_poll_time < self.poll_interval:
+            return DagDirectoryChanges(paths=set(), rescan=False)
+        self._last_poll_time = now
+        snapshot, previous_snapshot = self._take_snapshot(), self._snapshot
+        self._snapshot = snapshot
+        if previous_snapshot is None:
+            return DagDirectoryChanges(paths=set(), rescan=True)
+        paths = {path for path, stat in snapshot.items() if previous_snapshot.get(path) != stat}
+        paths.update(path for path in previous_snapshot if path not in snapshot)
+        return DagDirectoryChanges(paths=paths, rescan=False)
+
+
+# Constants of inotify, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    return libc
+
+
+class InotifyDagDirectoryWatcher(BaseDagDirectoryWatcher):
+    """
+    Find the changes of the files of a directory with Linux inotify.
+
+    Every subdirectory is watched, and new subdirectories are watched as they are created. The
+    directory is listed again when the kernel event queue overflows, when an ``.airflowignore`` file
+    changes, or when the directory is a symbolic link which was changed to point to another directory,
+    e.g. by git-sync.
+
+    If some subdirectories cannot be watched, e.g. when reaching the ``max_user_watches`` limit of
+    inotify, the directory is listed again every ``poll_interval`` seconds instead.
+
+    :param directory: Directory to watch.
+    :param libc: The C library to call inotify functions of.
+    :param poll_interval: Minimum number of seconds between two listings of the directory, when some of
+        its subdirectories cannot be watched.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str], libc: ctypes.CDLL, poll_interval: float, **kwargs
+    ) -> None:
+        super().__init__(directory, **kwargs)
+        self._libc = libc
+        self.poll_interval = poll_interval
+        self._fd: int | None = None
+        self._paths_by_wd: dict[int, str] = {}
+        self._real_directory: str | None = None
+        self._unwatched_directories = 0
+        self._start_time = 0.0
+
+    def _start(self) -> None:
+        self.close()
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        self._fd = fd
+        self._real_directory = os.path.realpath(self.directory)
+        self._unwatched_directories = 0
+        self._start_time = time.monotonic()
+        self._watch_tree()
+        if self._unwatched_directories:
+            log.warning(
+                "Could not watch %d directories of %s, listing it every %s seconds to find their changes",
+                self._unwatched_directories,
+                self.directory,
+                self.poll_interval,
+            )
+
+    def _watch_tree(self, directory: str | None = None) -> set[str]:
+        """Watch a directory and its subdirectories which are not ignored, and return the files in them."""
+        files = set()
+        for root, dir_files in self._walk(directory):
+            self._watch(root)
+            files.update(os.path.join(root, file) for file in dir_files)
+        return files
+
+    def _watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno in (errno_codes.ENOENT, errno_codes.ENOTDIR):
+                # The directory was deleted since it was found, its events will follow
+                log.debug("Could not watch %s: %s", directory, os.strerror(errno))
+                return
+            if not self._unwatched_directories:
+                log.warning("Could not watch %s: %s", directory, os.strerror(errno))
+            self._unwatched_directories += 1
+            return
+        # A directory reachable through several symbolic links is only watched through one of them
+        self._paths_by_wd.setdefault(wd, directory)
+
+    def _read_events(self) -> bytes:
+        if self._fd is None:
+            return b""
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def get_changes(self) -> DagDirectoryChanges:
+        if (
+            self._fd is None
+            or os.path.realpath(self.directory) != self._real_directory
+            or (self._unwatched_directories and time.monotonic() - self._start_time >= self.poll_interval)
+        ):
+            # Also try again to watch the directories which could not be, e.g. if the limit was raised
+            self._start()
+            return DagDirectoryChanges(paths=set(), rescan=True)
+
+        data = self._read_events()
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                log.warning("Too many changes in %s to keep track of, listing it again", self.directory)
+                self._start()
+                return DagDirectoryChanges(paths=set(), rescan=True)
+            if mask & IN_IGNORED:
+                # The watched directory was deleted, its deletion is reported by its parent
+                self._paths_by_wd.pop(wd, None)
+                continue
+            directory = self._paths_by_wd.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if directory == self.directory:
+                    self._start()
+                    return DagDirectoryChanges(paths=set(), rescan=True)
+                continue
+
+            path = os.path.join(directory, name)
+            if name == IGNORE_FILE_NAME:
+                # Directories which were ignored may not be anymore, and the other way round
+                self._start()
+                return DagDirectoryChanges(paths=set(), rescan=True)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                paths.update(self._watch_tree(path))
+            else:
+                if mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                    # Forget the subdirectories moved away, they are watched again if moved in the tree
+                    self._paths_by_wd = {
+                        wd: p
+                        for wd, p in self._paths_by_wd.items()
+                        if p != path and not p.startswith(path + os.sep)
+                    }
+                paths.add(path)
+        return DagDirectoryChanges(paths=paths, rescan=False)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._paths_by_wd.clear()
+
+
+def get_dag_directory_watcher(
+    backend: str, directory: str | os.PathLike[str], poll_interval: float
+) -> BaseDagDirectoryWatcher:
+    """
+    Return a watcher of the DAGs directory.
+
+    :param backend: ``inotify``, falling back to polling when inotify is not available, or ``polling``.
+    :param directory: Directory to watch.
+    :param poll_interval: Minimum number of seconds between two walks of the directory when polling.
+    """
+    if backend == "inotify":
+        libc = _load_libc()
+        if libc is not None:
+            return InotifyDagDirectoryWatcher(directory, libc, poll_interval)
+        log.warning("inotify is not available on this system, polling %s for changes instead", directory)
+    elif backend != "polling":
+        raise ValueError(f"Unsupported DAG directory watcher: {backend}")
+    return PollingDagDirectoryWatcher(directory, poll_interval)
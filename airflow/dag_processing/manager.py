@@ -43,16 +43,25 @@ import airflow.models
 from airflow.api_internal.internal_api_call import internal_api_call
 from airflow.callbacks.callback_requests import CallbackRequest, SlaCallbackRequest
 from airflow.configuration import conf
+from airflow.dag_processing.dag_dir_watcher import get_dag_directory_watcher
 from airflow.dag_processing.processor import DagFileProcessorProcess
+from airflow.jobs.job import Job
 from airflow.models import errors
 from airflow.models.dag import DagModel
+from airflow.models.dagparsingprofile import DagParsingProfile
 from airflow.models.dagwarning import DagWarning
 from airflow.models.db_callback_request import DbCallbackRequest
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.secrets.cache import SecretCache
 from airflow.stats import Stats
 from airflow.utils import timezone
-from airflow.utils.file import list_py_file_paths, might_contain_dag
+from airflow.utils.consistent_hash import ConsistentHashRing
+from airflow.utils.file import (
+    get_file_content_hash,
+    is_dag_file_path,
+    list_py_file_paths,
+    might_contain_dag,
+)
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.net import get_hostname
@@ -64,6 +73,7 @@ from airflow.utils.process_utils import (
 from airflow.utils.retries import retry_db_transaction
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.sqlalchemy import prohibit_commit, skip_locked, with_row_locks
+from airflow.utils.state import JobState
 
 if TYPE_CHECKING:
     from multiprocessing.connection import Connection as MultiprocessingConnection
@@ -86,6 +96,11 @@ class DagFileStat(NamedTuple):
     last_finish_time: datetime | None
     last_duration: timedelta | None
     run_count: int
+    # Hash of the file and the local modules it imports when it was last parsed, see
+    # ``[scheduler] skip_unchanged_dag_files``
+    content_hash: str | None = None
+    # Last time the file was found unchanged since it was parsed, and not parsed again
+    last_skipped_time: datetime | None = None
 
 
 class DagParsingSignal(enum.Enum):
@@ -348,7 +363,7 @@ class DagFileProcessorAgent(LoggingMixin, MultiprocessingStartMethodMixin):
         self._parent_signal_conn.close()
 
 
-class DagFileProcessorManager(LoggingMixin):
+class DagFileProcessorManager(LoggingMixin, MultiprocessingStartMethodMixin):
     """
     Manage processes responsible for parsing DAGs.
 
@@ -419,6 +434,14 @@ class DagFileProcessorManager(LoggingMixin):
 
         # Parse and schedule each file no faster than this interval.
         self._file_process_interval = conf.getint("scheduler", "min_file_process_interval")
+        # Whether to skip parsing files which, along with the local modules they import, did not change
+        # since they were last parsed. They are parsed anyway once their last parse gets older than the
+        # max staleness, as DAGs can also be generated from data outside the files.
+        self._skip_unchanged_files = conf.getboolean("scheduler", "skip_unchanged_dag_files")
+        self._unchanged_file_max_staleness = conf.getint("scheduler", "unchanged_dag_file_max_staleness")
+        self._content_hash_search_paths = [os.fspath(dag_directory), airflow.settings.PLUGINS_FOLDER]
+        # Map from file path to the hash of its content when its processor was started
+        self._processing_content_hashes: dict[str, str | None] = {}
         # How often to print out DAG file processing stats to the log. Default to
         # 30 seconds.
         self.print_stats_interval = conf.getint("scheduler", "print_stats_interval")
@@ -445,6 +468,32 @@ class DagFileProcessorManager(LoggingMixin):
         self._processor_timeout = processor_timeout
         # How often to scan the DAGs directory for new files. Default to 5 minutes.
         self.dag_dir_list_interval = conf.getint("scheduler", "dag_dir_list_interval")
+        # Optional watcher of the changes of the DAGs directory, replacing the periodic listing
+        dag_dir_watcher = conf.get("scheduler", "dag_dir_watcher")
+        self._dag_dir_watcher = (
+            get_dag_directory_watcher(
+                dag_dir_watcher,
+                dag_directory,
+                poll_interval=int(
+                    conf.get("scheduler", "dag_dir_watcher_poll_interval") or self.dag_dir_list_interval
+                ),
+            )
+            if dag_dir_watcher
+            else None
+        )
+
+        # Whether standalone DAG processors sharing the DAG directory split its files between them
+        self._dag_processor_sharding = self.standalone_dag_processor and conf.getboolean(
+            "scheduler", "dag_processor_sharding"
+        )
+        self._dag_processor_sharding_refresh_interval = conf.getfloat(
+            "scheduler", "dag_processor_sharding_refresh_interval"
+        )
+        # Hash ring of the live DAG processors, None meaning that this processor parses all the files
+        self._shard_ring: ConsistentHashRing | None = None
+        self._last_shard_refresh_time = 0.0
+        # ID of the job running this manager, set by DagProcessorJobRunner
+        self.job_id: int | None = None
 
         # Mapping file name and callbacks requests
         self._callback_to_execute: dict[str, list[CallbackRequest]] = defaultdict(list)
@@ -493,8 +542,45 @@ class DagFileProcessorManager(LoggingMixin):
             "Checking for new files in %s every %s seconds", self._dag_directory, self.dag_dir_list_interval
         )
 
+        self._warm_up()
+
         return self._run_parsing_loop()
 
+    def _warm_up(self) -> None:
+        """
+        Import the modules commonly used by DAG files, and discover the providers, once for all files.
+
+        The processes parsing the files are forked from the manager, so they start with this work
+        already done instead of doing it again for every file.
+        """
+        modules = [
+            module.strip()
+            for module in conf.get("scheduler", "parsing_warm_up_modules").split(",")
+            if module.strip()
+        ]
+        warm_up_providers = conf.getboolean("scheduler", "parsing_warm_up_providers")
+        if not modules and not warm_up_providers:
+            return
+        if self._get_multiprocessing_start_method() != "fork":
+            self.log.warning("Not warming up DAG parsing, as the processes parsing files are not forked")
+            return
+
+        start = time.monotonic()
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                # An error here does not prevent anything from working, it will be surfaced when the
+                # DAG files importing the module are parsed.
+                self.log.warning("Error when trying to pre-import module '%s': %s", module, e)
+        if warm_up_providers:
+            from airflow.providers_manager import ProvidersManager
+
+            providers_manager = ProvidersManager()
+            providers_manager.initialize_providers_hooks()
+            providers_manager.initialize_providers_taskflow_decorator()
+        self.log.info("Warmed up DAG parsing in %.2f seconds", time.monotonic() - start)
+
     def _scan_stale_dags(self):
         """Scan at fix internal DAGs which are no longer present in files."""
         now = timezone.utcnow()
@@ -566,6 +652,7 @@ class DagFileProcessorManager(LoggingMixin):
         else:
             poll_time = None
 
+        self._refresh_dag_processor_shard()
         self._refresh_dag_dir()
         self.prepare_file_path_queue()
         max_callbacks_per_loop = conf.getint("scheduler", "max_callbacks_per_loop")
@@ -621,6 +708,7 @@ class DagFileProcessorManager(LoggingMixin):
                 self._fetch_callbacks(max_callbacks_per_loop)
             self._scan_stale_dags()
             DagWarning.purge_inactive_dag_warnings()
+            self._refresh_dag_processor_shard()
             refreshed_dag_dir = self._refresh_dag_dir()
 
             self._kill_timed_out_processors()
@@ -750,67 +838,222 @@ class DagFileProcessorManager(LoggingMixin):
             self._add_paths_to_queue([request.full_filepath], True)
             Stats.incr("dag_processing.other_callback_count")
 
+    @staticmethod
+    @internal_api_call
+    @provide_session
+    def get_live_dag_processor_job_ids(session: Session = NEW_SESSION) -> list[int]:
+        """Return the IDs of the jobs of the standalone DAG processors which are alive."""
+        health_check_threshold = Job._heartrate("DagProcessorJob") * 2.1
+        return list(
+            session.scalars(
+                select(Job.id).where(
+                    Job.job_type == "DagProcessorJob",
+                    Job.state == JobState.RUNNING,
+                    Job.latest_heartbeat > timezone.utcnow() - timedelta(seconds=health_check_threshold),
+                )
+            )
+        )
+
+    def _owns_file(self, file_path: str) -> bool:
+        """Whether this DAG processor is responsible for parsing the file, when sharding the DAG files."""
+        if self._shard_ring is None:
+            return True
+        return self._shard_ring.get_node(os.path.relpath(file_path, self._dag_directory)) == str(self.job_id)
+
+    def _refresh_dag_processor_shard(self) -> None:
+        """
+        Recompute the DAG files this DAG processor is responsible for when sharding the DAG files.
+
+        The files are split between the live DAG processors with a consistent hash of their path
+        relative to the DAG directory, so that a processor joining or leaving only moves its files.
+        """
+        if not self._dag_processor_sharding or self.job_id is None:
+            return
+        now = time.monotonic()
+        if (
+            self._shard_ring is not None
+            and now - self._last_shard_refresh_time < self._dag_processor_sharding_refresh_interval
+        ):
+            return
+        self._last_shard_refresh_time = now
+
+        live_job_ids = set(DagFileProcessorManager.get_live_dag_processor_job_ids())
+        live_job_ids.add(self.job_id)
+        nodes = frozenset(str(job_id) for job_id in live_job_ids)
+        if self._shard_ring is None or nodes != self._shard_ring.nodes:
+            self._shard_ring = ConsistentHashRing(nodes)
+            self.log.info(
+                "Processing %d of %d DAG files as one of %d live DAG processors",
+                sum(1 for file_path in self._file_paths if self._owns_file(file_path)),
+                len(self._file_paths),
+                len(nodes),
+            )
+            # Forget the files now parsed by other DAG processors, unless they have callbacks to run.
+            # The files moved to this processor have no stats, so they are queued as new files.
+            for file_path in list(self._file_stats):
+                if not self._owns_file(file_path) and file_path not in self._processors:
+                    del self._file_stats[file_path]
+            self._file_path_queue = deque(
+                file_path
+                for file_path in self._file_path_queue
+                if self._owns_file(file_path) or self._callback_to_execute.get(file_path)
+            )
+            self.add_new_file_path_to_queue()
+        Stats.gauge(
+            "dag_processing.shard_size",
+            sum(1 for file_path in self._file_paths if self._owns_file(file_path)),
+        )
+
     def _refresh_dag_dir(self) -> bool:
-        """Refresh file paths from dag dir if we haven't done it for too long."""
+        """
+        Refresh file paths from dag dir if we haven't done it for too long.
+
+        If the dag dir is watched, only apply the changes seen by the watcher instead, unless it lost
+        track of them or the ignore rules changed.
+        """
         now = timezone.utcnow()
-        elapsed_time_since_refresh = (now - self.last_dag_dir_refresh_time).total_seconds()
-        if elapsed_time_since_refresh > self.dag_dir_list_interval:
-            # Build up a list of Python files that could contain DAGs
-            self.log.info("Searching for files in %s", self._dag_directory)
-            self._file_paths = list_py_file_paths(self._dag_directory)
-            self.last_dag_dir_refresh_time = now
-            self.log.info("There are %s files in %s", len(self._file_paths), self._dag_directory)
-            self.set_file_paths(self._file_paths)
+        if self._dag_dir_watcher is not None:
+            changes = self._dag_dir_watcher.get_changes()
+            if not changes.rescan and not any(
+                os.path.basename(path) == ".airflowignore" for path in changes.paths
+            ):
+                return self._apply_dag_dir_changes(changes.paths)
+        elif (now - self.last_dag_dir_refresh_time).total_seconds() <= self.dag_dir_list_interval:
+            return False
 
-            try:
-                self.log.debug("Removing old import errors")
-                DagFileProcessorManager.clear_nonexistent_import_errors(file_paths=self._file_paths)
-            except Exception:
-                self.log.exception("Error removing old import errors")
-
-            def _iter_dag_filelocs(fileloc: str) -> Iterator[str]:
-                """Get "full" paths to DAGs if inside ZIP files.
-
-                This is the format used by the remove/delete functions.
-                """
-                if fileloc.endswith(".py") or not zipfile.is_zipfile(fileloc):
-                    yield fileloc
-                    return
-                try:
-                    with zipfile.ZipFile(fileloc) as z:
-                        for info in z.infolist():
-                            if might_contain_dag(info.filename, True, z):
-                                yield os.path.join(fileloc, info.filename)
-                except zipfile.BadZipFile:
-                    self.log.exception("There was an error accessing ZIP file %s %s", fileloc)
+        # Build up a list of Python files that could contain DAGs
+        self.log.info("Searching for files in %s", self._dag_directory)
+        file_paths = list_py_file_paths(self._dag_directory)
+        self.last_dag_dir_refresh_time = now
+        self.log.info("There are %s files in %s", len(file_paths), self._dag_directory)
+        self._update_file_paths(file_paths)
+        return True
 
-            dag_filelocs = {full_loc for path in self._file_paths for full_loc in _iter_dag_filelocs(path)}
+    def _apply_dag_dir_changes(self, paths: set[str]) -> bool:
+        """
+        Update the file paths with the changes seen by the dag dir watcher.
 
-            from airflow.models.dagcode import DagCode
+        Created and modified files are added to the front of the queue, so they are parsed first.
 
-            SerializedDagModel.remove_deleted_dags(
-                alive_dag_filelocs=dag_filelocs,
-                processor_subdir=self.get_dag_directory(),
+        :return: whether files were added or removed.
+        """
+        if not paths:
+            return False
+        known_file_paths = set(self._file_paths)
+        safe_mode = conf.getboolean("core", "DAG_DISCOVERY_SAFE_MODE")
+        deleted_file_paths = set()
+        new_file_paths = []
+        changed_file_paths = []
+        for path in sorted(paths):
+            if not os.path.exists(path):
+                # A deleted directory is reported instead of the files in it
+                deleted_file_paths.update(
+                    p for p in known_file_paths if p == path or p.startswith(os.path.join(path, ""))
+                )
+            elif path in known_file_paths:
+                changed_file_paths.append(path)
+            elif is_dag_file_path(path, self._dag_directory, safe_mode):
+                new_file_paths.append(path)
+
+        if deleted_file_paths or new_file_paths:
+            self.log.info(
+                "Found %s new and %s deleted files in %s",
+                len(new_file_paths),
+                len(deleted_file_paths),
+                self._dag_directory,
             )
-            DagModel.deactivate_deleted_dags(
-                dag_filelocs,
-                processor_subdir=self.get_dag_directory(),
+            self._update_file_paths(
+                [p for p in self._file_paths if p not in deleted_file_paths] + new_file_paths
+            )
+        if changed_file_paths or new_file_paths:
+            self.log.debug("Queuing changed files: %s", changed_file_paths + new_file_paths)
+            for file_path in new_file_paths:
+                if self._owns_file(file_path):
+                    self._file_stats.setdefault(file_path, DagFileProcessorManager.DEFAULT_FILE_STAT)
+            self._add_paths_to_queue(
+                [path for path in changed_file_paths + new_file_paths if self._owns_file(path)],
+                add_at_front=True,
             )
-            DagCode.remove_deleted_code(
-                dag_filelocs,
+        return bool(deleted_file_paths or new_file_paths)
+
+    def _update_file_paths(self, file_paths: list[str]) -> None:
+        """Set the file paths found in the dag dir, and clean up the DAGs of the files removed from it."""
+        self.set_file_paths(file_paths)
+
+        try:
+            self.log.debug("Removing old import errors")
+            DagFileProcessorManager.clear_nonexistent_import_errors(file_paths=self._file_paths)
+        except Exception:
+            self.log.exception("Error removing old import errors")
+
+        try:
+            DagParsingProfile.remove_deleted_profiles(
+                alive_file_paths=self._file_paths,
                 processor_subdir=self.get_dag_directory(),
             )
+        except Exception:
+            self.log.exception("Error removing old parsing profiles")
 
-            return True
-        return False
+        def _iter_dag_filelocs(fileloc: str) -> Iterator[str]:
+            """Get "full" paths to DAGs if inside ZIP files.
+
+            This is the format used by the remove/delete functions.
+            """
+            if fileloc.endswith(".py") or not zipfile.is_zipfile(fileloc):
+                yield fileloc
+                return
+            try:
+                with zipfile.ZipFile(fileloc) as z:
+                    for info in z.infolist():
+                        if might_contain_dag(info.filename, True, z):
+                            yield os.path.join(fileloc, info.filename)
+            except zipfile.BadZipFile:
+                self.log.exception("There was an error accessing ZIP file %s %s", fileloc)
+
+        dag_filelocs = {full_loc for path in self._file_paths for full_loc in _iter_dag_filelocs(path)}
+
+        from airflow.models.dagcode import DagCode
+
+        SerializedDagModel.remove_deleted_dags(
+            alive_dag_filelocs=dag_filelocs,
+            processor_subdir=self.get_dag_directory(),
+        )
+        DagModel.deactivate_deleted_dags(
+            dag_filelocs,
+            processor_subdir=self.get_dag_directory(),
+        )
+        DagCode.remove_deleted_code(
+            dag_filelocs,
+            processor_subdir=self.get_dag_directory(),
+        )
 
     def _print_stat(self):
         """Occasionally print out stats about how fast the files are getting processed."""
         if 0 < self.print_stats_interval < time.monotonic() - self.last_stat_print_time:
             if self._file_paths:
-                self._log_file_processing_stats(self._file_paths)
+                self._log_file_processing_stats([path for path in self._file_paths if self._owns_file(path)])
             self.last_stat_print_time = time.monotonic()
 
+    @staticmethod
+    @internal_api_call
+    @provide_session
+    def mark_dags_of_unchanged_files_parsed(file_paths: list[str], session=NEW_SESSION):
+        """
+        Update the last parsed time of the DAGs of files whose parsing was skipped, as they did not change.
+
+        This keeps the DAGs from being deactivated as stale.
+
+        :param file_paths: list of paths to DAG definition files
+        :param session: session for ORM operations
+        """
+        session.execute(
+            update(DagModel)
+            .where(DagModel.fileloc.in_(file_paths), DagModel.is_active)
+            .values(last_parsed_time=timezone.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+
     @staticmethod
     @internal_api_call
     @provide_session
@@ -1006,6 +1249,7 @@ class DagFileProcessorManager(LoggingMixin):
                 Stats.decr("dag_processing.processes", tags={"file_path": file_path, "action": "stop"})
                 processor.terminate()
                 self._file_stats.pop(file_path)
+                self._processing_content_hashes.pop(file_path, None)
 
         to_remove = set(self._file_stats).difference(self._file_paths)
         for key in to_remove:
@@ -1034,6 +1278,7 @@ class DagFileProcessorManager(LoggingMixin):
             count_import_errors = -1
             num_dags = 0
 
+        content_hash = self._processing_content_hashes.pop(processor.file_path, None)
         last_duration = last_finish_time - processor.start_time
         stat = DagFileStat(
             num_dags=num_dags,
@@ -1041,6 +1286,8 @@ class DagFileProcessorManager(LoggingMixin):
             last_finish_time=last_finish_time,
             last_duration=last_duration,
             run_count=self.get_run_count(processor.file_path) + 1,
+            # Files whose processor failed are parsed again, even if they did not change
+            content_hash=content_hash if processor.result is not None else None,
         )
         self._file_stats[processor.file_path] = stat
         file_name = Path(processor.file_path).stem
@@ -1097,6 +1344,9 @@ class DagFileProcessorManager(LoggingMixin):
             )
 
             del self._callback_to_execute[file_path]
+            if self._skip_unchanged_files:
+                # Hash the file before it is parsed, so that changes made while parsing are not missed
+                self._processing_content_hashes[file_path] = self._get_content_hash(file_path)
             Stats.incr("dag_processing.processes", tags={"file_path": file_path, "action": "start"})
 
             processor.start()
@@ -1108,7 +1358,7 @@ class DagFileProcessorManager(LoggingMixin):
 
     def add_new_file_path_to_queue(self):
         for file_path in self.file_paths:
-            if file_path not in self._file_stats:
+            if file_path not in self._file_stats and self._owns_file(file_path):
                 # We found new file after refreshing dir. add to parsing queue at start
                 self.log.info("Adding new file %s to parsing queue", file_path)
                 self._file_stats[file_path] = DagFileProcessorManager.DEFAULT_FILE_STAT
@@ -1136,6 +1386,9 @@ class DagFileProcessorManager(LoggingMixin):
         file_paths_recently_processed = []
         file_paths_to_stop_watching = set()
         for file_path in self._file_paths:
+            if not self._owns_file(file_path):
+                # Parsed by another DAG processor
+                continue
             if is_mtime_mode:
                 try:
                     files_with_mtime[file_path] = os.path.getmtime(file_path)
@@ -1149,11 +1402,12 @@ class DagFileProcessorManager(LoggingMixin):
                 file_paths.append(file_path)
                 file_modified_time = None
 
-            # Find file paths that were recently processed to exclude them
+            # Find file paths that were recently processed (or found unchanged) to exclude them
             # from being added to file_path_queue
             # unless they were modified recently and parsing mode is "modified_time"
             # in which case we don't honor "self._file_process_interval" (min_file_process_interval)
-            last_finish_time = self.get_last_finish_time(file_path)
+            stat = self._file_stats.get(file_path)
+            last_finish_time = (stat.last_skipped_time or stat.last_finish_time) if stat else None
             if (
                 last_finish_time is not None
                 and (now - last_finish_time).total_seconds() < self._file_process_interval
@@ -1190,6 +1444,15 @@ class DagFileProcessorManager(LoggingMixin):
         files_paths_to_queue = [
             file_path for file_path in file_paths if file_path not in file_paths_to_exclude
         ]
+        if self._skip_unchanged_files:
+            unchanged_file_paths = [
+                file_path for file_path in files_paths_to_queue if self._skip_if_unchanged(file_path, now)
+            ]
+            if unchanged_file_paths:
+                DagFileProcessorManager.mark_dags_of_unchanged_files_parsed(unchanged_file_paths)
+                files_paths_to_queue = [
+                    file_path for file_path in files_paths_to_queue if file_path not in unchanged_file_paths
+                ]
 
         for file_path, processor in self._processors.items():
             self.log.debug(
@@ -1205,6 +1468,39 @@ class DagFileProcessorManager(LoggingMixin):
         self._add_paths_to_queue(files_paths_to_queue, False)
         Stats.incr("dag_processing.file_path_queue_update_count")
 
+    def _get_content_hash(self, file_path: str) -> str | None:
+        try:
+            return get_file_content_hash(file_path, self._content_hash_search_paths)
+        except OSError:
+            self.log.debug("Could not hash the content of %s", file_path, exc_info=True)
+            return None
+
+    def _skip_if_unchanged(self, file_path: str, now: datetime) -> bool:
+        """
+        Skip parsing a file if neither it nor the local modules it imports changed since its last parse.
+
+        Skipped files count as processed, so that they are not checked again before the file process
+        interval passes.
+
+        :return: whether the file was skipped
+        """
+        stat = self._file_stats.get(file_path)
+        if not stat or not stat.content_hash or not stat.last_finish_time:
+            return False
+        if zipfile.is_zipfile(file_path):
+            # The DAGs of zipped files are not stored under the path of the file itself
+            return False
+        if 0 < self._unchanged_file_max_staleness <= (now - stat.last_finish_time).total_seconds():
+            return False
+        if self._callback_to_execute.get(file_path):
+            return False
+        if self._get_content_hash(file_path) != stat.content_hash:
+            return False
+        self.log.debug("Skipping parsing of unchanged file %s", file_path)
+        self._file_stats[file_path] = stat._replace(last_skipped_time=now, run_count=stat.run_count + 1)
+        Stats.incr("dag_processing.unchanged_file_skipped")
+        return True
+
     def _kill_timed_out_processors(self):
         """Kill any file processors that timeout to defend against process hangs."""
         now = timezone.utcnow()
@@ -1226,6 +1522,7 @@ class DagFileProcessorManager(LoggingMixin):
 
                 # Clean up processor references
                 self.waitables.pop(processor.waitable_handle)
+                self._processing_content_hashes.pop(file_path, None)
                 processors_to_remove.append(file_path)
 
                 stat = DagFileStat(
@@ -1274,6 +1571,8 @@ class DagFileProcessorManager(LoggingMixin):
         pids_to_kill = self.get_all_pids()
         if pids_to_kill:
             kill_child_processes_by_pids(pids_to_kill)
+        if self._dag_dir_watcher is not None:
+            self._dag_dir_watcher.close()
 
     def emit_metrics(self):
         """
@@ -0,0 +1,118 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Profiling of the parsing of a DAG file, to find out why it is slow to parse."""
+from __future__ import annotations
+
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Generator
+
+# Phases of the processing of a DAG file
+PARSING = "parsing"
+CALLBACKS = "callbacks"
+SERIALIZATION = "serialization"
+DB_SYNC = "db_sync"
+
+# Parts of the parsing phase reported separately
+IMPORTS = "imports"
+DAG_CONSTRUCTION = "dag_construction"
+
+
+def get_peak_rss() -> int | None:
+    """Return the peak resident set size of the current process in bytes, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports it in kilobytes, macOS in bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class DagFileParsingProfiler:
+    """
+    Record where the time is spent when processing a DAG file.
+
+    The time spent importing modules while parsing the file is recorded per top-level module (e.g.
+    ``pandas`` for ``import pandas.io``), and only for modules which were not imported yet. The time
+    spent executing the file other than importing modules is reported as the DAG construction time.
+    """
+
+    def __init__(self) -> None:
+        self._phases: dict[str, float] = {}
+        self._imports: dict[str, float] = {}
+        self._import_depth = 0
+        self._start = time.monotonic()
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Record the wall time of a phase of the processing."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._phases[name] = self._phases.get(name, 0.0) + time.monotonic() - start
+
+    @contextmanager
+    def record_imports(self) -> Generator[None, None, None]:
+        """Record the time spent importing modules in the current thread."""
+        original_import = builtins.__import__
+        thread_id = threading.get_ident()
+
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Relative imports are of modules in the package of the DAG file, which is imported already.
+            # Only the outermost import is timed, as it includes the imports it triggers.
+            if level or self._import_depth or name in sys.modules or threading.get_ident() != thread_id:
+                return original_import(name, globals, locals, fromlist, level)
+            self._import_depth += 1
+            start = time.monotonic()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._import_depth -= 1
+                top_level_module = name.partition(".")[0]
+                self._imports[top_level_module] = (
+                    self._imports.get(top_level_module, 0.0) + time.monotonic() - start
+                )
+
+        builtins.__import__ = _timed_import
+        try:
+            yield
+        finally:
+            builtins.__import__ = original_import
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the profile, with the parsing phase split into module imports and DAG construction."""
+        phases = dict(self._phases)
+        if PARSING in phases:
+            import_duration = sum(self._imports.values())
+            parsing_duration = phases.pop(PARSING)
+            phases = {
+                IMPORTS: import_duration,
+                DAG_CONSTRUCTION: max(parsing_duration - import_duration, 0.0),
+                **phases,
+            }
+        return {
+            "duration": time.monotonic() - self._start,
+            "peak_rss": get_peak_rss(),
+            "phases": phases,
+            "imports": dict(sorted(self._imports.items(), key=lambda item: item[1], reverse=True)),
+        }
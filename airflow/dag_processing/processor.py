@@ -23,9 +23,9 @@ import signal
 import threading
 import time
 import zipfile
-from contextlib import redirect_stderr, redirect_stdout, suppress
+from contextlib import nullcontext, redirect_stderr, redirect_stdout, suppress
 from datetime import timedelta
-from typing import TYPE_CHECKING, Iterable, Iterator
+from typing import TYPE_CHECKING, ContextManager, Iterable, Iterator
 
 from setproctitle import setproctitle
 from sqlalchemy import delete, func, or_, select
@@ -38,14 +38,23 @@ from airflow.callbacks.callback_requests import (
     TaskCallbackRequest,
 )
 from airflow.configuration import conf
+from airflow.dag_processing.parsing_profiler import (
+    CALLBACKS,
+    DB_SYNC,
+    PARSING,
+    SERIALIZATION,
+    DagFileParsingProfiler,
+)
 from airflow.exceptions import AirflowException, TaskNotFound
 from airflow.models import SlaMiss, errors
 from airflow.models.dag import DagModel
 from airflow.models.dagbag import DagBag
+from airflow.models.dagparsingprofile import DagParsingProfile
 from airflow.models.dagrun import DagRun as DR
 from airflow.models.dagwarning import DagWarning, DagWarningType
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import TaskInstance, TaskInstance as TI
+from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.stats import Stats
 from airflow.utils import timezone
 from airflow.utils.email import get_email_address_list, send_email
@@ -414,6 +423,7 @@ class DagFileProcessor(LoggingMixin):
         self._log = log
         self._dag_directory = dag_directory
         self.dag_warnings: set[tuple[str, str]] = set()
+        self._enable_parsing_profiling = conf.getboolean("scheduler", "enable_dag_parsing_profiling")
 
     @classmethod
     @internal_api_call
@@ -823,8 +833,37 @@ class DagFileProcessor(LoggingMixin):
         """
         self.log.info("Processing file %s for tasks to queue", file_path)
 
+        if not self._enable_parsing_profiling:
+            return self._process_file(file_path, callback_requests, pickle_dags, None, session)
+
+        profiler = DagFileParsingProfiler()
         try:
-            dagbag = DagFileProcessor._get_dagbag(file_path)
+            return self._process_file(file_path, callback_requests, pickle_dags, profiler, session)
+        finally:
+            try:
+                DagParsingProfile.write(
+                    fileloc=file_path,
+                    processor_subdir=self._dag_directory,
+                    profile=profiler.to_dict(),
+                    session=session,
+                )
+            except Exception:
+                self.log.exception("Error saving the parsing profile of %s", file_path)
+
+    def _process_file(
+        self,
+        file_path: str,
+        callback_requests: list[CallbackRequest],
+        pickle_dags: bool,
+        profiler: DagFileParsingProfiler | None,
+        session: Session,
+    ) -> tuple[int, int]:
+        def _phase(name: str) -> ContextManager[None]:
+            return profiler.phase(name) if profiler else nullcontext()
+
+        try:
+            with _phase(PARSING), profiler.record_imports() if profiler else nullcontext():
+                dagbag = DagFileProcessor._get_dagbag(file_path)
         except Exception:
             self.log.exception("Failed at reloading the DAG file %s", file_path)
             Stats.incr("dag_file_refresh_error", 1, 1, tags={"file_path": file_path})
@@ -843,17 +882,29 @@ class DagFileProcessor(LoggingMixin):
                 # If there were callback requests for this file but there was a
                 # parse error we still need to progress the state of TIs,
                 # otherwise they might be stuck in queued/running for ever!
-                self.execute_callbacks_without_dag(callback_requests, session)
+                with _phase(CALLBACKS):
+                    self.execute_callbacks_without_dag(callback_requests, session)
             return 0, len(dagbag.import_errors)
 
-        self.execute_callbacks(dagbag, callback_requests, session)
-        session.commit()
+        with _phase(CALLBACKS):
+            self.execute_callbacks(dagbag, callback_requests, session)
+            session.commit()
 
-        serialize_errors = DagFileProcessor.save_dag_to_db(
-            dags=dagbag.dags,
-            dag_directory=self._dag_directory,
-            pickle_dags=pickle_dags,
-        )
+        if profiler:
+            # Serializing is timed on its own, as saving the DAGs also writes them to the database.
+            # The errors are captured when saving the DAGs.
+            with profiler.phase(SERIALIZATION):
+                for dag in dagbag.dags.values():
+                    if not dag.is_subdag:
+                        with suppress(Exception):
+                            SerializedDAG.to_dict(dag)
+
+        with _phase(DB_SYNC):
+            serialize_errors = DagFileProcessor.save_dag_to_db(
+                dags=dagbag.dags,
+                dag_directory=self._dag_directory,
+                pickle_dags=pickle_dags,
+            )
 
         dagbag.import_errors.update(dict(serialize_errors))
 
@@ -22,6 +22,7 @@ import sys
 import warnings
 from collections import defaultdict
 from dataclasses import dataclass, field
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
 
 import pendulum
@@ -30,7 +31,9 @@ from airflow.cli.cli_config import DefaultHelpParser
 from airflow.configuration import conf
 from airflow.exceptions import RemovedInAirflow3Warning
 from airflow.stats import Stats
+from airflow.utils import timezone
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.priority_dict import PriorityDict
 from airflow.utils.state import TaskInstanceState
 
 PARALLELISM: int = conf.getint("core", "PARALLELISM")
@@ -123,7 +126,8 @@ class BaseExecutor(LoggingMixin):
     def __init__(self, parallelism: int = PARALLELISM):
         super().__init__()
         self.parallelism: int = parallelism
-        self.queued_tasks: dict[TaskInstanceKey, QueuedTaskInstanceType] = {}
+        # Indexed by priority, so that the tasks to run first are found without sorting all of them
+        self.queued_tasks: dict[TaskInstanceKey, QueuedTaskInstanceType] = PriorityDict(itemgetter(1))
         self.running: set[TaskInstanceKey] = set()
         self.event_buffer: dict[TaskInstanceKey, EventBufferValueType] = {}
         self.attempts: dict[TaskInstanceKey, RunningRetryAttemptType] = defaultdict(RunningRetryAttemptType)
@@ -238,17 +242,24 @@ class BaseExecutor(LoggingMixin):
         self.log.debug("Calling the %s sync method", self.__class__)
         self.sync()
 
-    def order_queued_tasks_by_priority(self) -> list[tuple[TaskInstanceKey, QueuedTaskInstanceType]]:
+    def order_queued_tasks_by_priority(
+        self, limit: int | None = None
+    ) -> list[tuple[TaskInstanceKey, QueuedTaskInstanceType]]:
         """
         Orders the queued tasks by priority.
 
+        :param limit: Maximum number of tasks to return, all the queued tasks by default.
         :return: List of tuples from the queued_tasks according to the priority.
         """
+        if limit is None:
+            limit = len(self.queued_tasks)
+        if isinstance(self.queued_tasks, PriorityDict):
+            return self.queued_tasks.top(limit)
         return sorted(
             self.queued_tasks.items(),
             key=lambda x: x[1][1],
             reverse=True,
-        )
+        )[:limit]
 
     def trigger_tasks(self, open_slots: int) -> None:
         """
@@ -256,11 +267,14 @@ class BaseExecutor(LoggingMixin):
 
         :param open_slots: Number of open slots
         """
-        sorted_queue = self.order_queued_tasks_by_priority()
+        sorted_queue = self.order_queued_tasks_by_priority(
+            limit=max(0, min(open_slots, len(self.queued_tasks)))
+        )
         task_tuples = []
+        # When the task waiting the longest for being dispatched was queued by the scheduler
+        oldest_queued_dttm: datetime | None = None
 
-        for _ in range(min((open_slots, len(self.queued_tasks)))):
-            key, (command, _, queue, ti) = sorted_queue.pop(0)
+        for key, (command, _, queue, ti) in sorted_queue:
 
             # If a task makes it here but is still understood by the executor
             # to be running, it generally means that the task has been killed
@@ -288,14 +302,30 @@ class BaseExecutor(LoggingMixin):
                 if key in self.attempts:
                     del self.attempts[key]
                 task_tuples.append((key, command, queue, ti.executor_config))
+                if ti.queued_dttm and (oldest_queued_dttm is None or ti.queued_dttm < oldest_queued_dttm):
+                    oldest_queued_dttm = ti.queued_dttm
 
         if task_tuples:
-            self._process_tasks(task_tuples)
+            tags = {"name": self.__class__.__name__}
+            with Stats.timer("executor.dispatch_duration", tags=tags) as timer:
+                self._process_tasks(task_tuples)
+            self.log.debug("Dispatched %d tasks in %.3f s", len(task_tuples), timer.duration or 0.0)
+            Stats.incr("executor.dispatched_tasks", len(task_tuples), tags=tags)
+            if oldest_queued_dttm:
+                Stats.timing("executor.dispatch_latency", timezone.utcnow() - oldest_queued_dttm, tags=tags)
 
     def _process_tasks(self, task_tuples: list[TaskTuple]) -> None:
-        for key, command, queue, executor_config in task_tuples:
+        if getattr(self.execute_async_many, "__func__", None) is BaseExecutor.execute_async_many:
+            # Submit the tasks one at a time, so that a failure only drops the task it happened with
+            for key, command, queue, executor_config in task_tuples:
+                del self.queued_tasks[key]
+                self.execute_async(key=key, command=command, queue=queue, executor_config=executor_config)
+                self.running.add(key)
+            return
+        # Submitting the tasks in one go is all or nothing: they are only moved to running once it succeeds
+        self.execute_async_many(task_tuples)
+        for key, _, _, _ in task_tuples:
             del self.queued_tasks[key]
-            self.execute_async(key=key, command=command, queue=queue, executor_config=executor_config)
             self.running.add(key)
 
     def change_state(self, key: TaskInstanceKey, state: TaskInstanceState, info=None) -> None:
@@ -369,6 +399,22 @@ class BaseExecutor(LoggingMixin):
         """
         raise NotImplementedError()
 
+    def execute_async_many(self, task_tuples: Sequence[TaskTuple]) -> None:
+        """
+        Execute the commands of several tasks asynchronously, in one go.
+
+        Called with all the tasks dispatched in a heartbeat. Executors able to submit several tasks at
+        once, e.g. in a single request to an external service, should override it. The default
+        implementation calls :meth:`execute_async` for each task.
+
+        Overrides must submit either all the tasks or none of them: the tasks are only moved from
+        ``queued_tasks`` to ``running`` once it returns, and are all left queued if it raises.
+
+        :param task_tuples: Tuples of the key, command, queue and executor config of the tasks
+        """
+        for key, command, queue, executor_config in task_tuples:
+            self.execute_async(key=key, command=command, queue=queue, executor_config=executor_config)
+
     def get_task_log(self, ti: TaskInstance, try_number: int) -> tuple[list[str], list[str]]:
         """
         Return the task logs.
@@ -484,6 +530,22 @@ class BaseExecutor(LoggingMixin):
             raise ValueError("Callback sink is not ready.")
         self.callback_sink.send(request)
 
+    def send_callbacks(self, requests: Sequence[CallbackRequest]) -> None:
+        """Send callbacks for execution, in one go.
+
+        Provides a default implementation which sends the callbacks to the `callback_sink` object at
+        once, unless the executor overrides :meth:`send_callback`, which then sends each of them.
+
+        :param requests: Callback requests to be executed.
+        """
+        if type(self).send_callback is not BaseExecutor.send_callback:
+            for request in requests:
+                self.send_callback(request)
+            return
+        if not self.callback_sink:
+            raise ValueError("Callback sink is not ready.")
+        self.callback_sink.send_many(requests)
+
     @staticmethod
     def get_cli_commands() -> list[GroupCommand]:
         """Vends CLI commands to be included in Airflow CLI.
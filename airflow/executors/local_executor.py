@@ -25,9 +25,11 @@ LocalExecutor.
 from __future__ import annotations
 
 import contextlib
+import importlib
 import logging
 import os
 import subprocess
+import time
 from abc import abstractmethod
 from multiprocessing import Manager, Process
 from queue import Empty
@@ -36,6 +38,7 @@ from typing import TYPE_CHECKING, Any, Optional, Tuple
 from setproctitle import getproctitle, setproctitle
 
 from airflow import settings
+from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.executors.base_executor import PARALLELISM, BaseExecutor
 from airflow.utils.log.logging_mixin import LoggingMixin
@@ -50,9 +53,10 @@ if TYPE_CHECKING:
     from airflow.models.taskinstancekey import TaskInstanceKey
 
     # This is a work to be executed by a worker.
-    # It can Key and Command - but it can also be None, None which is actually a
-    # "Poison Pill" - worker seeing Poison Pill should take the pill and ... die instantly.
-    ExecutorWorkType = Tuple[Optional[TaskInstanceKey], Optional[CommandType]]
+    # It can Key, Command and whether the task is lightweight - but it can also be None, None, False
+    # which is actually a "Poison Pill" - worker seeing Poison Pill should take the pill and
+    # ... die instantly.
+    ExecutorWorkType = Tuple[Optional[TaskInstanceKey], Optional[CommandType], bool]
 
 
 class LocalWorkerBase(Process, LoggingMixin):
@@ -76,12 +80,13 @@ class LocalWorkerBase(Process, LoggingMixin):
         setproctitle("airflow worker -- LocalExecutor")
         return super().run()
 
-    def execute_work(self, key: TaskInstanceKey, command: CommandType) -> None:
+    def execute_work(self, key: TaskInstanceKey, command: CommandType, lightweight: bool = False) -> None:
         """
         Execute command received and stores result state in queue.
 
         :param key: the key to identify the task instance
         :param command: the command to execute
+        :param lightweight: whether to run the task in the forked process, without a LocalTaskJob
         """
         if key is None:
             return
@@ -91,12 +96,56 @@ class LocalWorkerBase(Process, LoggingMixin):
         if settings.EXECUTE_TASKS_NEW_PYTHON_INTERPRETER:
             state = self._execute_work_in_subprocess(command)
         else:
-            state = self._execute_work_in_fork(command)
+            state = self._execute_work_in_fork(command, lightweight=lightweight)
 
         self.result_queue.put((key, state))
         # Remove the command since the worker is done executing the task
         setproctitle("airflow worker -- LocalExecutor")
 
+    def warm_up(self) -> None:
+        """
+        Prepare this worker to run tasks, once for all the tasks it runs.
+
+        Builds the CLI parser and imports the modules used to supervise and run a task, as well as the
+        modules listed in ``[core] local_executor_warm_up_modules``, and discovers the providers. The
+        processes running the tasks are forked from the worker, so they start with this work already done
+        instead of doing it again for every task.
+        """
+        if not conf.getboolean("core", "local_executor_warm_up"):
+            return
+        if settings.EXECUTE_TASKS_NEW_PYTHON_INTERPRETER:
+            self.log.warning("Not warming up %s, as tasks are not forked from it", self.name)
+            return
+
+        start = time.monotonic()
+        from airflow.cli.cli_parser import get_parser
+
+        # The parser is cached, and parsing the command of a task in a forked process then reuses it
+        get_parser()
+        modules = [
+            "airflow.cli.commands.task_command",
+            "airflow.task.task_runner.standard_task_runner",
+            *(
+                module.strip()
+                for module in conf.get("core", "local_executor_warm_up_modules").split(",")
+                if module.strip()
+            ),
+        ]
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                # An error here does not prevent anything from working, it will be surfaced when the
+                # tasks importing the module are run.
+                self.log.warning("Error when trying to pre-import module '%s': %s", module, e)
+
+        from airflow.providers_manager import ProvidersManager
+
+        providers_manager = ProvidersManager()
+        providers_manager.initialize_providers_hooks()
+        providers_manager.initialize_providers_taskflow_decorator()
+        self.log.info("Warmed up %s in %.2f seconds", self.name, time.monotonic() - start)
+
     def _execute_work_in_subprocess(self, command: CommandType) -> TaskInstanceState:
         try:
             subprocess.check_call(command, close_fds=True)
@@ -105,7 +154,7 @@ class LocalWorkerBase(Process, LoggingMixin):
             self.log.error("Failed to execute task %s.", e)
             return TaskInstanceState.FAILED
 
-    def _execute_work_in_fork(self, command: CommandType) -> TaskInstanceState:
+    def _execute_work_in_fork(self, command: CommandType, lightweight: bool = False) -> TaskInstanceState:
         pid = os.fork()
         if pid:
             # In parent, wait for the child
@@ -128,6 +177,7 @@ class LocalWorkerBase(Process, LoggingMixin):
             # [1:] - remove "airflow" from the start of the command
             args = parser.parse_args(command[1:])
             args.shut_down_logging = False
+            args.lightweight = lightweight
 
             setproctitle(f"airflow task supervisor: {command}")
 
@@ -155,17 +205,23 @@ class LocalWorker(LocalWorkerBase):
     :param result_queue: queue where results of the tasks are put.
     :param key: key identifying task instance
     :param command: Command to execute
+    :param lightweight: whether the task is run without a LocalTaskJob
     """
 
     def __init__(
-        self, result_queue: Queue[TaskInstanceStateType], key: TaskInstanceKey, command: CommandType
+        self,
+        result_queue: Queue[TaskInstanceStateType],
+        key: TaskInstanceKey,
+        command: CommandType,
+        lightweight: bool = False,
     ):
         super().__init__(result_queue)
         self.key: TaskInstanceKey = key
         self.command: CommandType = command
+        self.lightweight = lightweight
 
     def do_work(self) -> None:
-        self.execute_work(key=self.key, command=self.command)
+        self.execute_work(key=self.key, command=self.command, lightweight=self.lightweight)
 
 
 class QueuedLocalWorker(LocalWorkerBase):
@@ -184,9 +240,10 @@ class QueuedLocalWorker(LocalWorkerBase):
         self.task_queue = task_queue
 
     def do_work(self) -> None:
+        self.warm_up()
         while True:
             try:
-                key, command = self.task_queue.get()
+                key, command, lightweight = self.task_queue.get()
             except EOFError:
                 self.log.info(
                     "Failed to read tasks from the task queue because the other "
@@ -198,7 +255,7 @@ class QueuedLocalWorker(LocalWorkerBase):
                 if key is None or command is None:
                     # Received poison pill, no more tasks to run
                     break
-                self.execute_work(key=key, command=command)
+                self.execute_work(key=key, command=command, lightweight=lightweight)
             finally:
                 self.task_queue.task_done()
 
@@ -227,6 +284,7 @@ class LocalExecutor(BaseExecutor):
         self.workers_used: int = 0
         self.workers_active: int = 0
         self.impl: None | (LocalExecutor.UnlimitedParallelism | LocalExecutor.LimitedParallelism) = None
+        self.run_lightweight_tasks = conf.getboolean("core", "local_executor_lightweight_tasks")
 
     class UnlimitedParallelism:
         """
@@ -261,7 +319,12 @@ class LocalExecutor(BaseExecutor):
             if TYPE_CHECKING:
                 assert self.executor.result_queue
 
-            local_worker = LocalWorker(self.executor.result_queue, key=key, command=command)
+            local_worker = LocalWorker(
+                self.executor.result_queue,
+                key=key,
+                command=command,
+                lightweight=self.executor.is_lightweight_task(executor_config),
+            )
             self.executor.workers_used += 1
             self.executor.workers_active += 1
             local_worker.start()
@@ -328,7 +391,7 @@ class LocalExecutor(BaseExecutor):
             if TYPE_CHECKING:
                 assert self.queue
 
-            self.queue.put((key, command))
+            self.queue.put((key, command, self.executor.is_lightweight_task(executor_config)))
 
         def sync(self):
             """Sync will get called periodically by the heartbeat method."""
@@ -347,14 +410,30 @@ class LocalExecutor(BaseExecutor):
             Sends the poison pill to all workers.
             """
             for _ in self.executor.workers:
-                self.queue.put((None, None))
+                self.queue.put((None, None, False))
 
             # Wait for commands to finish
             self.queue.join()
             self.executor.sync()
 
+    def is_lightweight_task(self, executor_config: Any | None) -> bool:
+        """
+        Whether to run a task in the process forked by the worker, without a LocalTaskJob.
+
+        Tasks are lightweight when ``[core] local_executor_lightweight_tasks`` is set and their
+        ``executor_config`` has ``"lightweight": True``.
+        """
+        return (
+            self.run_lightweight_tasks
+            and isinstance(executor_config, dict)
+            and bool(executor_config.get("lightweight"))
+        )
+
     def start(self) -> None:
         """Start the executor."""
+        if self.run_lightweight_tasks and settings.EXECUTE_TASKS_NEW_PYTHON_INTERPRETER:
+            self.log.warning("Running all tasks with a LocalTaskJob, as lightweight tasks must be forked")
+            self.run_lightweight_tasks = False
         old_proctitle = getproctitle()
         setproctitle("airflow executor -- LocalExecutor")
         self.manager = Manager()
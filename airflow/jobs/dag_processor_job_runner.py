@@ -58,6 +58,8 @@ class DagProcessorJobRunner(BaseJobRunner, LoggingMixin):
 
     def _execute(self) -> int | None:
         self.log.info("Starting the Dag Processor Job")
+        # Identifies this DAG processor when splitting the DAG files between the live DAG processors
+        self.processor.job_id = self.job.id
         try:
             self.processor.start()
         except Exception:
@@ -24,12 +24,13 @@ import signal
 import sys
 import time
 import warnings
-from collections import Counter
+from collections import Counter, defaultdict
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import timedelta
 from functools import lru_cache, partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable
 
 from sqlalchemy import and_, delete, func, not_, or_, select, text, update
 from sqlalchemy.exc import OperationalError
@@ -40,7 +41,7 @@ from airflow import settings
 from airflow.callbacks.callback_requests import DagCallbackRequest, SlaCallbackRequest, TaskCallbackRequest
 from airflow.callbacks.pipe_callback_sink import PipeCallbackSink
 from airflow.configuration import conf
-from airflow.exceptions import RemovedInAirflow3Warning
+from airflow.exceptions import AirflowException, RemovedInAirflow3Warning
 from airflow.executors.executor_loader import ExecutorLoader
 from airflow.jobs.base_job_runner import BaseJobRunner
 from airflow.jobs.job import Job, perform_heartbeat
@@ -55,14 +56,21 @@ from airflow.models.dataset import (
     TaskOutletDatasetReference,
 )
 from airflow.models.serialized_dag import SerializedDagModel
-from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance
+from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance, _record_failure
 from airflow.stats import Stats
 from airflow.ti_deps.dependencies_states import EXECUTION_STATES
 from airflow.timetables.simple import DatasetTriggeredTimetable
 from airflow.utils import timezone
+from airflow.utils.consistent_hash import ConsistentHashRing
 from airflow.utils.event_scheduler import EventScheduler
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.retries import MAX_DB_RETRIES, retry_db_transaction, run_with_db_retries
+from airflow.utils.scheduler_profiler import SchedulerProfiler
+from airflow.utils.scheduler_wakeup import (
+    SchedulerWakeupListener,
+    notify_scheduler,
+    wakeup_notifications_enabled,
+)
 from airflow.utils.session import NEW_SESSION, create_session, provide_session
 from airflow.utils.sqlalchemy import (
     is_lock_not_available_error,
@@ -84,6 +92,7 @@ if TYPE_CHECKING:
 
     from airflow.dag_processing.manager import DagFileProcessorAgent
     from airflow.models.taskinstance import TaskInstanceKey
+    from airflow.serialization.scheduling_view import SchedulingDagView
     from airflow.utils.sqlalchemy import (
         CommitProhibitorGuard,
     )
@@ -116,6 +125,85 @@ class ConcurrencyMap:
         return instance
 
 
+class SchedulingStateCache:
+    """
+    Scheduler-local cache of the task instances in execution states.
+
+    The cache is kept up to date from the scheduler's own writes (task instances it queues or resets)
+    and from executor events, and is only re-read from the database every ``refresh_loops`` scheduler
+    loops. It is used in place of querying the concurrency maps in every critical section.
+
+    :param refresh_loops: Number of scheduler loops after which the cache is re-read from the database.
+    """
+
+    def __init__(self, refresh_loops: int) -> None:
+        self.refresh_loops = refresh_loops
+        self._loops_since_refresh = 0
+        self._stale = True
+        self._active_tis: set[tuple[str, str, str, int]] = set()
+        self._concurrency_map = ConcurrencyMap(Counter(), Counter(), Counter())
+
+    @property
+    def needs_refresh(self) -> bool:
+        return self._stale or self._loops_since_refresh >= self.refresh_loops
+
+    def tick(self) -> None:
+        """Record that a scheduler loop has completed."""
+        self._loops_since_refresh += 1
+
+    def invalidate(self) -> None:
+        """Force the cache to be re-read from the database before its next use."""
+        self._stale = True
+
+    def refresh(self, session: Session) -> None:
+        """Re-read the task instances in execution states from the database."""
+        self._active_tis = set()
+        self._concurrency_map = ConcurrencyMap(Counter(), Counter(), Counter())
+        rows = session.execute(
+            select(TI.dag_id, TI.run_id, TI.task_id, TI.map_index).where(TI.state.in_(EXECUTION_STATES))
+        )
+        for dag_id, run_id, task_id, map_index in rows:
+            self._add((dag_id, run_id, task_id, map_index))
+        self._stale = False
+        self._loops_since_refresh = 0
+
+    def get_concurrency_map(self) -> ConcurrencyMap:
+        """Return a copy of the cached concurrency map, which the caller is free to modify."""
+        return ConcurrencyMap(
+            Counter(self._concurrency_map.dag_active_tasks_map),
+            Counter(self._concurrency_map.task_concurrency_map),
+            Counter(self._concurrency_map.task_dagrun_concurrency_map),
+        )
+
+    def record_active(self, tis: Iterable[TI]) -> None:
+        """Record task instances that have been moved to an execution state."""
+        for ti in tis:
+            self._add((ti.dag_id, ti.run_id, ti.task_id, ti.map_index))
+
+    def record_inactive(self, tis: Iterable[TI]) -> None:
+        """Record task instances that have left the execution states."""
+        for ti in tis:
+            self._remove((ti.dag_id, ti.run_id, ti.task_id, ti.map_index))
+
+    def _add(self, key: tuple[str, str, str, int]) -> None:
+        if key in self._active_tis:
+            return
+        self._active_tis.add(key)
+        dag_id, run_id, task_id, _ = key
+        self._concurrency_map.dag_active_tasks_map[dag_id] += 1
+        self._concurrency_map.task_concurrency_map[(dag_id, task_id)] += 1
+        self._concurrency_map.task_dagrun_concurrency_map[(dag_id, run_id, task_id)] += 1
+
+    def _remove(self, key: tuple[str, str, str, int]) -> None:
+        if key not in self._active_tis:
+            return
+        self._active_tis.remove(key)
+        dag_id, run_id, task_id, _ = key
+        self._concurrency_map.dag_active_tasks_map[dag_id] -= 1
+        self._concurrency_map.task_concurrency_map[(dag_id, task_id)] -= 1
+        self._concurrency_map.task_dagrun_concurrency_map[(dag_id, run_id, task_id)] -= 1
+
+
 def _is_parent_process() -> bool:
     """
     Whether this is a parent process.
@@ -232,6 +320,25 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         # Dag Processor agent - not used in Dag Processor standalone mode.
         self.processor_agent: DagFileProcessorAgent | None = None
 
+        refresh_loops = conf.getint("scheduler", "scheduling_state_cache_refresh_loops")
+        self._scheduling_state_cache: SchedulingStateCache | None = None
+        if refresh_loops > 0:
+            self._scheduling_state_cache = SchedulingStateCache(refresh_loops)
+
+        self._wakeup_listener: SchedulerWakeupListener | None = None
+        if wakeup_notifications_enabled():
+            self._wakeup_listener = SchedulerWakeupListener()
+            self._wakeup_max_idle_sleep_time = conf.getfloat("scheduler", "wakeup_max_idle_sleep_time")
+
+        self._dag_sharding = conf.getboolean("scheduler", "dag_sharding")
+        # The DAGs this scheduler is responsible for when sharding, None meaning all DAGs.
+        self._owned_dag_ids: set[str] | None = None
+        self._shard_nodes: frozenset[str] = frozenset()
+
+        self._profiler: SchedulerProfiler | None = None
+        if conf.getboolean("scheduler", "enable_profiling"):
+            self._profiler = SchedulerProfiler(conf.getint("scheduler", "profiling_window_size"))
+
         self.dagbag = DagBag(dag_folder=self.subdir, read_dags_from_db=True, load_op_links=False)
 
     @provide_session
@@ -286,6 +393,58 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             {(dag_id, run_id, task_id): count for task_id, run_id, dag_id, count in ti_concurrency_query}
         )
 
+    def _get_task_concurrency_limits(
+        self, task_instances: Collection[TI], session: Session
+    ) -> tuple[dict[tuple[str, str], tuple[int | None, int | None]], set[str]]:
+        """
+        Get the task-level concurrency limits of the given candidate task instances.
+
+        Only DAGs which have task concurrency limits are looked up, using the scheduling view of the
+        serialized DAG so that their operators are not built, except for SubDAGs which are stored within
+        their parent DAG. Scheduled task instances of DAGs that cannot be found in the serialized_dag
+        table are failed, with a single query for all of them.
+
+        :param task_instances: Candidate task instances
+        :return: A map from (dag_id, task_id) to the ``max_active_tis_per_dag`` and
+            ``max_active_tis_per_dagrun`` limits of the task, and the ids of the DAGs that were not found.
+        """
+        limits: dict[tuple[str, str], tuple[int | None, int | None]] = {}
+        missing_dag_ids: set[str] = set()
+
+        task_ids_by_dag: dict[str, set[str]] = {}
+        subdag_ids: set[str] = set()
+        for ti in task_instances:
+            if ti.dag_model.has_task_concurrency_limits:
+                task_ids_by_dag.setdefault(ti.dag_id, set()).add(ti.task_id)
+                if ti.dag_model.is_subdag:
+                    subdag_ids.add(ti.dag_id)
+
+        for dag_id, task_ids in task_ids_by_dag.items():
+            serialized_dag: SchedulingDagView | DAG | None
+            if dag_id in subdag_ids:
+                # SubDAGs have no scheduling view, as they are stored within their parent DAG
+                serialized_dag = self.dagbag.get_dag(dag_id, session=session)
+            else:
+                serialized_dag = self.dagbag.get_scheduling_view(dag_id, session=session)
+            if not serialized_dag:
+                self.log.error("DAG '%s' for task instances not found in serialized_dag table", dag_id)
+                missing_dag_ids.add(dag_id)
+                continue
+            for task_id in task_ids:
+                if serialized_dag.has_task(task_id):
+                    task = serialized_dag.get_task(task_id)
+                    limits[(dag_id, task_id)] = (task.max_active_tis_per_dag, task.max_active_tis_per_dagrun)
+
+        if missing_dag_ids:
+            session.execute(
+                update(TI)
+                .where(TI.dag_id.in_(missing_dag_ids), TI.state == TaskInstanceState.SCHEDULED)
+                .values(state=TaskInstanceState.FAILED)
+                .execution_options(synchronize_session="fetch")
+            )
+
+        return limits, missing_dag_ids
+
     def _executable_task_instances_to_queued(self, max_tis: int, session: Session) -> list[TI]:
         """
         Find TIs that are ready for execution based on conditions.
@@ -338,7 +497,12 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         starved_pools = {pool_name for pool_name, stats in pools.items() if stats["open"] <= 0}
 
         # dag_id to # of running tasks and (dag_id, task_id) to # of running tasks.
-        concurrency_map = self.__get_concurrency_maps(states=EXECUTION_STATES, session=session)
+        if self._scheduling_state_cache:
+            if self._scheduling_state_cache.needs_refresh:
+                self._scheduling_state_cache.refresh(session=session)
+            concurrency_map = self._scheduling_state_cache.get_concurrency_map()
+        else:
+            concurrency_map = self.__get_concurrency_maps(states=EXECUTION_STATES, session=session)
 
         # Number of tasks that cannot be scheduled because of no open slot in pool
         num_starving_tasks_total = 0
@@ -371,6 +535,9 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 .order_by(-TI.priority_weight, DR.execution_date, TI.map_index)
             )
 
+            if self._owned_dag_ids is not None:
+                query = query.where(TI.dag_id.in_(self._owned_dag_ids))
+
             if starved_pools:
                 query = query.where(not_(TI.pool.in_(starved_pools)))
 
@@ -418,6 +585,11 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             task_instance_str = "\n".join(f"\t{x!r}" for x in task_instances_to_examine)
             self.log.info("%s tasks up for execution:\n%s", len(task_instances_to_examine), task_instance_str)
 
+            # Look up the task-level limits of all candidates in one pass, rather than per TI.
+            task_concurrency_limits, missing_dag_ids = self._get_task_concurrency_limits(
+                task_instances_to_examine, session=session
+            )
+
             for task_instance in task_instances_to_examine:
                 pool_name = task_instance.pool
 
@@ -497,29 +669,13 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     continue
 
                 if task_instance.dag_model.has_task_concurrency_limits:
-                    # Many dags don't have a task_concurrency, so where we can avoid loading the full
-                    # serialized DAG the better.
-                    serialized_dag = self.dagbag.get_dag(dag_id, session=session)
-                    # If the dag is missing, fail the task and continue to the next task.
-                    if not serialized_dag:
-                        self.log.error(
-                            "DAG '%s' for task instance %s not found in serialized_dag table",
-                            dag_id,
-                            task_instance,
-                        )
-                        session.execute(
-                            update(TI)
-                            .where(TI.dag_id == dag_id, TI.state == TaskInstanceState.SCHEDULED)
-                            .values(state=TaskInstanceState.FAILED)
-                            .execution_options(synchronize_session="fetch")
-                        )
+                    # TIs of DAGs missing from the serialized_dag table have already been failed.
+                    if dag_id in missing_dag_ids:
                         continue
 
-                    task_concurrency_limit: int | None = None
-                    if serialized_dag.has_task(task_instance.task_id):
-                        task_concurrency_limit = serialized_dag.get_task(
-                            task_instance.task_id
-                        ).max_active_tis_per_dag
+                    task_concurrency_limit, task_dagrun_concurrency_limit = task_concurrency_limits.get(
+                        (dag_id, task_instance.task_id), (None, None)
+                    )
 
                     if task_concurrency_limit is not None:
                         current_task_concurrency = concurrency_map.task_concurrency_map[
@@ -535,12 +691,6 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                             starved_tasks.add((task_instance.dag_id, task_instance.task_id))
                             continue
 
-                    task_dagrun_concurrency_limit: int | None = None
-                    if serialized_dag.has_task(task_instance.task_id):
-                        task_dagrun_concurrency_limit = serialized_dag.get_task(
-                            task_instance.task_id
-                        ).max_active_tis_per_dagrun
-
                     if task_dagrun_concurrency_limit is not None:
                         current_task_dagrun_concurrency = concurrency_map.task_dagrun_concurrency_map[
                             (task_instance.dag_id, task_instance.run_id, task_instance.task_id)
@@ -599,6 +749,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
             # set TIs to queued state
             filter_for_tis = TI.filter_for_tis(executable_tis)
+            queued_dttm = timezone.utcnow()
             session.execute(
                 update(TI)
                 .where(filter_for_tis)
@@ -606,7 +757,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     # TODO[ha]: should we use func.now()? How does that work with DB timezone
                     # on mysql when it's not UTC?
                     state=TaskInstanceState.QUEUED,
-                    queued_dttm=timezone.utcnow(),
+                    queued_dttm=queued_dttm,
                     queued_by_job_id=self.job.id,
                 )
                 .execution_options(synchronize_session=False)
@@ -615,8 +766,13 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             for ti in executable_tis:
                 ti.emit_state_change_metric(TaskInstanceState.QUEUED)
 
+            if self._scheduling_state_cache:
+                self._scheduling_state_cache.record_active(executable_tis)
+
         for ti in executable_tis:
             make_transient(ti)
+            # The bulk update above does not synchronize the session, the executor reads it when dispatching
+            ti.queued_dttm = queued_dttm
         return executable_tis
 
     def _enqueue_task_instances_with_queued_state(self, task_instances: list[TI], session: Session) -> None:
@@ -630,6 +786,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         for ti in task_instances:
             if ti.dag_run.state in State.finished_dr_states:
                 ti.set_state(None, session=session)
+                if self._scheduling_state_cache:
+                    self._scheduling_state_cache.record_inactive([ti])
                 continue
             command = ti.command_as_list(
                 local=True,
@@ -701,13 +859,15 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         query = select(TI).where(filter_for_tis).options(selectinload(TI.dag_model))
         # row lock this entire set of taskinstances to make sure the scheduler doesn't fail when we have
         # multi-schedulers
-        tis: Iterator[TI] = with_row_locks(
+        query = with_row_locks(
             query,
             of=TI,
             session=session,
             **skip_locked(session=session),
         )
-        tis = session.scalars(tis)
+        tis: list[TI] = session.scalars(query).all()
+        # Task instances killed externally, with the message and executor state, grouped by DAG
+        tis_killed_externally: dict[str, list[tuple[TI, TaskInstanceState, str]]] = defaultdict(list)
         for ti in tis:
             try_number = ti_primary_key_to_try_number_map[ti.key.primary]
             buffer_key = ti.key.with_try_number(try_number)
@@ -774,10 +934,42 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     "task says it's %s. (Info: %s) Was the task killed externally?"
                 )
                 self.log.error(msg, ti, state, ti.state, info)
+                tis_killed_externally[ti.dag_id].append((ti, state, msg % (ti, state, ti.state, info)))
+
+        if tis_killed_externally:
+            self._handle_tis_killed_externally(tis_killed_externally, session=session)
+
+        if self._scheduling_state_cache:
+            self._scheduling_state_cache.record_inactive(ti for ti in tis if ti.state not in EXECUTION_STATES)
+
+        return len(event_buffer)
 
-                # Get task from the Serialized DAG
+    def _handle_tis_killed_externally(
+        self, tis_by_dag_id: dict[str, list[tuple[TI, TaskInstanceState, str]]], session: Session
+    ) -> None:
+        """
+        Fail the task instances the executor reports finished although they are still queued.
+
+        Each DAG is loaded once for all its task instances, and the callbacks of all the task instances
+        are sent at once. Task instances without callbacks are failed at once too, unless their failure
+        has other side effects, such as emails or stopping the other tasks of the DAG.
+
+        :param tis_by_dag_id: task instances with the state reported by the executor and the error
+            message, grouped by DAG ID
+        """
+        callback_requests: list[TaskCallbackRequest] = []
+        tis_to_fail: list[tuple[TI, str]] = []
+        for dag_id, tis_killed in tis_by_dag_id.items():
+            # Get tasks from the Serialized DAG
+            try:
+                dag = self.dagbag.get_dag(dag_id)
+            except Exception:
+                self.log.exception("Failed to get DAG %s", dag_id)
+                dag = None
+            for ti, state, error in tis_killed:
                 try:
-                    dag = self.dagbag.get_dag(ti.dag_id)
+                    if dag is None:
+                        raise AirflowException(f"DAG {dag_id} not found")
                     task = dag.get_task(ti.task_id)
                 except Exception:
                     self.log.exception("Marking task instance %s as %s", ti, state)
@@ -785,17 +977,44 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     continue
                 ti.task = task
                 if task.on_retry_callback or task.on_failure_callback:
-                    request = TaskCallbackRequest(
-                        full_filepath=ti.dag_model.fileloc,
-                        simple_task_instance=SimpleTaskInstance.from_ti(ti),
-                        msg=msg % (ti, state, ti.state, info),
-                        processor_subdir=ti.dag_model.processor_subdir,
+                    callback_requests.append(
+                        TaskCallbackRequest(
+                            full_filepath=ti.dag_model.fileloc,
+                            simple_task_instance=SimpleTaskInstance.from_ti(ti),
+                            msg=error,
+                            processor_subdir=ti.dag_model.processor_subdir,
+                        )
                     )
-                    self.job.executor.send_callback(request)
+                elif task.email or dag.fail_stop:
+                    ti.handle_failure(error=error, session=session)
                 else:
-                    ti.handle_failure(error=msg % (ti, state, ti.state, info), session=session)
+                    tis_to_fail.append((ti, error))
+        if tis_to_fail:
+            self._fail_tis_without_side_effects(tis_to_fail, session=session)
+        if callback_requests:
+            executor = self.job.executor
+            if hasattr(executor, "send_callbacks"):
+                executor.send_callbacks(callback_requests)
+            else:
+                # Executors which do not subclass BaseExecutor, e.g. from older providers
+                for request in callback_requests:
+                    executor.send_callback(request)
 
-        return len(event_buffer)
+    def _fail_tis_without_side_effects(self, tis_with_errors: list[tuple[TI, str]], session: Session) -> None:
+        """
+        Fail task instances which have no callbacks nor emails, in bulk.
+
+        This records their failure as ``TaskInstance.handle_failure`` does, but they are already loaded
+        in the session, so they are not refreshed one by one, and their state changes, logs and task
+        failures are written by a single flush instead of one per task instance.
+
+        :param tis_with_errors: task instances, with their error message
+        """
+        for ti, error in tis_with_errors:
+            state = _record_failure(task_instance=ti, session=session)
+            self.log.info("Marking task instance %s as %s. Error: %s", ti, state, error)
+        session.flush()
+        notify_scheduler(session=session)
 
     def _execute(self) -> int | None:
         from airflow.dag_processing.manager import DagFileProcessorAgent
@@ -845,6 +1064,12 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             if self.processor_agent:
                 self.processor_agent.start()
 
+            if self._wakeup_listener:
+                self._wakeup_listener.start()
+
+            if self._profiler:
+                self._profiler.start()
+
             execute_start_time = timezone.utcnow()
 
             self._run_scheduler_loop()
@@ -876,9 +1101,49 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     self.processor_agent.end()
                 except Exception:
                     self.log.exception("Exception when executing DagFileProcessorAgent.end")
+            if self._wakeup_listener:
+                self._wakeup_listener.close()
+            if self._profiler:
+                self._profiler.stop()
+                self._profiler.write()
             self.log.info("Exited execute loop")
         return None
 
+    @provide_session
+    def _refresh_dag_shard(self, session: Session = NEW_SESSION) -> None:
+        """
+        Recompute the DAGs this scheduler is responsible for when DAG sharding is enabled.
+
+        The DAGs are split between the live schedulers with a consistent hash of their ``dag_id``,
+        so that a scheduler joining or leaving only moves the DAGs assigned to it.
+        """
+        health_check_threshold = conf.getint("scheduler", "scheduler_health_check_threshold")
+        live_job_ids = set(
+            session.scalars(
+                select(Job.id).where(
+                    Job.job_type == self.job_type,
+                    Job.state == JobState.RUNNING,
+                    Job.latest_heartbeat > timezone.utcnow() - timedelta(seconds=health_check_threshold),
+                )
+            )
+        )
+        live_job_ids.add(self.job.id)
+        ring = ConsistentHashRing(str(job_id) for job_id in live_job_ids)
+        own_node = str(self.job.id)
+        owned_dag_ids = {
+            dag_id
+            for dag_id in session.scalars(select(DagModel.dag_id).where(DagModel.is_active))
+            if ring.get_node(dag_id) == own_node
+        }
+
+        if self._owned_dag_ids is None or ring.nodes != self._shard_nodes:
+            self.log.info(
+                "Scheduling %d DAGs as one of %d live schedulers", len(owned_dag_ids), len(live_job_ids)
+            )
+        self._shard_nodes = ring.nodes
+        self._owned_dag_ids = owned_dag_ids
+        Stats.gauge("scheduler.dag_shard_size", len(owned_dag_ids))
+
     @provide_session
     def _update_dag_run_state_for_paused_dags(self, session: Session = NEW_SESSION) -> None:
         try:
@@ -928,6 +1193,14 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         timers = EventScheduler()
 
+        if self._dag_sharding:
+            # Claim our share of the DAGs before the first scheduling decisions
+            self._refresh_dag_shard()
+            timers.call_regular_interval(
+                conf.getfloat("scheduler", "dag_sharding_refresh_interval"),
+                self._refresh_dag_shard,
+            )
+
         # Check on start up, then every configured interval
         self.adopt_or_reset_orphaned_tasks()
 
@@ -969,6 +1242,12 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 self._cleanup_stale_dags,
             )
 
+        if self._profiler:
+            timers.call_regular_interval(
+                conf.getfloat("scheduler", "profiling_report_interval"),
+                self._profiler.write,
+            )
+
         for loop_count in itertools.count(start=1):
             with Stats.timer("scheduler.scheduler_loop_duration") as timer:
                 if self.using_sqlite and self.processor_agent:
@@ -981,9 +1260,11 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 with create_session() as session:
                     num_queued_tis = self._do_scheduling(session)
 
-                    self.job.executor.heartbeat()
+                    with self._profile("executor_heartbeat"):
+                        self.job.executor.heartbeat()
                     session.expunge_all()
-                    num_finished_events = self._process_executor_events(session=session)
+                    with self._profile("executor_events"):
+                        num_finished_events = self._process_executor_events(session=session)
                 if self.processor_agent:
                     self.processor_agent.heartbeat()
 
@@ -992,6 +1273,12 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     job=self.job, heartbeat_callback=self.heartbeat_callback, only_if_necessary=True
                 )
 
+                if self._scheduling_state_cache:
+                    self._scheduling_state_cache.tick()
+
+                if self._profiler:
+                    self._profiler.end_loop()
+
                 # Run any pending timed events
                 next_event = timers.run(blocking=False)
                 self.log.debug("Next timed event is in %f", next_event)
@@ -1002,7 +1289,14 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 # If the scheduler is doing things, don't sleep. This means when there is work to do, the
                 # scheduler will run "as quick as possible", but when it's stopped, it can sleep, dropping CPU
                 # usage when "idle"
-                time.sleep(min(self._scheduler_idle_sleep_time, next_event if next_event else 0))
+                if self._wakeup_listener:
+                    # Sleep longer, as new work wakes us up straight away.
+                    if self._wakeup_listener.wait(
+                        timeout=min(self._wakeup_max_idle_sleep_time, next_event if next_event else 0)
+                    ):
+                        self.log.debug("Woken up by a scheduler wakeup notification")
+                else:
+                    time.sleep(min(self._scheduler_idle_sleep_time, next_event if next_event else 0))
 
             if loop_count >= self.num_runs > 0:
                 self.log.info(
@@ -1020,6 +1314,12 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 )
                 break
 
+    def _profile(self, phase: str) -> AbstractContextManager:
+        """Record the wrapped phase of the scheduler loop when profiling is enabled."""
+        if self._profiler:
+            return self._profiler.phase(phase)
+        return nullcontext()
+
     def _do_scheduling(self, session: Session) -> int:
         """
         Make the main scheduling decisions.
@@ -1053,7 +1353,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         # Put a check in place to make sure we don't commit unexpectedly
         with prohibit_commit(session) as guard:
             if settings.USE_JOB_SCHEDULE:
-                self._create_dagruns_for_dags(guard, session)
+                with self._profile("create_dagruns"):
+                    self._create_dagruns_for_dags(guard, session)
 
             self._start_queued_dagruns(session)
             guard.commit()
@@ -1061,7 +1362,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             # Bulk fetch the currently active dag runs for the dags we are
             # examining, rather than making one query per DagRun
 
-            callback_tuples = self._schedule_all_dag_runs(guard, dag_runs, session)
+            with self._profile("schedule_dag_runs"):
+                callback_tuples = self._schedule_all_dag_runs(guard, dag_runs, session)
 
         # Send the callbacks after we commit to ensure the context is up to date when it gets run
         # cache saves time during scheduling of many dag_runs for same dag
@@ -1092,7 +1394,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     timer.start()
 
                     # Find anything TIs in state SCHEDULED, try to QUEUE it (send it to the executor)
-                    num_queued_tis = self._critical_section_enqueue_task_instances(session=session)
+                    with self._profile("critical_section"):
+                        num_queued_tis = self._critical_section_enqueue_task_instances(session=session)
 
                     # Make sure we only sent this metric if we obtained the lock, otherwise we'll skew the
                     # metric, way down
@@ -1100,6 +1403,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 except OperationalError as e:
                     timer.stop(send=False)
 
+                    # The task instances recorded as queued in the cache may have been rolled back
+                    self._invalidate_scheduling_state_cache()
                     if is_lock_not_available_error(error=e):
                         self.log.debug("Critical section lock held by another Scheduler")
                         Stats.incr("scheduler.critical_section_busy")
@@ -1107,19 +1412,30 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                         return 0
                     raise
 
-            guard.commit()
+            try:
+                guard.commit()
+            except Exception:
+                self._invalidate_scheduling_state_cache()
+                raise
 
         return num_queued_tis
 
+    def _invalidate_scheduling_state_cache(self) -> None:
+        """Re-read the scheduling state cache before its next use, if the scheduler keeps one."""
+        if self._scheduling_state_cache:
+            self._scheduling_state_cache.invalidate()
+
     @retry_db_transaction
     def _get_next_dagruns_to_examine(self, state: DagRunState, session: Session) -> Query:
         """Get Next DagRuns to Examine with retries."""
-        return DagRun.next_dagruns_to_examine(state, session)
+        return DagRun.next_dagruns_to_examine(state, session, dag_ids=self._owned_dag_ids)
 
     @retry_db_transaction
     def _create_dagruns_for_dags(self, guard: CommitProhibitorGuard, session: Session) -> None:
         """Find Dag Models needing DagRuns and Create Dag Runs with retries in case of OperationalError."""
-        query, dataset_triggered_dag_info = DagModel.dags_needing_dagruns(session)
+        query, dataset_triggered_dag_info = DagModel.dags_needing_dagruns(
+            session, dag_ids=self._owned_dag_ids
+        )
         all_dags_needing_dag_runs = set(query.all())
         dataset_triggered_dags = [
             dag for dag in all_dags_needing_dag_runs if dag.dag_id in dataset_triggered_dag_info
@@ -1158,6 +1474,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             DagRun.active_runs_of_dags(dag_ids=(dm.dag_id for dm in dag_models), session=session),
         )
 
+        new_dag_runs: list[DagRun] = []
         for dag_model in dag_models:
             dag = self.dagbag.get_dag(dag_model.dag_id, session=session)
             if not dag:
@@ -1176,16 +1493,17 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             # create a new one. This is so that in the next Scheduling loop we try to create new runs
             # instead of falling in a loop of Integrity Error.
             if (dag.dag_id, dag_model.next_dagrun) not in existing_dagruns:
-                dag.create_dagrun(
+                dag_run = dag._build_dagrun(
                     run_type=DagRunType.SCHEDULED,
                     execution_date=dag_model.next_dagrun,
                     state=DagRunState.QUEUED,
                     data_interval=data_interval,
                     external_trigger=False,
-                    session=session,
                     dag_hash=dag_hash,
                     creating_job_id=self.job.id,
                 )
+                dag_run.dag = dag
+                new_dag_runs.append(dag_run)
                 active_runs_of_dags[dag.dag_id] += 1
             if self._should_update_dag_next_dagruns(
                 dag,
@@ -1195,6 +1513,14 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 session=session,
             ):
                 dag_model.calculate_dagrun_date_fields(dag, data_interval)
+
+        if new_dag_runs:
+            # Insert all the runs, then all their task instances, rather than a few statements per run.
+            # The DagModel updates are batched by the ORM when the session is flushed.
+            session.add_all(new_dag_runs)
+            session.flush()
+            DagRun.bulk_verify_integrity(new_dag_runs, session=session)
+            notify_scheduler(session=session)
         # TODO[HA]: Should we do a session.flush() so we don't have to keep lots of state/object in
         # memory for larger dags? or expunge_all()
 
@@ -1566,6 +1892,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         try:
             tis_for_warning_message = self.job.executor.cleanup_stuck_queued_tasks(tis=tasks_stuck_in_queued)
             if tis_for_warning_message:
+                # The executor changed the state of the task instances without the scheduler knowing
+                self._invalidate_scheduling_state_cache()
                 task_instance_str = "\n\t".join(tis_for_warning_message)
                 self.log.warning(
                     "Marked the following %s task instances stuck in queued as failed. "
@@ -1659,6 +1987,9 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     for ti in set(tis_to_adopt_or_reset) - set(to_reset):
                         ti.queued_by_job_id = self.job.id
 
+                    if self._scheduling_state_cache:
+                        self._scheduling_state_cache.record_inactive(to_reset)
+
                     Stats.incr("scheduler.orphaned_tasks.cleared", len(to_reset))
                     Stats.incr("scheduler.orphaned_tasks.adopted", len(tis_to_adopt_or_reset) - len(to_reset))
 
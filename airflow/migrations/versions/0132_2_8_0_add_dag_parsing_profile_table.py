@@ -0,0 +1,62 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add dag_parsing_profile table
+
+Revision ID: 7c2a5b1d9e4f
+Revises: bd5dfbe21f88
+Create Date: 2023-10-02 10:12:45.135812
+
+"""
+from __future__ import annotations
+
+import json
+
+import sqlalchemy as sa
+import sqlalchemy_jsonfield
+from alembic import op
+
+from airflow.migrations.db_types import TIMESTAMP
+
+# revision identifiers, used by Alembic.
+revision = "7c2a5b1d9e4f"
+down_revision = "bd5dfbe21f88"
+branch_labels = None
+depends_on = None
+airflow_version = "2.8.0"
+
+
+def upgrade():
+    """Apply Add dag_parsing_profile table"""
+    op.create_table(
+        "dag_parsing_profile",
+        sa.Column("fileloc_hash", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("fileloc", sa.String(length=2000), nullable=False),
+        sa.Column("processor_subdir", sa.String(length=2000), nullable=True),
+        sa.Column("timestamp", TIMESTAMP, nullable=False),
+        sa.Column("duration", sa.Float(), nullable=False),
+        sa.Column("peak_rss", sa.BigInteger(), nullable=True),
+        sa.Column("phases", sqlalchemy_jsonfield.JSONField(json=json), nullable=False),
+        sa.Column("imports", sqlalchemy_jsonfield.JSONField(json=json), nullable=False),
+        sa.PrimaryKeyConstraint("fileloc_hash", name=op.f("dag_parsing_profile_pkey")),
+    )
+
+
+def downgrade():
+    """Unapply Add dag_parsing_profile table"""
+    op.drop_table("dag_parsing_profile")
@@ -59,6 +59,7 @@ def import_all_models():
     for name in __lazy_imports:
         __getattr__(name)
 
+    import airflow.models.dagparsingprofile
     import airflow.models.dagwarning
     import airflow.models.dataset
     import airflow.models.serialized_dag
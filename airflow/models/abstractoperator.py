@@ -408,6 +408,9 @@ class AbstractOperator(Templater, DAGNode):
         dag = self.get_dag()
         if dag is None:
             return self.priority_weight
+        if dag._priority_weights is not None:
+            # Precomputed for all the tasks of the DAG when it was serialized
+            return dag._priority_weights.get(self.task_id, self.priority_weight)
         return self.priority_weight + sum(
             dag.task_dict[task_id].priority_weight
             for task_id in self.get_flat_relative_ids(upstream=upstream)
@@ -31,6 +31,7 @@ import traceback
 import warnings
 import weakref
 from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from inspect import signature
 from typing import (
@@ -71,7 +72,7 @@ from sqlalchemy import (
     update,
 )
 from sqlalchemy.ext.associationproxy import association_proxy
-from sqlalchemy.orm import backref, joinedload, relationship
+from sqlalchemy.orm import backref, joinedload, relationship, selectinload
 from sqlalchemy.sql import Select, expression
 
 import airflow.templates
@@ -118,8 +119,9 @@ from airflow.utils import timezone
 from airflow.utils.dag_cycle_tester import check_cycle
 from airflow.utils.dates import cron_presets, date_range as utils_date_range
 from airflow.utils.decorators import fixup_decorator_warning_stack
-from airflow.utils.helpers import at_most_one, exactly_one, validate_key
+from airflow.utils.helpers import at_most_one, chunks, exactly_one, validate_key
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.sqlalchemy import (
     Interval,
@@ -132,6 +134,7 @@ from airflow.utils.sqlalchemy import (
 from airflow.utils.state import DagRunState, State, TaskInstanceState
 from airflow.utils.trigger_rule import TriggerRule
 from airflow.utils.types import NOTSET, ArgNotSet, DagRunType, EdgeInfoType
+from airflow.utils.weight_rule import WeightRule
 
 if TYPE_CHECKING:
     from types import ModuleType
@@ -427,6 +430,12 @@ class DAG(LoggingMixin):
 
     parent_dag: DAG | None = None  # Gets set when DAGs are loaded
 
+    _priority_weights: dict[str, int] | None = None
+    """Total priority weights of the tasks, precomputed when the DAG was serialized.
+
+    Only the weights that differ from the task's own ``priority_weight`` are stored.
+    """
+
     # NOTE: When updating arguments here, please also keep arguments in @dag()
     # below in sync. (Search for 'def dag(' in this file.)
     def __init__(
@@ -2187,6 +2196,66 @@ class DAG(LoggingMixin):
 
         return tuple(nested_topo(self.task_group))
 
+    def get_priority_weights(self) -> dict[str, int]:
+        """
+        Compute the total priority weight of every task, in one topological pass over the DAG.
+
+        This gives the same values as ``priority_weight_total`` of each task, without walking the
+        relatives of each task separately. The relatives of each task are tracked as a bitmask, so
+        that relatives reachable through several paths are only counted once.
+
+        :return: A map from task ID to its total priority weight
+        """
+        tasks = list(self.task_dict.values())
+        index = {task.task_id: i for i, task in enumerate(tasks)}
+        downstream = [[index[t] for t in task.downstream_task_ids if t in index] for task in tasks]
+
+        # Kahn's algorithm, tasks in a cycle are left out
+        num_upstream = [0] * len(tasks)
+        for children in downstream:
+            for child in children:
+                num_upstream[child] += 1
+        order = [i for i, n in enumerate(num_upstream) if n == 0]
+        for i in order:
+            for child in downstream[i]:
+                num_upstream[child] -= 1
+                if not num_upstream[child]:
+                    order.append(child)
+
+        # Tasks of the same weight share a mask, so that the weight of a set of relatives is a sum
+        # over the (few) distinct weights rather than over the relatives.
+        masks_by_weight: dict[int, int] = collections.defaultdict(int)
+        for i, task in enumerate(tasks):
+            masks_by_weight[task.priority_weight] |= 1 << i
+
+        def _weight_of(relatives: int) -> int:
+            return sum(weight * bin(relatives & mask).count("1") for weight, mask in masks_by_weight.items())
+
+        weight_rules = [task.weight_rule for task in tasks]
+        downstream_masks = [0] * len(tasks)
+        if any(rule != WeightRule.ABSOLUTE and rule != WeightRule.UPSTREAM for rule in weight_rules):
+            for i in reversed(order):
+                for child in downstream[i]:
+                    downstream_masks[i] |= (1 << child) | downstream_masks[child]
+        upstream_masks = [0] * len(tasks)
+        if WeightRule.UPSTREAM in weight_rules:
+            for i in order:
+                for child in downstream[i]:
+                    upstream_masks[child] |= (1 << i) | upstream_masks[i]
+
+        in_order = set(order)
+        priority_weights = {}
+        for i, task in enumerate(tasks):
+            if i not in in_order:
+                priority_weights[task.task_id] = task.priority_weight_total
+            elif weight_rules[i] == WeightRule.ABSOLUTE:
+                priority_weights[task.task_id] = task.priority_weight
+            elif weight_rules[i] == WeightRule.UPSTREAM:
+                priority_weights[task.task_id] = task.priority_weight + _weight_of(upstream_masks[i])
+            else:
+                priority_weights[task.task_id] = task.priority_weight + _weight_of(downstream_masks[i])
+        return priority_weights
+
     @provide_session
     def set_dag_runs_state(
         self,
@@ -2433,6 +2502,8 @@ class DAG(LoggingMixin):
         # the tasks anyway, so we copy the tasks manually later
         memo = {id(self.task_dict): None, id(self._task_group): None}
         dag = copy.deepcopy(self, memo)  # type: ignore
+        # Precomputed priority weights would include the weights of the tasks left out of the subset
+        dag._priority_weights = None
 
         if isinstance(task_ids_or_regex, (str, Pattern)):
             matched_tasks = [t for t in self.tasks if re2.findall(task_ids_or_regex, t.task_id)]
@@ -2891,6 +2962,49 @@ class DAG(LoggingMixin):
         :param dag_hash: Hash of Serialized DAG
         :param data_interval: Data interval of the DagRun
         """
+        run = self._build_dagrun(
+            state=state,
+            execution_date=execution_date,
+            run_id=run_id,
+            start_date=start_date,
+            external_trigger=external_trigger,
+            conf=conf,
+            run_type=run_type,
+            dag_hash=dag_hash,
+            creating_job_id=creating_job_id,
+            data_interval=data_interval,
+        )
+        session.add(run)
+        session.flush()
+
+        run.dag = self
+
+        # create the associated task instances
+        # state is None at the moment of creation
+        run.verify_integrity(session=session)
+
+        notify_scheduler(session=session)
+
+        return run
+
+    def _build_dagrun(
+        self,
+        state: DagRunState,
+        execution_date: datetime | None = None,
+        run_id: str | None = None,
+        start_date: datetime | None = None,
+        external_trigger: bool | None = False,
+        conf: dict | None = None,
+        run_type: DagRunType | None = None,
+        dag_hash: str | None = None,
+        creating_job_id: int | None = None,
+        data_interval: tuple[datetime, datetime] | None = None,
+    ) -> DagRun:
+        """
+        Validate the arguments of a new dag run and build it, without adding it to the session.
+
+        See :meth:`create_dagrun` for the parameters.
+        """
         logical_date = timezone.coerce_datetime(execution_date)
 
         if data_interval and not isinstance(data_interval, DataInterval):
@@ -2900,7 +3014,7 @@ class DAG(LoggingMixin):
             warnings.warn(
                 "Calling `DAG.create_dagrun()` without an explicit data interval is deprecated",
                 RemovedInAirflow3Warning,
-                stacklevel=3,
+                stacklevel=4,
             )
             if run_type == DagRunType.MANUAL:
                 data_interval = self.timetable.infer_manual_data_interval(run_after=logical_date)
@@ -2950,7 +3064,7 @@ class DAG(LoggingMixin):
         copied_params.update(conf or {})
         copied_params.validate()
 
-        run = DagRun(
+        return DagRun(
             dag_id=self.dag_id,
             run_id=run_id,
             execution_date=logical_date,
@@ -2963,16 +3077,6 @@ class DAG(LoggingMixin):
             creating_job_id=creating_job_id,
             data_interval=data_interval,
         )
-        session.add(run)
-        session.flush()
-
-        run.dag = self
-
-        # create the associated task instances
-        # state is None at the moment of creation
-        run.verify_integrity(session=session)
-
-        return run
 
     @classmethod
     @provide_session
@@ -3009,117 +3113,141 @@ class DAG(LoggingMixin):
             return
 
         log.info("Sync %s DAGs", len(dags))
+        phase_durations: dict[str, float] = {}
+
+        @contextmanager
+        def _timed_phase(phase: str) -> Iterator[None]:
+            with Stats.timer(f"dag_processing.bulk_write_to_db.{phase}") as timer:
+                yield
+            phase_durations[phase] = timer.duration or 0.0
+
         dag_by_ids = {dag.dag_id: dag for dag in dags}
 
-        dag_ids = set(dag_by_ids)
-        query = (
-            select(DagModel)
-            .options(joinedload(DagModel.tags, innerjoin=False))
-            .where(DagModel.dag_id.in_(dag_ids))
-            .options(joinedload(DagModel.schedule_dataset_references))
-            .options(joinedload(DagModel.task_outlet_dataset_references))
-        )
-        query = with_row_locks(query, of=DagModel, session=session)
-        orm_dags: list[DagModel] = session.scalars(query).unique().all()
-        existing_dags = {orm_dag.dag_id: orm_dag for orm_dag in orm_dags}
-        missing_dag_ids = dag_ids.difference(existing_dags)
-
-        for missing_dag_id in missing_dag_ids:
-            orm_dag = DagModel(dag_id=missing_dag_id)
-            dag = dag_by_ids[missing_dag_id]
-            if dag.is_paused_upon_creation is not None:
-                orm_dag.is_paused = dag.is_paused_upon_creation
-            orm_dag.tags = []
-            log.info("Creating ORM DAG for %s", dag.dag_id)
-            session.add(orm_dag)
-            orm_dags.append(orm_dag)
-
-        dag_id_to_last_automated_run: dict[str, DagRun] = {}
-        num_active_runs: dict[str, int] = {}
-        # Skip these queries entirely if no DAGs can be scheduled to save time.
-        if any(dag.timetable.can_be_scheduled for dag in dags):
-            # Get the latest automated dag run for each existing dag as a single query (avoid n+1 query)
-            last_automated_runs_subq = (
-                select(DagRun.dag_id, func.max(DagRun.execution_date).label("max_execution_date"))
-                .where(
-                    DagRun.dag_id.in_(existing_dags),
-                    or_(DagRun.run_type == DagRunType.BACKFILL_JOB, DagRun.run_type == DagRunType.SCHEDULED),
-                )
-                .group_by(DagRun.dag_id)
-                .subquery()
+        with _timed_phase("dags"):
+            dag_ids = set(dag_by_ids)
+            # The collections are loaded with one IN query each, as joining them all to the DAGs would
+            # return the product of their rows for each DAG.
+            query = (
+                select(DagModel)
+                .options(selectinload(DagModel.tags))
+                .where(DagModel.dag_id.in_(dag_ids))
+                .options(selectinload(DagModel.dag_owner_links))
+                .options(selectinload(DagModel.schedule_dataset_references))
+                .options(selectinload(DagModel.task_outlet_dataset_references))
             )
-            last_automated_runs = session.scalars(
-                select(DagRun).where(
-                    DagRun.dag_id == last_automated_runs_subq.c.dag_id,
-                    DagRun.execution_date == last_automated_runs_subq.c.max_execution_date,
+            query = with_row_locks(query, of=DagModel, session=session)
+            orm_dags: list[DagModel] = session.scalars(query).all()
+            existing_dags = {orm_dag.dag_id: orm_dag for orm_dag in orm_dags}
+            missing_dag_ids = dag_ids.difference(existing_dags)
+
+            for missing_dag_id in missing_dag_ids:
+                orm_dag = DagModel(dag_id=missing_dag_id)
+                dag = dag_by_ids[missing_dag_id]
+                if dag.is_paused_upon_creation is not None:
+                    orm_dag.is_paused = dag.is_paused_upon_creation
+                orm_dag.tags = []
+                orm_dag.dag_owner_links = []
+                log.info("Creating ORM DAG for %s", dag.dag_id)
+                session.add(orm_dag)
+                orm_dags.append(orm_dag)
+
+            dag_id_to_last_automated_run: dict[str, DagRun] = {}
+            num_active_runs: dict[str, int] = {}
+            # Skip these queries entirely if no DAGs can be scheduled to save time.
+            if any(dag.timetable.can_be_scheduled for dag in dags):
+                # Get the latest automated dag run for each existing dag as a single query (avoid n+1 query)
+                last_automated_runs_subq = (
+                    select(DagRun.dag_id, func.max(DagRun.execution_date).label("max_execution_date"))
+                    .where(
+                        DagRun.dag_id.in_(existing_dags),
+                        or_(
+                            DagRun.run_type == DagRunType.BACKFILL_JOB,
+                            DagRun.run_type == DagRunType.SCHEDULED,
+                        ),
+                    )
+                    .group_by(DagRun.dag_id)
+                    .subquery()
                 )
-            )
-            dag_id_to_last_automated_run = {run.dag_id: run for run in last_automated_runs}
-
-            # Get number of active dagruns for all dags we are processing as a single query.
-            num_active_runs = DagRun.active_runs_of_dags(dag_ids=existing_dags, session=session)
+                last_automated_runs = session.scalars(
+                    select(DagRun).where(
+                        DagRun.dag_id == last_automated_runs_subq.c.dag_id,
+                        DagRun.execution_date == last_automated_runs_subq.c.max_execution_date,
+                    )
+                )
+                dag_id_to_last_automated_run = {run.dag_id: run for run in last_automated_runs}
+
+                # Get number of active dagruns for all dags we are processing as a single query.
+                num_active_runs = DagRun.active_runs_of_dags(dag_ids=existing_dags, session=session)
+
+            filelocs = []
+
+            # The rows of all the DAGs, with their tags and owner links, are diffed in memory here, and
+            # written by the flush below in as few statements as possible.
+            for orm_dag in sorted(orm_dags, key=lambda d: d.dag_id):
+                dag = dag_by_ids[orm_dag.dag_id]
+                filelocs.append(dag.fileloc)
+                if dag.is_subdag:
+                    orm_dag.is_subdag = True
+                    orm_dag.fileloc = dag.parent_dag.fileloc  # type: ignore
+                    orm_dag.root_dag_id = dag.parent_dag.dag_id  # type: ignore
+                    orm_dag.owners = dag.parent_dag.owner  # type: ignore
+                else:
+                    orm_dag.is_subdag = False
+                    orm_dag.fileloc = dag.fileloc
+                    orm_dag.owners = dag.owner
+                orm_dag.is_active = True
+                orm_dag.has_import_errors = False
+                orm_dag.last_parsed_time = timezone.utcnow()
+                orm_dag.default_view = dag.default_view
+                orm_dag.description = dag.description
+                orm_dag.max_active_tasks = dag.max_active_tasks
+                orm_dag.max_active_runs = dag.max_active_runs
+                orm_dag.has_task_concurrency_limits = any(
+                    t.max_active_tis_per_dag is not None or t.max_active_tis_per_dagrun is not None
+                    for t in dag.tasks
+                )
+                orm_dag.schedule_interval = dag.schedule_interval
+                orm_dag.timetable_description = dag.timetable.description
+                orm_dag.processor_subdir = processor_subdir
 
-        filelocs = []
+                last_automated_run: DagRun | None = dag_id_to_last_automated_run.get(dag.dag_id)
+                if last_automated_run is None:
+                    last_automated_data_interval = None
+                else:
+                    last_automated_data_interval = dag.get_run_data_interval(last_automated_run)
+                if num_active_runs.get(dag.dag_id, 0) >= orm_dag.max_active_runs:
+                    orm_dag.next_dagrun_create_after = None
+                else:
+                    orm_dag.calculate_dagrun_date_fields(dag, last_automated_data_interval)
+
+                # Removing a tag or an owner link from its relationship deletes it (delete-orphan cascade)
+                dag_tags = set(dag.tags or {})
+                orm_dag_tags = list(orm_dag.tags or [])
+                for orm_tag in orm_dag_tags:
+                    if orm_tag.name not in dag_tags:
+                        orm_dag.tags.remove(orm_tag)
+                orm_tag_names = {t.name for t in orm_dag_tags}
+                for dag_tag in dag_tags:
+                    if dag_tag not in orm_tag_names:
+                        orm_dag.tags.append(DagTag(name=dag_tag, dag_id=dag.dag_id))
+
+                orm_dag_links = {link.owner: link for link in orm_dag.dag_owner_links or []}
+                for owner_name, orm_dag_link in orm_dag_links.items():
+                    if owner_name not in dag.owner_links:
+                        orm_dag.dag_owner_links.remove(orm_dag_link)
+                for owner_name, owner_link in dag.owner_links.items():
+                    orm_dag_link = orm_dag_links.get(owner_name)
+                    if orm_dag_link is None:
+                        orm_dag.dag_owner_links.append(
+                            DagOwnerAttributes(dag_id=dag.dag_id, owner=owner_name, link=owner_link)
+                        )
+                    elif orm_dag_link.link != owner_link:
+                        orm_dag_link.link = owner_link
 
-        for orm_dag in sorted(orm_dags, key=lambda d: d.dag_id):
-            dag = dag_by_ids[orm_dag.dag_id]
-            filelocs.append(dag.fileloc)
-            if dag.is_subdag:
-                orm_dag.is_subdag = True
-                orm_dag.fileloc = dag.parent_dag.fileloc  # type: ignore
-                orm_dag.root_dag_id = dag.parent_dag.dag_id  # type: ignore
-                orm_dag.owners = dag.parent_dag.owner  # type: ignore
-            else:
-                orm_dag.is_subdag = False
-                orm_dag.fileloc = dag.fileloc
-                orm_dag.owners = dag.owner
-            orm_dag.is_active = True
-            orm_dag.has_import_errors = False
-            orm_dag.last_parsed_time = timezone.utcnow()
-            orm_dag.default_view = dag.default_view
-            orm_dag.description = dag.description
-            orm_dag.max_active_tasks = dag.max_active_tasks
-            orm_dag.max_active_runs = dag.max_active_runs
-            orm_dag.has_task_concurrency_limits = any(
-                t.max_active_tis_per_dag is not None or t.max_active_tis_per_dagrun is not None
-                for t in dag.tasks
-            )
-            orm_dag.schedule_interval = dag.schedule_interval
-            orm_dag.timetable_description = dag.timetable.description
-            orm_dag.processor_subdir = processor_subdir
+            session.flush()
 
-            last_automated_run: DagRun | None = dag_id_to_last_automated_run.get(dag.dag_id)
-            if last_automated_run is None:
-                last_automated_data_interval = None
-            else:
-                last_automated_data_interval = dag.get_run_data_interval(last_automated_run)
-            if num_active_runs.get(dag.dag_id, 0) >= orm_dag.max_active_runs:
-                orm_dag.next_dagrun_create_after = None
-            else:
-                orm_dag.calculate_dagrun_date_fields(dag, last_automated_data_interval)
-
-            dag_tags = set(dag.tags or {})
-            orm_dag_tags = list(orm_dag.tags or [])
-            for orm_tag in orm_dag_tags:
-                if orm_tag.name not in dag_tags:
-                    session.delete(orm_tag)
-                    orm_dag.tags.remove(orm_tag)
-            orm_tag_names = {t.name for t in orm_dag_tags}
-            for dag_tag in dag_tags:
-                if dag_tag not in orm_tag_names:
-                    dag_tag_orm = DagTag(name=dag_tag, dag_id=dag.dag_id)
-                    orm_dag.tags.append(dag_tag_orm)
-                    session.add(dag_tag_orm)
-
-            orm_dag_links = orm_dag.dag_owner_links or []
-            for orm_dag_link in orm_dag_links:
-                if orm_dag_link not in dag.owner_links:
-                    session.delete(orm_dag_link)
-            for owner_name, owner_link in dag.owner_links.items():
-                dag_owner_orm = DagOwnerAttributes(dag_id=dag.dag_id, owner=owner_name, link=owner_link)
-                session.add(dag_owner_orm)
-
-        DagCode.bulk_sync_to_db(filelocs, session=session)
+        with _timed_phase("dag_code"):
+            DagCode.bulk_sync_to_db(filelocs, session=session)
 
         from airflow.datasets import Dataset
         from airflow.models.dataset import (
@@ -3128,101 +3256,115 @@ class DAG(LoggingMixin):
             TaskOutletDatasetReference,
         )
 
-        dag_references = collections.defaultdict(set)
-        outlet_references = collections.defaultdict(set)
-        # We can't use a set here as we want to preserve order
-        outlet_datasets: dict[Dataset, None] = {}
-        input_datasets: dict[Dataset, None] = {}
-
-        # here we go through dags and tasks to check for dataset references
-        # if there are now None and previously there were some, we delete them
-        # if there are now *any*, we add them to the above data structures, and
-        # later we'll persist them to the database.
-        for dag in dags:
-            curr_orm_dag = existing_dags.get(dag.dag_id)
-            if not dag.dataset_triggers:
-                if curr_orm_dag and curr_orm_dag.schedule_dataset_references:
-                    curr_orm_dag.schedule_dataset_references = []
-            for dataset in dag.dataset_triggers:
-                dag_references[dag.dag_id].add(dataset.uri)
-                input_datasets[DatasetModel.from_public(dataset)] = None
-            curr_outlet_references = curr_orm_dag and curr_orm_dag.task_outlet_dataset_references
-            for task in dag.tasks:
-                dataset_outlets = [x for x in task.outlets or [] if isinstance(x, Dataset)]
-                if not dataset_outlets:
-                    if curr_outlet_references:
-                        this_task_outlet_refs = [
-                            x
-                            for x in curr_outlet_references
-                            if x.dag_id == dag.dag_id and x.task_id == task.task_id
-                        ]
-                        for ref in this_task_outlet_refs:
-                            curr_outlet_references.remove(ref)
-                for d in dataset_outlets:
-                    outlet_references[(task.dag_id, task.task_id)].add(d.uri)
-                    outlet_datasets[DatasetModel.from_public(d)] = None
-        all_datasets = outlet_datasets
-        all_datasets.update(input_datasets)
-
-        # store datasets
-        stored_datasets = {}
-        for dataset in all_datasets:
-            stored_dataset = session.scalar(
-                select(DatasetModel).where(DatasetModel.uri == dataset.uri).limit(1)
-            )
-            if stored_dataset:
-                # Some datasets may have been previously unreferenced, and therefore orphaned by the
-                # scheduler. But if we're here, then we have found that dataset again in our DAGs, which
-                # means that it is no longer an orphan, so set is_orphaned to False.
-                stored_dataset.is_orphaned = expression.false()
-                stored_datasets[stored_dataset.uri] = stored_dataset
-            else:
-                session.add(dataset)
-                stored_datasets[dataset.uri] = dataset
-
-        session.flush()  # this is required to ensure each dataset has its PK loaded
-
-        del all_datasets
+        with _timed_phase("datasets"):
+            dag_references = collections.defaultdict(set)
+            outlet_references = collections.defaultdict(set)
+            # We can't use a set here as we want to preserve order
+            outlet_datasets: dict[Dataset, None] = {}
+            input_datasets: dict[Dataset, None] = {}
+
+            # here we go through dags and tasks to check for dataset references
+            # if there are now None and previously there were some, we delete them
+            # if there are now *any*, we add them to the above data structures, and
+            # later we'll persist them to the database.
+            for dag in dags:
+                curr_orm_dag = existing_dags.get(dag.dag_id)
+                if not dag.dataset_triggers:
+                    if curr_orm_dag and curr_orm_dag.schedule_dataset_references:
+                        curr_orm_dag.schedule_dataset_references = []
+                for dataset in dag.dataset_triggers:
+                    dag_references[dag.dag_id].add(dataset.uri)
+                    input_datasets[DatasetModel.from_public(dataset)] = None
+                curr_outlet_references = curr_orm_dag and curr_orm_dag.task_outlet_dataset_references
+                for task in dag.tasks:
+                    dataset_outlets = [x for x in task.outlets or [] if isinstance(x, Dataset)]
+                    if not dataset_outlets:
+                        if curr_outlet_references:
+                            this_task_outlet_refs = [
+                                x
+                                for x in curr_outlet_references
+                                if x.dag_id == dag.dag_id and x.task_id == task.task_id
+                            ]
+                            for ref in this_task_outlet_refs:
+                                curr_outlet_references.remove(ref)
+                    for d in dataset_outlets:
+                        outlet_references[(task.dag_id, task.task_id)].add(d.uri)
+                        outlet_datasets[DatasetModel.from_public(d)] = None
+            all_datasets = outlet_datasets
+            all_datasets.update(input_datasets)
+
+            # store datasets, looking up all the stored ones at once
+            stored_datasets = {}
+            for uris in chunks([dataset.uri for dataset in all_datasets], 500):
+                for stored_dataset in session.scalars(select(DatasetModel).where(DatasetModel.uri.in_(uris))):
+                    # Some datasets may have been previously unreferenced, and therefore orphaned by the
+                    # scheduler. But if we're here, then we have found that dataset again in our DAGs,
+                    # which means that it is no longer an orphan, so set is_orphaned to False.
+                    if stored_dataset.is_orphaned:
+                        stored_dataset.is_orphaned = expression.false()
+                    stored_datasets[stored_dataset.uri] = stored_dataset
+            for dataset in all_datasets:
+                if dataset.uri not in stored_datasets:
+                    session.add(dataset)
+                    stored_datasets[dataset.uri] = dataset
+
+            session.flush()  # this is required to ensure each dataset has its PK loaded
+
+            del all_datasets
+
+        with _timed_phase("dataset_references"):
+            # reconcile dag-schedule-on-dataset references
+            dag_refs_to_add = []
+            for dag_id, uri_list in dag_references.items():
+                dag_refs_needed = {
+                    DagScheduleDatasetReference(dataset_id=stored_datasets[uri].id, dag_id=dag_id)
+                    for uri in uri_list
+                }
+                dag_refs_stored = set(
+                    existing_dags.get(dag_id)
+                    and existing_dags.get(dag_id).schedule_dataset_references  # type: ignore
+                    or []
+                )
+                dag_refs_to_add.extend(x for x in dag_refs_needed if x not in dag_refs_stored)
+                for obj in dag_refs_stored - dag_refs_needed:
+                    session.delete(obj)
+
+            existing_task_outlet_refs_dict = collections.defaultdict(set)
+            for dag_id, orm_dag in existing_dags.items():
+                for todr in orm_dag.task_outlet_dataset_references:
+                    existing_task_outlet_refs_dict[(dag_id, todr.task_id)].add(todr)
+
+            # reconcile task-outlet-dataset references
+            task_refs_to_add = []
+            for (dag_id, task_id), uri_list in outlet_references.items():
+                task_refs_needed = {
+                    TaskOutletDatasetReference(
+                        dataset_id=stored_datasets[uri].id, dag_id=dag_id, task_id=task_id
+                    )
+                    for uri in uri_list
+                }
+                task_refs_stored = existing_task_outlet_refs_dict[(dag_id, task_id)]
+                task_refs_to_add.extend(x for x in task_refs_needed if x not in task_refs_stored)
+                for obj in task_refs_stored - task_refs_needed:
+                    session.delete(obj)
 
-        # reconcile dag-schedule-on-dataset references
-        for dag_id, uri_list in dag_references.items():
-            dag_refs_needed = {
-                DagScheduleDatasetReference(dataset_id=stored_datasets[uri].id, dag_id=dag_id)
-                for uri in uri_list
-            }
-            dag_refs_stored = set(
-                existing_dags.get(dag_id)
-                and existing_dags.get(dag_id).schedule_dataset_references  # type: ignore
-                or []
-            )
-            dag_refs_to_add = {x for x in dag_refs_needed if x not in dag_refs_stored}
+            # The new references of all the DAGs are inserted at once
             session.bulk_save_objects(dag_refs_to_add)
-            for obj in dag_refs_stored - dag_refs_needed:
-                session.delete(obj)
-
-        existing_task_outlet_refs_dict = collections.defaultdict(set)
-        for dag_id, orm_dag in existing_dags.items():
-            for todr in orm_dag.task_outlet_dataset_references:
-                existing_task_outlet_refs_dict[(dag_id, todr.task_id)].add(todr)
-
-        # reconcile task-outlet-dataset references
-        for (dag_id, task_id), uri_list in outlet_references.items():
-            task_refs_needed = {
-                TaskOutletDatasetReference(dataset_id=stored_datasets[uri].id, dag_id=dag_id, task_id=task_id)
-                for uri in uri_list
-            }
-            task_refs_stored = existing_task_outlet_refs_dict[(dag_id, task_id)]
-            task_refs_to_add = {x for x in task_refs_needed if x not in task_refs_stored}
             session.bulk_save_objects(task_refs_to_add)
-            for obj in task_refs_stored - task_refs_needed:
-                session.delete(obj)
 
-        # Issue SQL/finish "Unit of Work", but let @provide_session commit (or if passed a session, let caller
-        # decide when to commit
-        session.flush()
+            # Issue SQL/finish "Unit of Work", but let @provide_session commit (or if passed a session, let
+            # caller decide when to commit
+            session.flush()
 
-        for dag in dags:
-            cls.bulk_write_to_db(dag.subdags, processor_subdir=processor_subdir, session=session)
+        log.debug(
+            "Synced %s DAGs in %s",
+            len(dags),
+            ", ".join(f"{phase}: {duration:.3f}s" for phase, duration in phase_durations.items()),
+        )
+
+        # The subdags of all the DAGs are synced at once
+        subdags = {subdag.dag_id: subdag for dag in dags for subdag in dag.subdags}
+        cls.bulk_write_to_db(list(subdags.values()), processor_subdir=processor_subdir, session=session)
 
     @provide_session
     def sync_to_db(self, processor_subdir: str | None = None, session=NEW_SESSION):
@@ -3696,13 +3838,17 @@ class DagModel(Base):
                 dag_model.is_active = False
 
     @classmethod
-    def dags_needing_dagruns(cls, session: Session) -> tuple[Query, dict[str, tuple[datetime, datetime]]]:
+    def dags_needing_dagruns(
+        cls, session: Session, dag_ids: Collection[str] | None = None
+    ) -> tuple[Query, dict[str, tuple[datetime, datetime]]]:
         """
         Return (and lock) a list of Dag objects that are due to create a new DagRun.
 
         This will return a resultset of rows that is row-level-locked with a "SELECT ... FOR UPDATE" query,
         you should ensure that any scheduling decisions are made in a single transaction -- as soon as the
         transaction is committed it will be unlocked.
+
+        :param dag_ids: If given, only consider these DAGs.
         """
         from airflow.models.dataset import DagScheduleDatasetReference, DatasetDagRunQueue as DDRQ
 
@@ -3753,6 +3899,8 @@ class DagModel(Base):
             .order_by(cls.next_dagrun_create_after)
             .limit(cls.NUM_DAGS_PER_DAGRUN_QUERY)
         )
+        if dag_ids is not None:
+            query = query.where(cls.dag_id.in_(dag_ids))
 
         return (
             session.scalars(with_row_locks(query, of=cls, session=session, **skip_locked(session=session))),
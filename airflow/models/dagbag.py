@@ -21,16 +21,20 @@ import hashlib
 import importlib
 import importlib.machinery
 import importlib.util
+import json
 import os
 import sys
 import textwrap
 import traceback
 import warnings
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Any, Hashable, NamedTuple
 
+from sqlalchemy import select
 from sqlalchemy.exc import OperationalError
 from tabulate import tabulate
 
@@ -59,6 +63,7 @@ if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
     from airflow.models.dag import DAG
+    from airflow.serialization.scheduling_view import SchedulingDagView
     from airflow.utils.types import ArgNotSet
 
 
@@ -72,6 +77,110 @@ class FileLoadStat(NamedTuple):
     dags: str
 
 
+class _ParsedFile(NamedTuple):
+    """Result of parsing a single file in a worker process of a parallel ``collect_dags``."""
+
+    file_last_changed: dict[str, datetime]
+    import_errors: dict[str, str]
+    serialized_dags: list[dict]
+    stat: FileLoadStat
+
+
+def _init_parsing_worker() -> None:
+    # Connections inherited from the parent process must not be shared with it
+    settings.configure_orm()
+
+
+def _parse_file_in_worker(filepath: str, safe_mode: bool) -> _ParsedFile:
+    """Parse a file in a fresh DagBag and return the DAGs found in it, serialized."""
+    from airflow.serialization.serialized_objects import SerializedDAG
+
+    dagbag = DagBag(dag_folder=filepath, include_examples=False, safe_mode=safe_mode, collect_dags=False)
+    file_parse_start_dttm = timezone.utcnow()
+    found_dags = dagbag.process_file(filepath, only_if_updated=False, safe_mode=safe_mode)
+    file_parse_end_dttm = timezone.utcnow()
+
+    serialized_dags = []
+    for dag in found_dags:
+        if dag.is_subdag:
+            # Sub-DAGs are serialized with their parent DAG
+            continue
+        try:
+            serialized_dags.append(SerializedDAG.to_dict(dag))
+        except Exception:
+            dagbag.log.exception("Failed to serialize DAG: %s", dag.fileloc)
+            dagbag.import_errors[dag.fileloc] = traceback.format_exc(
+                limit=-dagbag.dagbag_import_error_traceback_depth
+            )
+
+    return _ParsedFile(
+        file_last_changed=dagbag.file_last_changed,
+        import_errors=dagbag.import_errors,
+        serialized_dags=serialized_dags,
+        stat=FileLoadStat(
+            file=filepath.replace(settings.DAGS_FOLDER, ""),
+            duration=file_parse_end_dttm - file_parse_start_dttm,
+            dag_num=len(found_dags),
+            task_num=sum(len(dag.tasks) for dag in found_dags),
+            dags=str([dag.dag_id for dag in found_dags]),
+        ),
+    )
+
+
+class _DagCacheBudget:
+    """
+    Track the recency and estimated size of the DAGs cached by a DagBag, to evict the least recently used.
+
+    :param max_entries: Maximum number of cached entries, 0 for no limit.
+    :param max_size: Maximum total estimated size of the cached entries in bytes, 0 for no limit.
+    """
+
+    def __init__(self, max_entries: int, max_size: int) -> None:
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._sizes: OrderedDict[Hashable, int] = OrderedDict()
+        self.total_size = 0
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def touch(self, key: Hashable) -> None:
+        """Mark an entry as the most recently used."""
+        if key in self._sizes:
+            self._sizes.move_to_end(key)
+
+    def add(self, key: Hashable, size: int) -> list[Hashable]:
+        """
+        Add or replace an entry as the most recently used.
+
+        :return: The keys of the least recently used entries to evict to stay within the limits. The
+            entry just added is never evicted, even if it is larger than the maximum size on its own.
+        """
+        self.remove(key)
+        self._sizes[key] = size
+        self.total_size += size
+        evicted = []
+        while len(self._sizes) > 1 and (
+            (self.max_entries and len(self._sizes) > self.max_entries)
+            or (self.max_size and self.total_size > self.max_size)
+        ):
+            evicted_key, evicted_size = self._sizes.popitem(last=False)
+            self.total_size -= evicted_size
+            evicted.append(evicted_key)
+        return evicted
+
+    def remove(self, key: Hashable) -> None:
+        """Stop tracking an entry."""
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self.total_size -= size
+
+
+def _estimate_serialized_size(data: Any) -> int:
+    """Estimate the size of a serialized DAG, as the length of its JSON representation."""
+    return len(data) if isinstance(data, str) else len(json.dumps(data))
+
+
 class DagBag(LoggingMixin):
     """
     A dagbag is a collection of dags, parsed out of a folder tree and has high level configuration settings.
@@ -90,6 +199,7 @@ class DagBag(LoggingMixin):
     :param load_op_links: Should the extra operator link be loaded via plugins when
         de-serializing the DAG? This flag is set to False in Scheduler so that Extra Operator links
         are not loaded to not run User code in Scheduler.
+    :param parallelism: Number of processes to parse DAG files with, see :meth:`collect_dags`.
     """
 
     def __init__(
@@ -101,6 +211,7 @@ class DagBag(LoggingMixin):
         store_serialized_dags: bool | None = None,
         load_op_links: bool = True,
         collect_dags: bool = True,
+        parallelism: int = 1,
     ):
         # Avoid circular import
 
@@ -136,6 +247,18 @@ class DagBag(LoggingMixin):
         self.dags_last_fetched: dict[str, datetime] = {}
         # Only used by SchedulerJob to compare the dag_hash to identify change in DAGs
         self.dags_hash: dict[str, str] = {}
+        # Only used by read_dags_from_db=True, see get_scheduling_view
+        self.scheduling_views: dict[str, SchedulingDagView] = {}
+        self.scheduling_views_last_fetched: dict[str, datetime] = {}
+        # Only used by read_dags_from_db=True, bounds the DAGs and scheduling views cached by get_dag
+        # and get_scheduling_view, evicting the least recently used
+        self._cache_budget = _DagCacheBudget(
+            max_entries=conf.getint("core", "dagbag_cache_max_dags"),
+            max_size=conf.getint("core", "dagbag_cache_max_size_mb") * 1024 * 1024,
+        )
+        # Only used by collect_dags with parallelism > 1: the DAGs serialized by the worker processes,
+        # with the dicts they were deserialized from, so that sync_to_db does not serialize them again
+        self._worker_serialized_dags: dict[str, tuple[DAG, dict]] = {}
 
         self.dagbag_import_error_tracebacks = conf.getboolean("core", "dagbag_import_error_tracebacks")
         self.dagbag_import_error_traceback_depth = conf.getint("core", "dagbag_import_error_traceback_depth")
@@ -144,6 +267,7 @@ class DagBag(LoggingMixin):
                 dag_folder=dag_folder,
                 include_examples=include_examples,
                 safe_mode=safe_mode,
+                parallelism=parallelism,
             )
         # Should the extra operator link be loaded via plugins?
         # This flag is set to False in Scheduler so that Extra Operator links are not loaded
@@ -188,8 +312,11 @@ class DagBag(LoggingMixin):
 
             if dag_id not in self.dags:
                 # Load from DB if not (yet) in the bag
+                Stats.incr("dagbag.cache_miss")
                 self._add_dag_from_db(dag_id=dag_id, session=session)
                 return self.dags.get(dag_id)
+            Stats.incr("dagbag.cache_hit")
+            self._cache_budget.touch(("dag", self._get_root_dag_id(dag_id)))
 
             # If DAG is in the DagBag, check the following
             # 1. if time has come to check if DAG is updated (controlled by min_serialized_dag_fetch_secs)
@@ -210,9 +337,7 @@ class DagBag(LoggingMixin):
                 )
                 if not sd_latest_version_and_updated_datetime:
                     self.log.warning("Serialized DAG %s no longer exists", dag_id)
-                    del self.dags[dag_id]
-                    del self.dags_last_fetched[dag_id]
-                    del self.dags_hash[dag_id]
+                    self._remove_dag_from_cache(dag_id)
                     return None
 
                 sd_latest_version, sd_last_updated_datetime = sd_latest_version_and_updated_datetime
@@ -261,6 +386,59 @@ class DagBag(LoggingMixin):
                 del self.dags[dag_id]
         return self.dags.get(dag_id)
 
+    @provide_session
+    def get_scheduling_view(self, dag_id: str, session: Session = NEW_SESSION) -> SchedulingDagView | None:
+        """
+        Get a lightweight view of the task graph of a DAG, and refreshes it if expired.
+
+        The view is read from the serialized_dag table without building the operators of the DAG, so
+        this is much cheaper than :meth:`get_dag` for large DAGs. It is only available when reading
+        DAGs from the database, and not for SubDAGs, which are stored within their parent DAG.
+
+        :param dag_id: DAG ID
+        :return: The view, or None if the DAG is not in the serialized_dag table
+        """
+        from airflow.models.serialized_dag import SerializedDagModel
+        from airflow.serialization.scheduling_view import SchedulingDagView
+
+        if not self.read_dags_from_db:
+            raise ValueError("Scheduling views are only available when reading DAGs from the database")
+
+        view = self.scheduling_views.get(dag_id)
+        Stats.incr("dagbag.cache_miss" if view is None else "dagbag.cache_hit")
+        if view is not None:
+            self._cache_budget.touch(("scheduling_view", dag_id))
+            # Same refresh rules as get_dag: check if the serialized DAG changed at most every
+            # min_serialized_dag_fetch_secs.
+            last_fetched = self.scheduling_views_last_fetched[dag_id]
+            min_serialized_dag_fetch_secs = timedelta(seconds=settings.MIN_SERIALIZED_DAG_FETCH_INTERVAL)
+            if timezone.utcnow() <= last_fetched + min_serialized_dag_fetch_secs:
+                return view
+            sd_latest_version_and_updated_datetime = (
+                SerializedDagModel.get_latest_version_hash_and_updated_datetime(
+                    dag_id=dag_id, session=session
+                )
+            )
+            if not sd_latest_version_and_updated_datetime:
+                self.log.warning("Serialized DAG %s no longer exists", dag_id)
+                self._remove_scheduling_view_from_cache(dag_id)
+                return None
+            sd_latest_version, sd_last_updated_datetime = sd_latest_version_and_updated_datetime
+            if sd_last_updated_datetime <= last_fetched and sd_latest_version == view.dag_hash:
+                self.scheduling_views_last_fetched[dag_id] = timezone.utcnow()
+                return view
+
+        row = session.scalar(select(SerializedDagModel).where(SerializedDagModel.dag_id == dag_id))
+        if not row:
+            return None
+        data = row.data
+        if isinstance(data, str):
+            data = json.loads(data)
+        view = self.scheduling_views[dag_id] = SchedulingDagView(data, dag_hash=row.dag_hash)
+        self.scheduling_views_last_fetched[dag_id] = timezone.utcnow()
+        self._add_to_cache_budget(("scheduling_view", dag_id), data)
+        return view
+
     def _add_dag_from_db(self, dag_id: str, session: Session):
         """Add DAG to DagBag from DB."""
         from airflow.models.serialized_dag import SerializedDagModel
@@ -276,6 +454,42 @@ class DagBag(LoggingMixin):
         self.dags[dag.dag_id] = dag
         self.dags_last_fetched[dag.dag_id] = timezone.utcnow()
         self.dags_hash[dag.dag_id] = row.dag_hash
+        self._add_to_cache_budget(("dag", dag.dag_id), row.data)
+
+    def _get_root_dag_id(self, dag_id: str) -> str:
+        dag = self.dags[dag_id]
+        while dag.parent_dag:
+            dag = dag.parent_dag
+        return dag.dag_id
+
+    def _add_to_cache_budget(self, key: tuple[str, str], data: Any) -> None:
+        """Track a DAG or scheduling view loaded from the DB, and evict the least recently used ones."""
+        # Sizing serializes the DAG to JSON again, so it is skipped when the size is not limited
+        size = _estimate_serialized_size(data) if self._cache_budget.max_size else 0
+        for kind, evicted_dag_id in self._cache_budget.add(key, size):
+            self.log.debug("Evicting %s %s from the DagBag", kind, evicted_dag_id)
+            Stats.incr("dagbag.cache_eviction")
+            if kind == "dag":
+                self._remove_dag_from_cache(evicted_dag_id)
+            else:
+                self._remove_scheduling_view_from_cache(evicted_dag_id)
+        if self._cache_budget.max_size:
+            Stats.gauge("dagbag.cache_size", self._cache_budget.total_size)
+
+    def _remove_dag_from_cache(self, dag_id: str) -> None:
+        """Remove a DAG loaded from the DB, along with its subdags."""
+        dag = self.dags.pop(dag_id, None)
+        if dag is not None:
+            for subdag in dag.subdags:
+                self.dags.pop(subdag.dag_id, None)
+        self.dags_last_fetched.pop(dag_id, None)
+        self.dags_hash.pop(dag_id, None)
+        self._cache_budget.remove(("dag", dag_id))
+
+    def _remove_scheduling_view_from_cache(self, dag_id: str) -> None:
+        self.scheduling_views.pop(dag_id, None)
+        self.scheduling_views_last_fetched.pop(dag_id, None)
+        self._cache_budget.remove(("scheduling_view", dag_id))
 
     def process_file(self, filepath, only_if_updated=True, safe_mode=True):
         """Given a path to a python module or zip file, import the module and look for dag objects within."""
@@ -519,6 +733,7 @@ class DagBag(LoggingMixin):
         only_if_updated: bool = True,
         include_examples: bool = conf.getboolean("core", "LOAD_EXAMPLES"),
         safe_mode: bool = conf.getboolean("core", "DAG_DISCOVERY_SAFE_MODE"),
+        parallelism: int = 1,
     ):
         """
         Look for python modules in a given path, import them, and add them to the dagbag collection.
@@ -531,6 +746,10 @@ class DagBag(LoggingMixin):
         **Note**: The patterns in ``.airflowignore`` are interpreted as either
         un-anchored regexes or gitignore-like glob expressions, depending on
         the ``DAG_IGNORE_FILE_SYNTAX`` configuration parameter.
+
+        If ``parallelism`` is greater than 1, the files are parsed by a pool of that many processes,
+        and the DAGs found in them are added to the dagbag in their serialized form, like the DAGs
+        read from the database. Cluster policies are applied in the worker processes.
         """
         if self.read_dags_from_db:
             return
@@ -542,11 +761,17 @@ class DagBag(LoggingMixin):
 
         # Ensure dag_folder is a str -- it may have been a pathlib.Path
         dag_folder = correct_maybe_zipped(str(dag_folder))
-        for filepath in list_py_file_paths(
+        filepaths = list_py_file_paths(
             dag_folder,
             safe_mode=safe_mode,
             include_examples=include_examples,
-        ):
+        )
+        if parallelism > 1:
+            stats = self._collect_dags_in_parallel(filepaths, only_if_updated, safe_mode, parallelism)
+            self.dagbag_stats = sorted(stats, key=lambda x: x.duration, reverse=True)
+            return
+
+        for filepath in filepaths:
             try:
                 file_parse_start_dttm = timezone.utcnow()
                 found_dags = self.process_file(filepath, only_if_updated=only_if_updated, safe_mode=safe_mode)
@@ -566,6 +791,62 @@ class DagBag(LoggingMixin):
 
         self.dagbag_stats = sorted(stats, key=lambda x: x.duration, reverse=True)
 
+    def _collect_dags_in_parallel(
+        self, filepaths: list[str], only_if_updated: bool, safe_mode: bool, parallelism: int
+    ) -> list[FileLoadStat]:
+        from airflow.serialization.serialized_objects import SerializedDAG
+
+        if only_if_updated:
+            filepaths = [
+                filepath
+                for filepath in filepaths
+                if filepath not in self.file_last_changed
+                or datetime.fromtimestamp(os.path.getmtime(filepath)) != self.file_last_changed[filepath]
+            ]
+
+        stats = []
+        with ProcessPoolExecutor(max_workers=parallelism, initializer=_init_parsing_worker) as executor:
+            futures = [executor.submit(_parse_file_in_worker, filepath, safe_mode) for filepath in filepaths]
+            # Merge the results in file order, so duplicated DAG ids are reported as when parsing sequentially
+            for filepath, future in zip(filepaths, futures):
+                try:
+                    parsed = future.result()
+                except Exception:
+                    self.log.exception("Failed to parse %s", filepath)
+                    continue
+                self.file_last_changed.update(parsed.file_last_changed)
+                self.import_errors.update(parsed.import_errors)
+                for serialized_dag in parsed.serialized_dags:
+                    dag = SerializedDAG.from_dict(serialized_dag)
+                    try:
+                        self._bag_deserialized_dag(dag)
+                    except AirflowDagDuplicatedIdException as e:
+                        self.log.exception("Failed to bag_dag: %s", dag.fileloc)
+                        self.import_errors[dag.fileloc] = f"{type(e).__name__}: {e}"
+                    else:
+                        self._worker_serialized_dags[dag.dag_id] = (dag, serialized_dag)
+                stats.append(parsed.stat)
+        return stats
+
+    def _bag_deserialized_dag(self, dag: DAG) -> None:
+        """
+        Add a DAG deserialized from a worker process of ``collect_dags``, and its subdags, to the bag.
+
+        Cycles and cluster policies were already checked when the DAG was bagged in the worker.
+        """
+        dags = [dag, *dag.subdags]
+        for d in dags:
+            prev_dag = self.dags.get(d.dag_id)
+            if prev_dag and prev_dag.fileloc != d.fileloc:
+                raise AirflowDagDuplicatedIdException(
+                    dag_id=d.dag_id,
+                    incoming=d.fileloc,
+                    existing=prev_dag.fileloc,
+                )
+        for d in dags:
+            d.last_loaded = timezone.utcnow()
+            self.dags[d.dag_id] = d
+
     def collect_dags_from_db(self):
         """Collect DAGs from database."""
         from airflow.models.serialized_dag import SerializedDagModel
@@ -614,15 +895,20 @@ class DagBag(LoggingMixin):
         dags: dict[str, DAG],
         processor_subdir: str | None = None,
         session: Session = NEW_SESSION,
+        serialized_dags: dict[str, dict] | None = None,
     ):
-        """Save attributes about list of DAG to the DB."""
+        """
+        Save attributes about list of DAG to the DB.
+
+        :param serialized_dags: DAGs already serialized, by DAG ID, which are written as they are
+        """
         # To avoid circular import - airflow.models.dagbag -> airflow.models.dag -> airflow.models.dagbag
         from airflow.models.dag import DAG
         from airflow.models.serialized_dag import SerializedDagModel
 
         log = cls.logger()
 
-        def _serialize_dag_capturing_errors(dag, session):
+        def _serialize_dag_capturing_errors(dag, session, stored_state):
             """
             Try to serialize the dag to the DB, but make a note of any errors.
 
@@ -635,6 +921,8 @@ class DagBag(LoggingMixin):
                 dag_was_updated = SerializedDagModel.write_dag(
                     dag,
                     min_update_interval=settings.MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
+                    stored_state=stored_state,
+                    dag_data=serialized_dags.get(dag.dag_id) if serialized_dags else None,
                     session=session,
                 )
                 if dag_was_updated:
@@ -663,9 +951,13 @@ class DagBag(LoggingMixin):
                 )
                 log.debug("Calling the DAG.bulk_sync_to_db method")
                 try:
-                    # Write Serialized DAGs to DB, capturing errors
+                    # Write Serialized DAGs to DB, capturing errors. Which DAGs changed is checked in
+                    # one query for all the DAGs.
+                    stored_states = SerializedDagModel.get_stored_states(list(dags), session=session)
                     for dag in dags.values():
-                        serialize_errors.extend(_serialize_dag_capturing_errors(dag, session))
+                        serialize_errors.extend(
+                            _serialize_dag_capturing_errors(dag, session, stored_states.get(dag.dag_id))
+                        )
 
                     DAG.bulk_write_to_db(dags.values(), processor_subdir=processor_subdir, session=session)
                 except OperationalError:
@@ -679,7 +971,18 @@ class DagBag(LoggingMixin):
 
     @provide_session
     def sync_to_db(self, processor_subdir: str | None = None, session: Session = NEW_SESSION):
-        import_errors = DagBag._sync_to_db(dags=self.dags, processor_subdir=processor_subdir, session=session)
+        # DAGs serialized by the worker processes are written as they are, unless they were replaced
+        serialized_dags = {
+            dag_id: serialized_dag
+            for dag_id, (dag, serialized_dag) in self._worker_serialized_dags.items()
+            if self.dags.get(dag_id) is dag
+        }
+        import_errors = DagBag._sync_to_db(
+            dags=self.dags,
+            processor_subdir=processor_subdir,
+            session=session,
+            serialized_dags=serialized_dags,
+        )
         self.import_errors.update(import_errors)
 
     @classmethod
@@ -0,0 +1,125 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy_jsonfield
+from sqlalchemy import BigInteger, Column, Float, String, delete, select
+
+from airflow.api_internal.internal_api_call import internal_api_call
+from airflow.models.base import Base
+from airflow.models.dagcode import DagCode
+from airflow.utils import timezone
+from airflow.utils.session import NEW_SESSION, provide_session
+from airflow.utils.sqlalchemy import UtcDateTime
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+class DagParsingProfile(Base):
+    """
+    A table to store the profile of the last parse of each DAG file.
+
+    Profiles are only recorded when ``[scheduler] enable_dag_parsing_profiling`` is set, and break
+    down the time the DAG processor spent on a file, to find out why it is slow to parse.
+    """
+
+    __tablename__ = "dag_parsing_profile"
+
+    fileloc_hash = Column(BigInteger, primary_key=True, autoincrement=False)
+    fileloc = Column(String(2000), nullable=False)
+    processor_subdir = Column(String(2000), nullable=True)
+    timestamp = Column(UtcDateTime, nullable=False, default=timezone.utcnow)
+    # Total time spent processing the file, in seconds
+    duration = Column(Float, nullable=False)
+    # Peak resident set size of the process that parsed the file, in bytes
+    peak_rss = Column(BigInteger, nullable=True)
+    # Seconds spent in each phase of the processing, e.g. importing modules or serializing the DAGs
+    phases = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False, default={})
+    # Seconds spent importing each top-level module that was not imported yet
+    imports = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False, default={})
+
+    def __init__(self, fileloc: str, **kwargs):
+        super().__init__(fileloc=fileloc, fileloc_hash=DagCode.dag_fileloc_hash(fileloc), **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<DagParsingProfile: {self.fileloc} ({self.duration:.3f}s)>"
+
+    @staticmethod
+    @internal_api_call
+    @provide_session
+    def write(
+        fileloc: str,
+        processor_subdir: str | None,
+        profile: dict[str, Any],
+        session: Session = NEW_SESSION,
+    ) -> None:
+        """
+        Store the profile of the last parse of a DAG file, replacing the previous one.
+
+        :param fileloc: Path of the DAG file
+        :param processor_subdir: DAG directory of the DAG processor which parsed the file
+        :param profile: The profile, as returned by
+            :meth:`airflow.dag_processing.parsing_profiler.DagFileParsingProfiler.to_dict`
+        :param session: ORM Session
+        """
+        session.merge(
+            DagParsingProfile(
+                fileloc=fileloc,
+                processor_subdir=processor_subdir,
+                timestamp=timezone.utcnow(),
+                duration=profile["duration"],
+                peak_rss=profile["peak_rss"],
+                phases=profile["phases"],
+                imports=profile["imports"],
+            )
+        )
+        session.commit()
+
+    @staticmethod
+    @internal_api_call
+    @provide_session
+    def remove_deleted_profiles(
+        alive_file_paths: list[str],
+        processor_subdir: str,
+        session: Session = NEW_SESSION,
+    ) -> None:
+        """
+        Delete the profiles of the DAG files which are not in the DAG directory anymore.
+
+        :param alive_file_paths: Paths of the DAG files in the DAG directory
+        :param processor_subdir: DAG directory of the DAG processor
+        :param session: ORM Session
+        """
+        alive_fileloc_hashes = {DagCode.dag_fileloc_hash(fileloc) for fileloc in alive_file_paths}
+        stored_fileloc_hashes = session.scalars(
+            select(DagParsingProfile.fileloc_hash).where(
+                DagParsingProfile.processor_subdir == processor_subdir
+            )
+        )
+        deleted_fileloc_hashes = set(stored_fileloc_hashes).difference(alive_fileloc_hashes)
+        if deleted_fileloc_hashes:
+            session.execute(
+                delete(DagParsingProfile)
+                .where(DagParsingProfile.fileloc_hash.in_(deleted_fileloc_hashes))
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
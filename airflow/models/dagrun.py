@@ -21,7 +21,18 @@ import itertools
 import os
 import warnings
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Sequence, TypeVar, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+    overload,
+)
 
 import re2
 from sqlalchemy import (
@@ -322,6 +333,7 @@ class DagRun(Base, LoggingMixin):
         state: DagRunState,
         session: Session,
         max_number: int | None = None,
+        dag_ids: Collection[str] | None = None,
     ) -> Query:
         """
         Return the next DagRuns that the scheduler should attempt to schedule.
@@ -330,6 +342,7 @@ class DagRun(Base, LoggingMixin):
         query, you should ensure that any scheduling decisions are made in a single transaction -- as soon as
         the transaction is committed it will be unlocked.
 
+        :param dag_ids: If given, only consider the DagRuns of these DAGs.
         """
         from airflow.models.dag import DagModel
 
@@ -344,6 +357,8 @@ class DagRun(Base, LoggingMixin):
             .join(DagModel, DagModel.dag_id == cls.dag_id)
             .where(DagModel.is_paused == false(), DagModel.is_active == true())
         )
+        if dag_ids is not None:
+            query = query.where(cls.dag_id.in_(dag_ids))
         if state == DagRunState.QUEUED:
             # For dag runs in the queued state, we check if they have reached the max_active_runs limit
             # and if so we drop them
@@ -937,12 +952,15 @@ class DagRun(Base, LoggingMixin):
                 if new_tis is not None:
                     additional_tis.extend(new_tis)
                     expansion_happened = True
+                    dep_context.invalidate_ti_counts()
             if new_tis is None and schedulable.state in SCHEDULEABLE_STATES:
                 # It's enough to revise map index once per task id,
                 # checking the map index for each mapped task significantly slows down scheduling
                 if schedulable.task.task_id not in revised_map_index_task_ids:
                     ready_tis.extend(self._revise_map_indexes_if_mapped(schedulable.task, session=session))
                     revised_map_index_task_ids.add(schedulable.task.task_id)
+                    # Task instances may have been created or removed by revising map indexes
+                    dep_context.invalidate_ti_counts()
                 ready_tis.append(schedulable)
 
         # Check if any ti changed state
@@ -1065,11 +1083,7 @@ class DagRun(Base, LoggingMixin):
         )
 
         def task_filter(task: Operator) -> bool:
-            return task.task_id not in task_ids and (
-                self.is_backfill
-                or task.start_date <= self.execution_date
-                and (task.end_date is None or self.execution_date <= task.end_date)
-            )
+            return task.task_id not in task_ids and self._is_task_in_run_dates(task)
 
         created_counts: dict[str, int] = defaultdict(int)
         task_creator = self._get_task_creator(created_counts, task_instance_mutation_hook, hook_is_noop)
@@ -1077,7 +1091,44 @@ class DagRun(Base, LoggingMixin):
         # Create the missing tasks, including mapped tasks
         tasks_to_create = (task for task in dag.task_dict.values() if task_filter(task))
         tis_to_create = self._create_tasks(tasks_to_create, task_creator, session=session)
-        self._create_task_instances(self.dag_id, tis_to_create, created_counts, hook_is_noop, session=session)
+        self._create_task_instances(tis_to_create, [(self, created_counts)], hook_is_noop, session=session)
+
+    @classmethod
+    def bulk_verify_integrity(cls, dag_runs: Collection[DagRun], *, session: Session) -> None:
+        """
+        Create the task instances of newly created DagRuns, all in one bulk insert.
+
+        This is equivalent to calling :meth:`verify_integrity` on each DagRun, but skips looking for
+        removed or restored tasks, as new DagRuns have no task instances yet.
+
+        :param dag_runs: New DagRuns, with their DAG set
+        :param session: Sqlalchemy ORM Session
+        """
+        from airflow.settings import task_instance_mutation_hook
+
+        hook_is_noop: Literal[True, False] = getattr(task_instance_mutation_hook, "is_noop", False)
+
+        created_counts_by_run: list[tuple[DagRun, dict[str, int]]] = []
+        tis_to_create: list[dict[str, Any]] | list[TI] = []
+        for dag_run in dag_runs:
+            created_counts: dict[str, int] = defaultdict(int)
+            task_creator = dag_run._get_task_creator(
+                created_counts, task_instance_mutation_hook, hook_is_noop
+            )
+            tasks_to_create = (
+                task for task in dag_run.get_dag().task_dict.values() if dag_run._is_task_in_run_dates(task)
+            )
+            tis_to_create.extend(dag_run._create_tasks(tasks_to_create, task_creator, session=session))
+            created_counts_by_run.append((dag_run, created_counts))
+
+        cls._create_task_instances(tis_to_create, created_counts_by_run, hook_is_noop, session=session)
+
+    def _is_task_in_run_dates(self, task: Operator) -> bool:
+        """Check whether the execution date of this run is within the start and end dates of the task."""
+        return self.is_backfill or (
+            task.start_date <= self.execution_date
+            and (task.end_date is None or self.execution_date <= task.end_date)
+        )
 
     def _check_for_removed_or_restored_tasks(
         self, dag: DAG, ti_mutation_hook, *, session: Session
@@ -1242,21 +1293,21 @@ class DagRun(Base, LoggingMixin):
                     map_indexes = (-1,)
             yield from task_creator(task, map_indexes)
 
+    @classmethod
     def _create_task_instances(
-        self,
-        dag_id: str,
-        tasks: Iterator[dict[str, Any]] | Iterator[TI],
-        created_counts: dict[str, int],
+        cls,
+        tasks: Iterable[dict[str, Any]] | Iterable[TI],
+        created_counts_by_run: Collection[tuple[DagRun, dict[str, int]]],
         hook_is_noop: bool,
         *,
         session: Session,
     ) -> None:
         """
-        Create the necessary task instances from the given tasks.
+        Create the necessary task instances from the given tasks, of one or more dagruns.
 
-        :param dag_id: DAG ID associated with the dagrun
         :param tasks: the tasks to create the task instances from
-        :param created_counts: a dictionary of number of tasks -> total ti created by the task creator
+        :param created_counts_by_run: the dagruns of the tasks, each with a dictionary of number of
+            tasks -> total ti created by the task creator
         :param hook_is_noop: whether the task_instance_mutation_hook is noop
         :param session: the session to use
 
@@ -1264,26 +1315,28 @@ class DagRun(Base, LoggingMixin):
         # Fetch the information we need before handling the exception to avoid
         # PendingRollbackError due to the session being invalidated on exception
         # see https://github.com/apache/superset/pull/530
-        run_id = self.run_id
+        run_ids = [(dag_run.dag_id, dag_run.run_id) for dag_run, _ in created_counts_by_run]
         try:
             if hook_is_noop:
                 session.bulk_insert_mappings(TI, tasks)
             else:
                 session.bulk_save_objects(tasks)
 
-            for task_type, count in created_counts.items():
-                Stats.incr(f"task_instance_created_{task_type}", count, tags=self.stats_tags)
-                # Same metric with tagging
-                Stats.incr("task_instance_created", count, tags={**self.stats_tags, "task_type": task_type})
+            for dag_run, created_counts in created_counts_by_run:
+                for task_type, count in created_counts.items():
+                    Stats.incr(f"task_instance_created_{task_type}", count, tags=dag_run.stats_tags)
+                    # Same metric with tagging
+                    Stats.incr(
+                        "task_instance_created", count, tags={**dag_run.stats_tags, "task_type": task_type}
+                    )
             session.flush()
         except IntegrityError:
-            self.log.info(
-                "Hit IntegrityError while creating the TIs for %s- %s",
-                dag_id,
-                run_id,
+            cls.logger().info(
+                "Hit IntegrityError while creating the TIs for %s",
+                ", ".join(f"{dag_id}- {run_id}" for dag_id, run_id in run_ids),
                 exc_info=True,
             )
-            self.log.info("Doing session rollback.")
+            cls.logger().info("Doing session rollback.")
             # TODO[HA]: We probably need to savepoint this so we can keep the transaction alive.
             session.rollback()
 
@@ -21,10 +21,10 @@ from __future__ import annotations
 import logging
 import zlib
 from datetime import timedelta
-from typing import TYPE_CHECKING, Collection
+from typing import TYPE_CHECKING, Any, Collection
 
 import sqlalchemy_jsonfield
-from sqlalchemy import BigInteger, Column, Index, LargeBinary, String, and_, exc, or_, select
+from sqlalchemy import BigInteger, Column, Index, LargeBinary, String, and_, exc, or_, select, update
 from sqlalchemy.orm import backref, foreign, relationship
 from sqlalchemy.sql.expression import func, literal
 
@@ -40,10 +40,12 @@ from airflow.utils import timezone
 from airflow.utils.hashlib_wrapper import md5
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.sqlalchemy import UtcDateTime
+from airflow.utils.types import NOTSET, ArgNotSet
 
 if TYPE_CHECKING:
     from datetime import datetime
 
+    from sqlalchemy.engine import Row
     from sqlalchemy.orm import Session
 
     from airflow.models import Operator
@@ -103,14 +105,17 @@ class SerializedDagModel(Base):
 
     load_op_links = True
 
-    def __init__(self, dag: DAG, processor_subdir: str | None = None) -> None:
+    def __init__(
+        self, dag: DAG, processor_subdir: str | None = None, dag_data: dict[str, Any] | None = None
+    ) -> None:
         self.dag_id = dag.dag_id
         self.fileloc = dag.fileloc
         self.fileloc_hash = DagCode.dag_fileloc_hash(self.fileloc)
         self.last_updated = timezone.utcnow()
         self.processor_subdir = processor_subdir
 
-        dag_data = SerializedDAG.to_dict(dag)
+        if dag_data is None:
+            dag_data = SerializedDAG.to_dict(dag)
         dag_data_json = json.dumps(dag_data, sort_keys=True).encode("utf-8")
 
         self.dag_hash = md5(dag_data_json).hexdigest()
@@ -136,6 +141,8 @@ class SerializedDagModel(Base):
         dag: DAG,
         min_update_interval: int | None = None,
         processor_subdir: str | None = None,
+        stored_state: Row | None | ArgNotSet = NOTSET,
+        dag_data: dict[str, Any] | None = None,
         session: Session = NEW_SESSION,
     ) -> bool:
         """
@@ -146,41 +153,83 @@ class SerializedDagModel(Base):
 
         :param dag: a DAG to be written into database
         :param min_update_interval: minimal interval in seconds to update serialized DAG
+        :param stored_state: the state of the stored serialized DAG, as returned by
+            :meth:`get_stored_states` (None if it is not stored). Fetched from the DB if not given.
+        :param dag_data: the DAG already serialized with ``SerializedDAG.to_dict``, which is then not
+            serialized again
         :param session: ORM Session
 
         :returns: Boolean indicating if the DAG was written to the DB
         """
+        if isinstance(stored_state, ArgNotSet):
+            stored_state = cls.get_stored_states([dag.dag_id], session=session).get(dag.dag_id)
+
         # Checks if (Current Time - Time when the DAG was written to DB) < min_update_interval
         # If Yes, does nothing
         # If No or the DAG does not exists, updates / writes Serialized DAG to DB
-        if min_update_interval is not None:
-            if session.scalar(
-                select(literal(True)).where(
-                    cls.dag_id == dag.dag_id,
-                    (timezone.utcnow() - timedelta(seconds=min_update_interval)) < cls.last_updated,
-                )
-            ):
-                return False
+        if (
+            stored_state is not None
+            and min_update_interval is not None
+            and (timezone.utcnow() - timedelta(seconds=min_update_interval)) < stored_state.last_updated
+        ):
+            return False
 
         log.debug("Checking if DAG (%s) changed", dag.dag_id)
-        new_serialized_dag = cls(dag, processor_subdir)
-        serialized_dag_db = session.execute(
-            select(cls.dag_hash, cls.processor_subdir).where(cls.dag_id == dag.dag_id)
-        ).first()
+        new_serialized_dag = cls(dag, processor_subdir, dag_data=dag_data)
 
         if (
-            serialized_dag_db is not None
-            and serialized_dag_db.dag_hash == new_serialized_dag.dag_hash
-            and serialized_dag_db.processor_subdir == new_serialized_dag.processor_subdir
+            stored_state is not None
+            and stored_state.dag_hash == new_serialized_dag.dag_hash
+            and stored_state.processor_subdir == new_serialized_dag.processor_subdir
         ):
             log.debug("Serialized DAG (%s) is unchanged. Skipping writing to DB", dag.dag_id)
             return False
 
         log.debug("Writing Serialized DAG: %s to the DB", dag.dag_id)
-        session.merge(new_serialized_dag)
+        if stored_state is None:
+            session.add(new_serialized_dag)
+        else:
+            # Update the row in place, as merging would load the stored (possibly big) DAG first
+            session.execute(
+                update(cls)
+                .where(cls.dag_id == dag.dag_id)
+                .values(
+                    {
+                        cls.fileloc: new_serialized_dag.fileloc,
+                        cls.fileloc_hash: new_serialized_dag.fileloc_hash,
+                        cls._data: new_serialized_dag._data,
+                        cls._data_compressed: new_serialized_dag._data_compressed,
+                        cls.last_updated: new_serialized_dag.last_updated,
+                        cls.dag_hash: new_serialized_dag.dag_hash,
+                        cls.processor_subdir: new_serialized_dag.processor_subdir,
+                    }
+                )
+                .execution_options(synchronize_session="evaluate")
+            )
         log.debug("DAG: %s written to the DB", dag.dag_id)
         return True
 
+    @classmethod
+    @provide_session
+    def get_stored_states(cls, dag_ids: Collection[str], session: Session = NEW_SESSION) -> dict[str, Row]:
+        """
+        Get the hash, processor subdir and last update time of the given serialized DAGs, in one query.
+
+        :param dag_ids: IDs of the DAGs
+        :param session: ORM Session
+        :returns: a map from DAG ID to its stored state, for the DAGs found in the DB
+        """
+        if not dag_ids:
+            return {}
+        return {
+            row.dag_id: row
+            for row in session.execute(
+                select(cls.dag_id, cls.dag_hash, cls.processor_subdir, cls.last_updated).where(
+                    cls.dag_id.in_(dag_ids)
+                )
+            )
+        }
+
     @classmethod
     @provide_session
     def read_all_dags(cls, session: Session = NEW_SESSION) -> dict[str, SerializedDAG]:
@@ -323,20 +372,23 @@ class SerializedDagModel(Base):
         """
         Save DAGs as Serialized DAG objects in the database.
 
-        Each DAG is saved in a separate database query.
+        The stored hashes of all the DAGs are fetched in one query, and only the DAGs which changed are
+        written, each in a separate database query.
 
         :param dags: the DAG objects to save to the DB
         :param session: ORM Session
         :return: None
         """
+        dags = [dag for dag in dags if not dag.is_subdag]
+        stored_states = SerializedDagModel.get_stored_states([dag.dag_id for dag in dags], session=session)
         for dag in dags:
-            if not dag.is_subdag:
-                SerializedDagModel.write_dag(
-                    dag=dag,
-                    min_update_interval=MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
-                    processor_subdir=processor_subdir,
-                    session=session,
-                )
+            SerializedDagModel.write_dag(
+                dag=dag,
+                stored_state=stored_states.get(dag.dag_id),
+                min_update_interval=MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
+                processor_subdir=processor_subdir,
+                session=session,
+            )
 
     @classmethod
     @provide_session
@@ -20,7 +20,6 @@ from __future__ import annotations
 import collections.abc
 import contextlib
 import hashlib
-import itertools
 import logging
 import math
 import operator
@@ -111,6 +110,7 @@ from airflow.utils.net import get_hostname
 from airflow.utils.operator_helpers import context_to_airflow_vars
 from airflow.utils.platform import getuser
 from airflow.utils.retries import run_with_db_retries
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.session import NEW_SESSION, create_session, provide_session
 from airflow.utils.sqlalchemy import (
     ExecutorConfigType,
@@ -773,6 +773,61 @@ def _is_eligible_to_retry(*, task_instance: TaskInstance | TaskInstancePydantic)
     return task_instance.task.retries and task_instance.try_number <= task_instance.max_tries
 
 
+def _record_failure(
+    *,
+    task_instance: TaskInstance | TaskInstancePydantic,
+    session: Session,
+    test_mode: bool = False,
+    force_fail: bool = False,
+) -> TaskInstanceState:
+    """
+    Record the failure of a task instance, and set it to failed or up for retry.
+
+    This notifies the listeners, emits the failure metrics and adds the log and task failure to the
+    session, but neither runs callbacks nor sends emails.
+
+    :param task_instance: the task instance
+    :param session: SQLAlchemy ORM Session
+    :param test_mode: doesn't record the failure in the DB if True
+    :param force_fail: if True, task does not retry
+    :return: the new state of the task instance
+
+    :meta private:
+    """
+    get_listener_manager().hook.on_task_instance_failed(
+        previous_state=TaskInstanceState.RUNNING, task_instance=task_instance, session=session
+    )
+
+    task_instance.end_date = timezone.utcnow()
+    task_instance.set_duration()
+
+    Stats.incr(f"operator_failures_{task_instance.operator}", tags=task_instance.stats_tags)
+    # Same metric with tagging
+    Stats.incr("operator_failures", tags={**task_instance.stats_tags, "operator": task_instance.operator})
+    Stats.incr("ti_failures", tags=task_instance.stats_tags)
+
+    if not test_mode:
+        session.add(Log(TaskInstanceState.FAILED.value, task_instance))
+
+        # Log failure duration
+        session.add(TaskFail(ti=task_instance))
+
+    task_instance.clear_next_method_args()
+
+    # Since this function is called only when the TaskInstance state is running,
+    # try_number contains the current try_number (not the next). We
+    # only mark task instance as FAILED if the next task instance
+    # try_number exceeds the max_tries ... or if force_fail is truthy
+    if force_fail or not task_instance.is_eligible_to_retry():
+        task_instance.state = TaskInstanceState.FAILED
+    else:
+        if task_instance.state == TaskInstanceState.QUEUED:
+            # We increase the try_number to fail the task if it fails to start after sometime
+            task_instance._try_number += 1
+        task_instance.state = TaskInstanceState.UP_FOR_RETRY
+    return task_instance.state
+
+
 def _handle_failure(
     *,
     task_instance: TaskInstance | TaskInstancePydantic,
@@ -1739,6 +1794,7 @@ class TaskInstance(Base, LoggingMixin):
             self.end_date = self.end_date or current_time
             self.duration = (self.end_date - self.start_date).total_seconds()
         session.merge(self)
+        notify_scheduler(session=session)
         return True
 
     @property
@@ -2321,6 +2377,7 @@ class TaskInstance(Base, LoggingMixin):
                 session.merge(self).task = self.task
                 if self.state == TaskInstanceState.SUCCESS:
                     self._register_dataset_changes(session=session)
+                notify_scheduler(session=session)
 
                 session.commit()
                 if self.state == TaskInstanceState.SUCCESS:
@@ -2598,10 +2655,6 @@ class TaskInstance(Base, LoggingMixin):
         session: Session = NEW_SESSION,
     ):
         """Handle Failure for the TaskInstance."""
-        get_listener_manager().hook.on_task_instance_failed(
-            previous_state=TaskInstanceState.RUNNING, task_instance=ti, session=session
-        )
-
         if error:
             if isinstance(error, BaseException):
                 tb = TaskInstance.get_truncated_error_traceback(error, truncate_to=ti._execute_task)
@@ -2611,21 +2664,9 @@ class TaskInstance(Base, LoggingMixin):
         if not test_mode:
             ti.refresh_from_db(session)
 
-        ti.end_date = timezone.utcnow()
-        ti.set_duration()
-
-        Stats.incr(f"operator_failures_{ti.operator}", tags=ti.stats_tags)
-        # Same metric with tagging
-        Stats.incr("operator_failures", tags={**ti.stats_tags, "operator": ti.operator})
-        Stats.incr("ti_failures", tags=ti.stats_tags)
-
-        if not test_mode:
-            session.add(Log(TaskInstanceState.FAILED.value, ti))
-
-            # Log failure duration
-            session.add(TaskFail(ti=ti))
-
-        ti.clear_next_method_args()
+        state = _record_failure(
+            task_instance=ti, session=session, test_mode=bool(test_mode), force_fail=force_fail
+        )
 
         # In extreme cases (zombie in case of dag with parse error) we might _not_ have a Task.
         if context is None and getattr(ti, "task", None):
@@ -2641,11 +2682,6 @@ class TaskInstance(Base, LoggingMixin):
         # _run_raw_task to avoid race conditions which could lead to duplicate
         # invocations or miss invocation.
 
-        # Since this function is called only when the TaskInstance state is running,
-        # try_number contains the current try_number (not the next). We
-        # only mark task instance as FAILED if the next task instance
-        # try_number exceeds the max_tries ... or if force_fail is truthy
-
         task: BaseOperator | None = None
         try:
             if getattr(ti, "task", None) and context:
@@ -2653,18 +2689,13 @@ class TaskInstance(Base, LoggingMixin):
         except Exception:
             cls.logger().error("Unable to unmap task to determine if we need to send an alert email")
 
-        if force_fail or not ti.is_eligible_to_retry():
-            ti.state = TaskInstanceState.FAILED
+        if state == TaskInstanceState.FAILED:
             email_for_state = operator.attrgetter("email_on_failure")
             callbacks = task.on_failure_callback if task else None
 
             if task and task.dag and task.dag.fail_stop:
                 _stop_remaining_tasks(task_instance=ti, session=session)
         else:
-            if ti.state == TaskInstanceState.QUEUED:
-                # We increase the try_number to fail the task if it fails to start after sometime
-                ti._try_number += 1
-            ti.state = State.UP_FOR_RETRY
             email_for_state = operator.attrgetter("email_on_retry")
             callbacks = task.on_retry_callback if task else None
 
@@ -2709,6 +2740,7 @@ class TaskInstance(Base, LoggingMixin):
             context=context,
             force_fail=force_fail,
         )
+        notify_scheduler(session=session)
 
     def is_eligible_to_retry(self):
         """Is task instance is eligible for retry."""
@@ -3073,8 +3105,10 @@ class TaskInstance(Base, LoggingMixin):
             map_index_groups[(t.dag_id, t.run_id)][t.map_index].append(t.task_id)
 
         # this assumes that most dags have dag_id as the largest grouping, followed by run_id. even
-        # if its not, this is still  a significant optimization over querying for every single tuple key
-        for cur_dag_id, cur_run_id in itertools.product(dag_ids, run_ids):
+        # if its not, this is still  a significant optimization over querying for every single tuple key.
+        # Only the (dag_id, run_id) pairs of the TIs are looked at, rather than every combination of
+        # their dag_ids and run_ids, which is much larger when the TIs belong to many DAGs and runs.
+        for cur_dag_id, cur_run_id in task_id_groups:
             # we compare the group size between task_id and map_index and use the smaller group
             dag_task_id_groups = task_id_groups[(cur_dag_id, cur_run_id)]
             dag_map_index_groups = map_index_groups[(cur_dag_id, cur_run_id)]
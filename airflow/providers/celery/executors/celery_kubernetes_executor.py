@@ -258,6 +258,15 @@ class CeleryKubernetesExecutor(LoggingMixin):
             raise ValueError("Callback sink is not ready.")
         self.callback_sink.send(request)
 
+    def send_callbacks(self, requests: Sequence[CallbackRequest]) -> None:
+        """Sends callbacks for execution, in one go.
+
+        :param requests: Callback requests to be executed.
+        """
+        if not self.callback_sink:
+            raise ValueError("Callback sink is not ready.")
+        self.callback_sink.send_many(requests)
+
     @staticmethod
     def get_cli_commands() -> list:
         return CeleryExecutor.get_cli_commands() + KubernetesExecutor.get_cli_commands()
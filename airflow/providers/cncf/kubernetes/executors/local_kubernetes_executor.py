@@ -241,6 +241,15 @@ class LocalKubernetesExecutor(LoggingMixin):
             raise ValueError("Callback sink is not ready.")
         self.callback_sink.send(request)
 
+    def send_callbacks(self, requests: Sequence[CallbackRequest]) -> None:
+        """Sends callbacks for execution, in one go.
+
+        :param requests: Callback requests to be executed.
+        """
+        if not self.callback_sink:
+            raise ValueError("Callback sink is not ready.")
+        self.callback_sink.send_many(requests)
+
     @staticmethod
     def get_cli_commands() -> list:
         return KubernetesExecutor.get_cli_commands()
@@ -0,0 +1,143 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Lightweight views of serialized DAGs, for scheduling decisions that don't need the operators."""
+from __future__ import annotations
+
+import functools
+from enum import Enum
+from typing import Any, Iterable
+
+from airflow.exceptions import TaskNotFound
+from airflow.serialization.serialized_objects import (
+    BaseSerialization,
+    SerializedBaseOperator,
+    _get_default_mapped_partial,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _default_mapped_partial() -> dict[str, Any]:
+    return _get_default_mapped_partial()
+
+
+def _get_downstream_task_ids(encoded_task: dict[str, Any]) -> Iterable[str]:
+    # Handle old data, which stored the downstream task ids under another name
+    return encoded_task.get("downstream_task_ids", encoded_task.get("_downstream_task_ids", ()))
+
+
+class SchedulingTaskView:
+    """
+    The attributes of a serialized task that are used to make scheduling decisions.
+
+    Values left out of the serialized task because they are the defaults are filled in with the same
+    defaults as when deserializing the operator.
+    """
+
+    __slots__ = (
+        "task_id",
+        "is_mapped",
+        "trigger_rule",
+        "downstream_task_ids",
+        "upstream_task_ids",
+        "pool",
+        "pool_slots",
+        "priority_weight",
+        "weight_rule",
+        "max_active_tis_per_dag",
+        "max_active_tis_per_dagrun",
+    )
+
+    def __init__(self, encoded_task: dict[str, Any], upstream_task_ids: frozenset[str]) -> None:
+        from airflow.models.pool import Pool
+
+        self.task_id: str = encoded_task["task_id"]
+        self.is_mapped: bool = encoded_task.get("_is_mapped", False)
+        self.downstream_task_ids = frozenset(_get_downstream_task_ids(encoded_task))
+        self.upstream_task_ids = upstream_task_ids
+        self.trigger_rule: str = self._get(encoded_task, "trigger_rule")
+        self.pool: str = self._get(encoded_task, "pool") or Pool.DEFAULT_POOL_NAME
+        self.pool_slots: int = self._get(encoded_task, "pool_slots")
+        self.priority_weight: int = self._get(encoded_task, "priority_weight")
+        self.weight_rule: str = self._get(encoded_task, "weight_rule")
+        self.max_active_tis_per_dag: int | None = self._get(encoded_task, "max_active_tis_per_dag")
+        self.max_active_tis_per_dagrun: int | None = self._get(encoded_task, "max_active_tis_per_dagrun")
+
+    def _get(self, encoded_task: dict[str, Any], name: str) -> Any:
+        if self.is_mapped:
+            partial_kwargs = encoded_task.get("partial_kwargs", {})
+            if name in partial_kwargs:
+                return BaseSerialization.deserialize(partial_kwargs[name])
+            if name in encoded_task:
+                return encoded_task[name]
+            return BaseSerialization.deserialize(_default_mapped_partial().get(name))
+        if name in encoded_task:
+            return encoded_task[name]
+        default = SerializedBaseOperator._CONSTRUCTOR_PARAMS.get(name)
+        # Enum defaults, e.g. of the trigger rule, are serialized as their value
+        return default.value if isinstance(default, Enum) else default
+
+    def __repr__(self) -> str:
+        return f"<SchedulingTaskView: {self.task_id}>"
+
+
+class SchedulingDagView:
+    """
+    A compact view of the task graph of a serialized DAG.
+
+    Only the attributes needed to make scheduling decisions are extracted from the stored JSON, which is
+    not referenced by the view, so that it can be freed once the view is built.
+
+    :param data: The serialized DAG, as stored in the serialized_dag table
+    :param dag_hash: Hash of the serialized DAG
+    """
+
+    __slots__ = ("dag_id", "dag_hash", "_tasks")
+
+    def __init__(self, data: dict[str, Any], dag_hash: str | None = None) -> None:
+        encoded_dag = data["dag"]
+        self.dag_id: str = encoded_dag["_dag_id"]
+        self.dag_hash = dag_hash
+        encoded_tasks = encoded_dag["tasks"]
+        # Only downstream task ids are stored, so the upstream ones are computed once for all tasks.
+        upstream_task_ids: dict[str, set[str]] = {}
+        for encoded_task in encoded_tasks:
+            for downstream_task_id in _get_downstream_task_ids(encoded_task):
+                upstream_task_ids.setdefault(downstream_task_id, set()).add(encoded_task["task_id"])
+        self._tasks: dict[str, SchedulingTaskView] = {
+            encoded_task["task_id"]: SchedulingTaskView(
+                encoded_task, frozenset(upstream_task_ids.get(encoded_task["task_id"], ()))
+            )
+            for encoded_task in encoded_tasks
+        }
+
+    @property
+    def task_ids(self) -> list[str]:
+        return list(self._tasks)
+
+    def has_task(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def get_task(self, task_id: str) -> SchedulingTaskView:
+        """Get the scheduling view of a task."""
+        try:
+            return self._tasks[task_id]
+        except KeyError:
+            raise TaskNotFound(f"Task {task_id} not found")
+
+    def __repr__(self) -> str:
+        return f"<SchedulingDagView: {self.dag_id}>"
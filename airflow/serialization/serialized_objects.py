@@ -1306,6 +1306,12 @@ class SerializedDAG(DAG, BaseSerialization):
                 del serialized_dag["timetable"]
 
             serialized_dag["tasks"] = [cls.serialize(task) for _, task in dag.task_dict.items()]
+            # Only store the total priority weights which differ from the task's own weight
+            serialized_dag["priority_weights"] = {
+                task_id: weight
+                for task_id, weight in dag.get_priority_weights().items()
+                if weight != dag.task_dict[task_id].priority_weight
+            }
 
             dag_deps = {
                 dep
@@ -1361,6 +1367,8 @@ class SerializedDAG(DAG, BaseSerialization):
                 v = cls._deserialize_params_dict(v)
             elif k == "dataset_triggers":
                 v = cls.deserialize(v)
+            elif k == "priority_weights":
+                k = "_priority_weights"
             # else use v as it is
 
             setattr(dag, k, v)
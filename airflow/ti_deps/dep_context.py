@@ -17,9 +17,10 @@
 # under the License.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import attr
+from sqlalchemy import func, select
 
 from airflow.exceptions import TaskNotFound
 from airflow.utils.state import State
@@ -84,6 +85,13 @@ class DepContext:
     have_changed_ti_states: bool = False
     """Have any of the TIs state's been changed as a result of evaluating dependencies"""
 
+    upstream_states_by_tasks: dict[frozenset[str], Any] = attr.ib(factory=dict, init=False)
+    """States of the finished tis of the given upstream tasks, as computed by the trigger rule dep"""
+
+    _finished_tis_by_task: dict[str, list[TaskInstance]] | None = attr.ib(default=None, init=False)
+    _num_grouped_finished_tis: int = attr.ib(default=0, init=False)
+    _ti_counts_by_task: dict[str, int] | None = attr.ib(default=None, init=False)
+
     def ensure_finished_tis(self, dag_run: DagRun, session: Session) -> list[TaskInstance]:
         """
         Ensure finished_tis is populated if it's currently None, which allows running tasks without dag_run.
@@ -104,3 +112,49 @@ class DepContext:
         else:
             finished_tis = self.finished_tis
         return finished_tis
+
+    def ensure_finished_tis_by_task(self, dag_run: DagRun, session: Session) -> dict[str, list[TaskInstance]]:
+        """
+        Return the finished task instances of the run grouped by task id.
+
+        The grouping is computed once per context, so that evaluating the dependencies of every
+        task instance of a run does not have to go through all the finished task instances each time.
+
+        :param dag_run: The DagRun for which to find finished tasks
+        """
+        finished_tis = self.ensure_finished_tis(dag_run, session)
+        # The list of finished tis may be extended by the caller between evaluations.
+        if self._finished_tis_by_task is None or self._num_grouped_finished_tis != len(finished_tis):
+            finished_tis_by_task: dict[str, list[TaskInstance]] = {}
+            for ti in finished_tis:
+                finished_tis_by_task.setdefault(ti.task_id, []).append(ti)
+            self._finished_tis_by_task = finished_tis_by_task
+            self._num_grouped_finished_tis = len(finished_tis)
+            self.upstream_states_by_tasks = {}
+        return self._finished_tis_by_task
+
+    def get_ti_counts_by_task(self, dag_run: DagRun, session: Session) -> dict[str, int]:
+        """
+        Return the number of task instances of each task in the run.
+
+        This is queried once per context. Callers creating or removing task instances of the run
+        while evaluating dependencies (e.g. by expanding mapped tasks) must call
+        :meth:`invalidate_ti_counts` afterwards.
+
+        :param dag_run: The DagRun to count task instances of
+        """
+        from airflow.models.taskinstance import TaskInstance
+
+        if self._ti_counts_by_task is None:
+            self._ti_counts_by_task = dict(
+                session.execute(
+                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
+                    .where(TaskInstance.dag_id == dag_run.dag_id, TaskInstance.run_id == dag_run.run_id)
+                    .group_by(TaskInstance.task_id)
+                ).all()
+            )
+        return self._ti_counts_by_task
+
+    def invalidate_ti_counts(self) -> None:
+        """Discard the task instance counts, as task instances of the run were created or removed."""
+        self._ti_counts_by_task = None
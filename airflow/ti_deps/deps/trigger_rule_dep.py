@@ -215,6 +215,50 @@ class TriggerRuleDep(BaseTIDep):
                 else:
                     yield and_(TaskInstance.task_id == upstream_id, TaskInstance.map_index == map_indexes)
 
+        def _calculate_upstream_states(relevant_tasks: dict) -> _UpstreamTIStates:
+            """Count the finished relevant upstream tis of the current ti, by state.
+
+            The finished tis of the run are grouped by task once per dep context, so this does not
+            go through all the finished tis of the run for every ti.
+            """
+            finished_tis_by_task = dep_context.ensure_finished_tis_by_task(ti.get_dagrun(session), session)
+            # Optimization: If the current task is not in a mapped task group, all finished tis
+            # of the upstream tasks are relevant. The result is then the same for every ti
+            # depending on these upstream tasks, and is only calculated once per dep context.
+            if ti.task.get_closest_mapped_task_group() is None:
+                key = frozenset(relevant_tasks)
+                upstream_states = dep_context.upstream_states_by_tasks.get(key)
+                if upstream_states is None:
+                    upstream_states = _UpstreamTIStates.calculate(
+                        finished_ti
+                        for task_id in relevant_tasks
+                        for finished_ti in finished_tis_by_task.get(task_id, ())
+                    )
+                    dep_context.upstream_states_by_tasks[key] = upstream_states
+                return upstream_states
+            return _UpstreamTIStates.calculate(
+                finished_ti
+                for task_id in relevant_tasks
+                for finished_ti in finished_tis_by_task.get(task_id, ())
+                if _is_relevant_upstream(upstream=finished_ti, relevant_ids=relevant_tasks.keys())
+            )
+
+        def _count_upstream_tis(relevant_tasks: dict) -> list[tuple[str, int]]:
+            """Count the relevant upstream tis of the current ti, by task.
+
+            If the current task is not in a mapped task group, every ti of the upstream tasks is
+            relevant, and the counts of tis per task are queried at most once per dep context.
+            """
+            if ti.task.get_closest_mapped_task_group() is None:
+                ti_counts = dep_context.get_ti_counts_by_task(ti.get_dagrun(session), session)
+                return [(task_id, ti_counts[task_id]) for task_id in relevant_tasks if task_id in ti_counts]
+            return session.execute(
+                select(TaskInstance.task_id, func.count(TaskInstance.task_id))
+                .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
+                .where(or_(*_iter_upstream_conditions(relevant_tasks=relevant_tasks)))
+                .group_by(TaskInstance.task_id)
+            ).all()
+
         def _evaluate_setup_constraint(*, relevant_setups) -> Iterator[tuple[TIDepStatus, bool]]:
             """Evaluate whether ``ti``'s trigger rule was met.
 
@@ -225,12 +269,7 @@ class TriggerRuleDep(BaseTIDep):
             task = ti.task
 
             indirect_setups = {k: v for k, v in relevant_setups.items() if k not in task.upstream_task_ids}
-            finished_upstream_tis = (
-                x
-                for x in dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-                if _is_relevant_upstream(upstream=x, relevant_ids=indirect_setups.keys())
-            )
-            upstream_states = _UpstreamTIStates.calculate(finished_upstream_tis)
+            upstream_states = _calculate_upstream_states(relevant_tasks=indirect_setups)
 
             # all of these counts reflect indirect setups which are relevant for this ti
             success = upstream_states.success
@@ -244,12 +283,7 @@ class TriggerRuleDep(BaseTIDep):
             if not any(needs_expansion(t) for t in indirect_setups.values()):
                 upstream = len(indirect_setups)
             else:
-                task_id_counts = session.execute(
-                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
-                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
-                    .where(or_(*_iter_upstream_conditions(relevant_tasks=indirect_setups)))
-                    .group_by(TaskInstance.task_id)
-                ).all()
+                task_id_counts = _count_upstream_tis(relevant_tasks=indirect_setups)
                 upstream = sum(count for _, count in task_id_counts)
 
             new_state = None
@@ -307,12 +341,7 @@ class TriggerRuleDep(BaseTIDep):
             upstream_tasks = {t.task_id: t for t in task.upstream_list}
             trigger_rule = task.trigger_rule
 
-            finished_upstream_tis = (
-                finished_ti
-                for finished_ti in dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-                if _is_relevant_upstream(upstream=finished_ti, relevant_ids=ti.task.upstream_task_ids)
-            )
-            upstream_states = _UpstreamTIStates.calculate(finished_upstream_tis)
+            upstream_states = _calculate_upstream_states(relevant_tasks=upstream_tasks)
 
             success = upstream_states.success
             skipped = upstream_states.skipped
@@ -329,12 +358,7 @@ class TriggerRuleDep(BaseTIDep):
                 upstream = len(upstream_tasks)
                 upstream_setup = sum(1 for x in upstream_tasks.values() if x.is_setup)
             else:
-                task_id_counts = session.execute(
-                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
-                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
-                    .where(or_(*_iter_upstream_conditions(relevant_tasks=upstream_tasks)))
-                    .group_by(TaskInstance.task_id)
-                ).all()
+                task_id_counts = _count_upstream_tis(relevant_tasks=upstream_tasks)
                 upstream = sum(count for _, count in task_id_counts)
                 upstream_setup = sum(c for t, c in task_id_counts if upstream_tasks[t].is_setup)
 
@@ -0,0 +1,58 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import bisect
+from typing import Iterable
+
+from airflow.utils.hashlib_wrapper import md5
+
+
+class ConsistentHashRing:
+    """
+    Consistent hash ring, assigning each key to one of the given nodes.
+
+    When a node joins or leaves the ring, only the keys assigned to that node move, so the
+    assignment of every other key stays stable.
+
+    :param nodes: Names of the nodes of the ring.
+    :param replicas: Number of points each node has on the ring, so that keys are spread evenly.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 64) -> None:
+        self.nodes = frozenset(nodes)
+        points = sorted(
+            (self._hash(f"{node}-{replica}"), node) for node in self.nodes for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(md5(key.encode()).digest()[:8], "big")
+
+    def get_node(self, key: str) -> str:
+        """
+        Return the node the key is assigned to.
+
+        :param key: Key to look up
+        """
+        if not self._nodes:
+            raise ValueError("Cannot look up a key in an empty hash ring")
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[index]
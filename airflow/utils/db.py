@@ -88,7 +88,7 @@ _REVISION_HEADS_MAP = {
     "2.6.0": "98ae134e6fff",
     "2.6.2": "c804e5c76e3e",
     "2.7.0": "405de8318b3a",
-    "2.8.0": "bd5dfbe21f88",
+    "2.8.0": "7c2a5b1d9e4f",
 }
 
 
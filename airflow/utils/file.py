@@ -18,21 +18,28 @@
 from __future__ import annotations
 
 import ast
+import functools
 import logging
 import os
+import re
 import zipfile
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Generator, NamedTuple, Pattern, Protocol, overload
+from stat import S_ISREG
+from typing import Callable, Generator, Iterable, NamedTuple, Pattern, Protocol, overload
 
 import re2
 from pathspec.patterns import GitWildMatchPattern
 
 from airflow.configuration import conf
 from airflow.exceptions import RemovedInAirflow3Warning
+from airflow.utils.hashlib_wrapper import md5
 
 log = logging.getLogger(__name__)
 
+# Named groups of the regexps built from glob patterns, see _GlobIgnoreRule.compile_matcher
+_REGEX_GROUP_NAME = re.compile(r"(?<!\\)\(\?P<\w+>")
+
 
 class _IgnoreRule(Protocol):
     """Interface for ignore rules for structural subtyping."""
@@ -49,6 +56,10 @@ class _IgnoreRule(Protocol):
     def match(path: Path, rules: list[_IgnoreRule]) -> bool:
         """Match a candidate absolute path against a list of rules."""
 
+    @staticmethod
+    def compile_matcher(rules: tuple[_IgnoreRule, ...]) -> Callable[[Path], bool]:
+        """Build a function matching candidate absolute paths against a list of rules at once."""
+
 
 class _RegexpIgnoreRule(NamedTuple):
     """Typed namedtuple with utility functions for regexp ignore rules."""
@@ -68,12 +79,33 @@ class _RegexpIgnoreRule(NamedTuple):
     @staticmethod
     def match(path: Path, rules: list[_IgnoreRule]) -> bool:
         """Match a list of ignore rules against the supplied path."""
+        return _RegexpIgnoreRule.compile_matcher(tuple(rules))(path)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def compile_matcher(rules: tuple[_IgnoreRule, ...]) -> Callable[[Path], bool]:
+        """Combine the rules relative to the same directory in a single regexp, searched once per path."""
+        patterns_by_base_dir: dict[Path, list[str]] = {}
         for rule in rules:
             if not isinstance(rule, _RegexpIgnoreRule):
                 raise ValueError(f"_RegexpIgnoreRule cannot match rules of type: {type(rule)}")
-            if rule.pattern.search(str(path.relative_to(rule.base_dir))) is not None:
-                return True
-        return False
+            patterns_by_base_dir.setdefault(rule.base_dir, []).append(rule.pattern.pattern)
+
+        combined_patterns = []
+        for base_dir, patterns in patterns_by_base_dir.items():
+            try:
+                combined_patterns.append((base_dir, re2.compile("|".join(f"(?:{p})" for p in patterns))))
+            except re2.error:
+                # Patterns valid on their own may not be combined, e.g. if the result is too large
+                combined_patterns.extend((base_dir, re2.compile(p)) for p in patterns)
+
+        def _match(path: Path) -> bool:
+            return any(
+                pattern.search(str(path.relative_to(base_dir))) is not None
+                for base_dir, pattern in combined_patterns
+            )
+
+        return _match
 
 
 class _GlobIgnoreRule(NamedTuple):
@@ -104,18 +136,62 @@ class _GlobIgnoreRule(NamedTuple):
     @staticmethod
     def match(path: Path, rules: list[_IgnoreRule]) -> bool:
         """Match a list of ignore rules against the supplied path."""
-        matched = False
-        for r in rules:
-            if not isinstance(r, _GlobIgnoreRule):
-                raise ValueError(f"_GlobIgnoreRule cannot match rules of type: {type(r)}")
-            rule: _GlobIgnoreRule = r  # explicit typing to make mypy play nicely
-            rel_path = str(path.relative_to(rule.relative_to) if rule.relative_to else path.name)
-            if rule.raw_pattern.endswith("/") and path.is_dir():
+        return _GlobIgnoreRule.compile_matcher(tuple(rules))(path)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def compile_matcher(rules: tuple[_IgnoreRule, ...]) -> Callable[[Path], bool]:
+        """
+        Build a function matching paths against the rules, the last matching rule deciding.
+
+        Without negated rules, the order of the rules does not matter, so the rules matching the same
+        relative path are combined in a single regexp. Otherwise, the rules are matched from last to
+        first, until one of them matches.
+        """
+        glob_rules: list[_GlobIgnoreRule] = []
+        for rule in rules:
+            if not isinstance(rule, _GlobIgnoreRule):
+                raise ValueError(f"_GlobIgnoreRule cannot match rules of type: {type(rule)}")
+            if rule.include is not None:
+                glob_rules.append(rule)
+
+        def _rel_path(path: Path, relative_to: Path | None, dir_pattern: bool) -> str:
+            rel_path = str(path.relative_to(relative_to) if relative_to else path.name)
+            if dir_pattern and path.is_dir():
                 # ensure the test path will potentially match a directory pattern if it is a directory
                 rel_path += "/"
-            if rule.include is not None and rule.pattern.match(rel_path) is not None:
-                matched = rule.include
-        return matched
+            return rel_path
+
+        if any(not rule.include for rule in glob_rules):
+            reversed_rules = glob_rules[::-1]
+
+            def _match_in_order(path: Path) -> bool:
+                for rule in reversed_rules:
+                    rel_path = _rel_path(path, rule.relative_to, rule.raw_pattern.endswith("/"))
+                    if rule.pattern.match(rel_path) is not None:
+                        return bool(rule.include)
+                return False
+
+            return _match_in_order
+
+        patterns_by_rel_path: dict[tuple[Path | None, bool], list[str]] = {}
+        for rule in glob_rules:
+            key = (rule.relative_to, rule.raw_pattern.endswith("/"))
+            # Group names must be unique in the combined regexp
+            pattern = _REGEX_GROUP_NAME.sub("(?:", rule.pattern.pattern)
+            patterns_by_rel_path.setdefault(key, []).append(pattern)
+        combined_patterns = [
+            (relative_to, dir_pattern, re.compile("|".join(f"(?:{p})" for p in patterns)))
+            for (relative_to, dir_pattern), patterns in patterns_by_rel_path.items()
+        ]
+
+        def _match_any(path: Path) -> bool:
+            return any(
+                pattern.match(_rel_path(path, relative_to, dir_pattern)) is not None
+                for relative_to, dir_pattern, pattern in combined_patterns
+            )
+
+        return _match_any
 
 
 def TemporaryDirectory(*args, **kwargs):
@@ -194,44 +270,116 @@ def open_maybe_zipped(fileloc, mode="r"):
         return open(fileloc, mode=mode)
 
 
-def _find_path_from_directory(
+# Rules of the ignore files read, keyed by the file path, base path and rule type, along with the
+# modification time and size of the file when it was read
+_ignore_file_rules_cache: dict[tuple[str, str, type[_IgnoreRule]], tuple[int, int, list[_IgnoreRule]]] = {}
+
+
+def _read_ignore_rules(
+    ignore_file_path: Path,
+    base_dir_path: str | os.PathLike[str],
+    ignore_rule_type: type[_IgnoreRule],
+) -> list[_IgnoreRule]:
+    """Read the rules of an ignore file, which are only compiled again when the file changes."""
+    try:
+        stat = ignore_file_path.stat()
+    except OSError:
+        return []
+    if not S_ISREG(stat.st_mode):
+        return []
+    key = (str(ignore_file_path), os.fspath(base_dir_path), ignore_rule_type)
+    cached = _ignore_file_rules_cache.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    with open(ignore_file_path) as ifile:
+        lines_no_comments = [re2.sub(r"\s*#.*", "", line) for line in ifile.read().split("\n")]
+        # filter out "None" objects, which are invalid patterns
+        rules = [
+            p
+            for p in [
+                ignore_rule_type.compile(line, Path(base_dir_path), ignore_file_path)
+                for line in lines_no_comments
+                if line
+            ]
+            if p is not None
+        ]
+    _ignore_file_rules_cache[key] = (stat.st_mtime_ns, stat.st_size, rules)
+    return rules
+
+
+def _add_ignore_rules(
+    patterns: list[_IgnoreRule],
+    ignore_file_path: Path,
     base_dir_path: str | os.PathLike[str],
+    ignore_rule_type: type[_IgnoreRule],
+) -> list[_IgnoreRule]:
+    """Add the rules of an ignore file, if it exists, to the rules inherited from the parent directories."""
+    rules = _read_ignore_rules(ignore_file_path, base_dir_path, ignore_rule_type)
+    if rules:
+        # evaluation order of patterns is important with negation
+        # so that later patterns can override earlier patterns
+        patterns = list(dict.fromkeys(patterns + rules))
+    return patterns
+
+
+def _get_inherited_ignore_rules(
+    base_dir_path: str | os.PathLike[str],
+    path: str | os.PathLike[str],
     ignore_file_name: str,
     ignore_rule_type: type[_IgnoreRule],
-) -> Generator[str, None, None]:
-    """Recursively search the base path and return the list of file paths that should not be ignored.
+) -> list[_IgnoreRule] | None:
+    """Return the rules of the ignore files of the directories leading to a path, or None if it is ignored.
+
+    :param base_dir_path: the base path the path is in
+    :param path: the path of a file or directory in the base path
+    :param ignore_file_name: the file name containing regular expressions for files that should be ignored.
+    :param ignore_rule_type: the concrete class for ignore rules, which implements the _IgnoreRule interface.
+    """
+    directory = Path(base_dir_path)
+    patterns: list[_IgnoreRule] = []
+    for part in Path(path).relative_to(directory).parts:
+        patterns = _add_ignore_rules(patterns, directory / ignore_file_name, base_dir_path, ignore_rule_type)
+        directory = directory / part
+        if ignore_rule_type.match(directory, patterns):
+            return None
+    return patterns
+
+
+def _walk_not_ignored(
+    base_dir_path: str | os.PathLike[str],
+    ignore_file_name: str,
+    ignore_rule_type: type[_IgnoreRule],
+    start_dir_path: str | os.PathLike[str] | None = None,
+) -> Generator[tuple[str, list[str], Callable[[Path], bool]], None, None]:
+    """Walk the base path, or a directory in it, without entering the ignored directories.
 
     :param base_dir_path: the base path to be searched
     :param ignore_file_name: the file name containing regular expressions for files that should be ignored.
     :param ignore_rule_type: the concrete class for ignore rules, which implements the _IgnoreRule interface.
+    :param start_dir_path: the directory of the base path to walk, the whole base path by default.
 
-    :return: a generator of file paths which should not be ignored.
+    :return: a generator of the directories walked, with the names of their files and a function telling
+        whether a path in the directory is ignored.
     """
     # A Dict of patterns, keyed using resolved, absolute paths
     patterns_by_dir: dict[Path, list[_IgnoreRule]] = {}
-
-    for root, dirs, files in os.walk(base_dir_path, followlinks=True):
+    if start_dir_path is None:
+        start_dir_path = base_dir_path
+    else:
+        inherited_patterns = _get_inherited_ignore_rules(
+            base_dir_path, start_dir_path, ignore_file_name, ignore_rule_type
+        )
+        if inherited_patterns is None:
+            return
+        patterns_by_dir[Path(start_dir_path).resolve()] = inherited_patterns
+
+    for root, dirs, files in os.walk(start_dir_path, followlinks=True):
         patterns: list[_IgnoreRule] = patterns_by_dir.get(Path(root).resolve(), [])
+        patterns = _add_ignore_rules(patterns, Path(root) / ignore_file_name, base_dir_path, ignore_rule_type)
+        is_ignored = ignore_rule_type.compile_matcher(tuple(patterns))
 
-        ignore_file_path = Path(root) / ignore_file_name
-        if ignore_file_path.is_file():
-            with open(ignore_file_path) as ifile:
-                lines_no_comments = [re2.sub(r"\s*#.*", "", line) for line in ifile.read().split("\n")]
-                # append new patterns and filter out "None" objects, which are invalid patterns
-                patterns += [
-                    p
-                    for p in [
-                        ignore_rule_type.compile(line, Path(base_dir_path), ignore_file_path)
-                        for line in lines_no_comments
-                        if line
-                    ]
-                    if p is not None
-                ]
-                # evaluation order of patterns is important with negation
-                # so that later patterns can override earlier patterns
-                patterns = list(dict.fromkeys(patterns))
-
-        dirs[:] = [subdir for subdir in dirs if not ignore_rule_type.match(Path(root) / subdir, patterns)]
+        dirs[:] = [subdir for subdir in dirs if not is_ignored(Path(root) / subdir)]
 
         # explicit loop for infinite recursion detection since we are following symlinks in this walk
         for sd in dirs:
@@ -243,10 +391,27 @@ def _find_path_from_directory(
                 )
             patterns_by_dir.update({dirpath: patterns.copy()})
 
+        yield root, files, is_ignored
+
+
+def _find_path_from_directory(
+    base_dir_path: str | os.PathLike[str],
+    ignore_file_name: str,
+    ignore_rule_type: type[_IgnoreRule],
+) -> Generator[str, None, None]:
+    """Recursively search the base path and return the list of file paths that should not be ignored.
+
+    :param base_dir_path: the base path to be searched
+    :param ignore_file_name: the file name containing regular expressions for files that should be ignored.
+    :param ignore_rule_type: the concrete class for ignore rules, which implements the _IgnoreRule interface.
+
+    :return: a generator of file paths which should not be ignored.
+    """
+    for root, files, is_ignored in _walk_not_ignored(base_dir_path, ignore_file_name, ignore_rule_type):
         for file in files:
             if file != ignore_file_name:
                 abs_file_path = Path(root) / file
-                if not ignore_rule_type.match(abs_file_path, patterns):
+                if not is_ignored(abs_file_path):
                     yield str(abs_file_path)
 
 
@@ -263,14 +428,65 @@ def find_path_from_directory(
 
     :return: a generator of file paths.
     """
+    ignore_rule_type = _get_ignore_rule_type(ignore_file_syntax)
+    return _find_path_from_directory(base_dir_path, ignore_file_name, ignore_rule_type)
+
+
+def walk_not_ignored(
+    base_dir_path: str | os.PathLike[str],
+    ignore_file_name: str,
+    ignore_file_syntax: str = conf.get_mandatory_value("core", "DAG_IGNORE_FILE_SYNTAX", fallback="regexp"),
+    start_dir_path: str | os.PathLike[str] | None = None,
+) -> Generator[tuple[str, list[str], Callable[[Path], bool]], None, None]:
+    """Walk the base path, or a directory in it, without entering the directories which are ignored.
+
+    The ignore files are applied as when searching the base path with :func:`find_path_from_directory`.
+
+    :param base_dir_path: the base path to be walked
+    :param ignore_file_name: the file name in which specifies the patterns of files/dirs to be ignored
+    :param ignore_file_syntax: the syntax of patterns in the ignore file: regexp or glob
+    :param start_dir_path: the directory of the base path to walk, the whole base path by default.
+
+    :return: a generator of the directories walked, with the names of their files and a function telling
+        whether a path in the directory is ignored.
+    """
+    ignore_rule_type = _get_ignore_rule_type(ignore_file_syntax)
+    return _walk_not_ignored(base_dir_path, ignore_file_name, ignore_rule_type, start_dir_path)
+
+
+def _get_ignore_rule_type(ignore_file_syntax: str) -> type[_IgnoreRule]:
     if ignore_file_syntax == "glob":
-        return _find_path_from_directory(base_dir_path, ignore_file_name, _GlobIgnoreRule)
+        return _GlobIgnoreRule
     elif ignore_file_syntax == "regexp" or not ignore_file_syntax:
-        return _find_path_from_directory(base_dir_path, ignore_file_name, _RegexpIgnoreRule)
+        return _RegexpIgnoreRule
     else:
         raise ValueError(f"Unsupported ignore_file_syntax: {ignore_file_syntax}")
 
 
+def is_path_ignored(
+    base_dir_path: str | os.PathLike[str],
+    path: str | os.PathLike[str],
+    ignore_file_name: str,
+    ignore_file_syntax: str = conf.get_mandatory_value("core", "DAG_IGNORE_FILE_SYNTAX", fallback="regexp"),
+) -> bool:
+    """Check whether a path in the base path is ignored, without searching the rest of the base path.
+
+    The ignore files of the base path and of the directories leading to the path are applied as when
+    searching the base path with :func:`find_path_from_directory`.
+
+    :param base_dir_path: the base path the path is in
+    :param path: the path of a file or directory in the base path
+    :param ignore_file_name: the file name in which specifies the patterns of files/dirs to be ignored
+    :param ignore_file_syntax: the syntax of patterns in the ignore file: regexp or glob
+
+    :return: whether the path is ignored.
+    """
+    ignore_rule_type = _get_ignore_rule_type(ignore_file_syntax)
+    if _get_inherited_ignore_rules(base_dir_path, path, ignore_file_name, ignore_rule_type) is None:
+        return True
+    return Path(path).name == ignore_file_name
+
+
 def list_py_file_paths(
     directory: str | os.PathLike[str] | None,
     safe_mode: bool = conf.getboolean("core", "DAG_DISCOVERY_SAFE_MODE", fallback=True),
@@ -308,17 +524,34 @@ def find_dag_file_paths(directory: str | os.PathLike[str], safe_mode: bool) -> l
     file_paths = []
 
     for file_path in find_path_from_directory(directory, ".airflowignore"):
-        path = Path(file_path)
-        try:
-            if path.is_file() and (path.suffix == ".py" or zipfile.is_zipfile(path)):
-                if might_contain_dag(file_path, safe_mode):
-                    file_paths.append(file_path)
-        except Exception:
-            log.exception("Error while examining %s", file_path)
+        if _is_dag_file_candidate(file_path, safe_mode):
+            file_paths.append(file_path)
 
     return file_paths
 
 
+def is_dag_file_path(file_path: str, directory: str | os.PathLike[str], safe_mode: bool) -> bool:
+    """Check whether a file in a directory would be listed by :func:`find_dag_file_paths`."""
+    try:
+        Path(file_path).relative_to(directory)
+    except ValueError:
+        # The file is not in the directory
+        return False
+    if is_path_ignored(directory, file_path, ".airflowignore"):
+        return False
+    return _is_dag_file_candidate(file_path, safe_mode)
+
+
+def _is_dag_file_candidate(file_path: str, safe_mode: bool) -> bool:
+    path = Path(file_path)
+    try:
+        if path.is_file() and (path.suffix == ".py" or zipfile.is_zipfile(path)):
+            return might_contain_dag(file_path, safe_mode)
+    except Exception:
+        log.exception("Error while examining %s", file_path)
+    return False
+
+
 COMMENT_PATTERN = re2.compile(r"\s*#.*")
 
 
@@ -379,3 +612,80 @@ def iter_airflow_imports(file_path: str) -> Generator[str, None, None]:
     for m in _find_imported_modules(parsed):
         if m.startswith("airflow."):
             yield m
+
+
+def _find_module_file(module: str, search_paths: Iterable[str]) -> str | None:
+    relative_path = os.path.join(*module.split("."))
+    for search_path in search_paths:
+        for candidate in (f"{relative_path}.py", os.path.join(relative_path, "__init__.py")):
+            path = os.path.join(search_path, candidate)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _find_imported_module_files(
+    module: ast.Module, file_path: str, search_paths: list[str]
+) -> Generator[str, None, None]:
+    candidates: list[tuple[str, list[str]]]
+    # All the imports are followed, including the ones in functions or under conditions
+    for node in ast.walk(module):
+        if isinstance(node, ast.Import):
+            candidates = [(n.name, search_paths) for n in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                # Relative imports are resolved against the package of the importing file
+                package_dir = os.path.dirname(file_path)
+                for _ in range(node.level - 1):
+                    package_dir = os.path.dirname(package_dir)
+                module_search_paths = [package_dir]
+            else:
+                module_search_paths = search_paths
+            candidates = [(node.module, module_search_paths)] if node.module else []
+            # The imported names may be modules too, e.g. ``from package import module``
+            candidates.extend(
+                (f"{node.module}.{n.name}" if node.module else n.name, module_search_paths)
+                for n in node.names
+                if n.name != "*"
+            )
+        else:
+            continue
+        for name, paths in candidates:
+            module_path = _find_module_file(name, paths)
+            if module_path:
+                yield module_path
+
+
+def get_file_content_hash(file_path: str, search_paths: Iterable[str]) -> str:
+    """
+    Hash the content of a Python file, and of the local modules it imports.
+
+    Imported modules are only looked up in the given search paths (e.g. the DAGs and plugins
+    folders), or next to the importing file for relative imports, and their own imports are followed
+    too. Modules of installed packages are not hashed.
+    Zipped DAG files are hashed as a whole.
+
+    :param file_path: Path of the file to hash
+    :param search_paths: Directories to look up imported modules in
+    :return: The hex digest of the hash
+    """
+    search_paths = list(search_paths)
+    content_hash = md5()
+    seen = {file_path}
+    to_hash = [file_path]
+    while to_hash:
+        path = to_hash.pop()
+        content = Path(path).read_bytes()
+        content_hash.update(path.encode())
+        content_hash.update(content)
+        if zipfile.is_zipfile(path):
+            continue
+        try:
+            parsed = ast.parse(content)
+        except Exception:
+            continue
+        for module_path in _find_imported_module_files(parsed, path, search_paths):
+            if module_path not in seen:
+                seen.add(module_path)
+                to_hash.append(module_path)
+    return content_hash.hexdigest()
@@ -0,0 +1,123 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+KT = TypeVar("KT", bound=Hashable)
+VT = TypeVar("VT")
+
+_MISSING = object()
+
+
+class PriorityDict(Dict[KT, VT]):
+    """
+    Dict which also indexes its items in a heap by a priority computed from their value.
+
+    The items with the highest priority can then be read with :meth:`top` in O(k log n), instead of
+    sorting all the items. Adding an item costs O(log n), and removing one O(1): the heap entries of
+    removed or replaced items are only skipped when met, and the heap is rebuilt when they outnumber the
+    live ones. Items of equal priority are ordered by insertion, as when sorting the dict.
+
+    :param priority: Function returning the numeric priority of a value, the highest coming first.
+    """
+
+    def __init__(self, priority: Callable[[VT], Any], *args, **kwargs) -> None:
+        super().__init__()
+        self._priority = priority
+        self._heap: list[tuple[Any, int, KT]] = []
+        # The live heap entry of each key, entries of removed or replaced items are stale
+        self._entries: dict[KT, tuple[Any, int, KT]] = {}
+        self._counter = itertools.count()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        old_entry = self._entries.get(key)
+        # A replaced item keeps its position among the items of equal priority, as in a dict
+        entry = (-self._priority(value), old_entry[1] if old_entry else next(self._counter), key)
+        super().__setitem__(key, value)
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._compact()
+
+    def __delitem__(self, key: KT) -> None:
+        super().__delitem__(key)
+        del self._entries[key]
+        self._compact()
+
+    def pop(self, key: KT, default: Any = _MISSING) -> Any:
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple[KT, VT]:
+        key, value = super().popitem()
+        del self._entries[key]
+        self._compact()
+        return key, value
+
+    def setdefault(self, key: KT, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:  # type: ignore[override]
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: Any) -> PriorityDict[KT, VT]:  # type: ignore[override]
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._heap.clear()
+        self._entries.clear()
+
+    def copy(self) -> dict[KT, VT]:  # type: ignore[override]
+        return dict(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (self._priority, dict(self))
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+
+    def top(self, n: int) -> list[tuple[KT, VT]]:
+        """
+        Return the n items of highest priority, highest first, without removing them.
+
+        :param n: Number of items to return
+        """
+        entries = []
+        while self._heap and len(entries) < n:
+            entry = heapq.heappop(self._heap)
+            # Drop the stale entries for good, they are not pushed back
+            if self._entries.get(entry[2]) is entry:
+                entries.append(entry)
+        for entry in entries:
+            heapq.heappush(self._heap, entry)
+        return [(key, self[key]) for _, _, key in entries]
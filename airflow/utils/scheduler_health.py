@@ -16,6 +16,7 @@
 # under the License.
 from __future__ import annotations
 
+import json
 import logging
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
@@ -25,13 +26,14 @@ from airflow.configuration import conf
 from airflow.jobs.job import Job
 from airflow.jobs.scheduler_job_runner import SchedulerJobRunner
 from airflow.utils.net import get_hostname
+from airflow.utils.scheduler_profiler import read_profile
 from airflow.utils.session import create_session
 
 log = logging.getLogger(__name__)
 
 
 class HealthServer(BaseHTTPRequestHandler):
-    """Small webserver to serve scheduler health check."""
+    """Small webserver to serve scheduler health check and profile."""
 
     def do_GET(self):
         if self.path == "/health":
@@ -52,6 +54,17 @@ class HealthServer(BaseHTTPRequestHandler):
             except Exception:
                 log.exception("Exception when executing Health check")
                 self.send_error(503)
+        elif self.path == "/profile":
+            profile = read_profile()
+            if profile is None:
+                self.send_error(404, "Scheduler profiling is not enabled")
+                return
+            body = json.dumps(profile).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
         else:
             self.send_error(404)
 
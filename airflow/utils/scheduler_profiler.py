@@ -0,0 +1,162 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Per-phase profiling of the scheduler loop."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Generator, NamedTuple
+
+from sqlalchemy import event
+
+from airflow import settings
+from airflow.utils import timezone
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+log = logging.getLogger(__name__)
+
+PROFILE_FILE_NAME = "scheduler_profile.json"
+
+
+def get_profile_path() -> str:
+    """Return the path of the file the scheduler writes its profile to."""
+    return os.path.join(settings.AIRFLOW_HOME, PROFILE_FILE_NAME)
+
+
+def read_profile() -> dict[str, Any] | None:
+    """Read the last profile written by a scheduler on this host, or None if there is none."""
+    try:
+        with open(get_profile_path()) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class PhaseSample(NamedTuple):
+    """Wall time, DB round-trips and rows fetched by one phase of one scheduler loop."""
+
+    duration: float
+    queries: int
+    rows: int
+
+
+class SchedulerProfiler:
+    """
+    Record per-phase timings of the scheduler loop over a rolling window of loops.
+
+    Each phase records its wall time, the number of statements sent to the database and the number
+    of rows they returned, as reported by the DB driver (some drivers, e.g. sqlite, do not report
+    rows for SELECT statements).
+
+    :param window_size: Number of scheduler loops to keep samples of.
+    :param engine: Engine to count DB round-trips on, defaults to the Airflow engine.
+    """
+
+    def __init__(self, window_size: int, engine: Engine | None = None) -> None:
+        self.window_size = window_size
+        self._engine = engine or settings.engine
+        self._loops: deque[dict[str, PhaseSample]] = deque(maxlen=window_size)
+        self._current_loop: dict[str, PhaseSample] = {}
+        self._num_loops = 0
+        self._queries = 0
+        self._rows = 0
+        self._listening = False
+
+    def start(self) -> None:
+        """Start counting DB round-trips."""
+        if not self._listening:
+            event.listen(self._engine, "after_cursor_execute", self._after_cursor_execute)
+            self._listening = True
+
+    def stop(self) -> None:
+        """Stop counting DB round-trips."""
+        if self._listening:
+            event.remove(self._engine, "after_cursor_execute", self._after_cursor_execute)
+            self._listening = False
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self._queries += 1
+        self._rows += max(cursor.rowcount, 0)
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Record the wall time, DB round-trips and rows fetched of the wrapped phase of the loop."""
+        queries, rows = self._queries, self._rows
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            sample = PhaseSample(
+                duration=time.monotonic() - start,
+                queries=self._queries - queries,
+                rows=self._rows - rows,
+            )
+            previous = self._current_loop.get(name)
+            if previous:
+                # A phase run several times in one loop is recorded as a single sample.
+                sample = PhaseSample(*(a + b for a, b in zip(previous, sample)))
+            self._current_loop[name] = sample
+
+    def end_loop(self) -> None:
+        """Add the phases recorded since the last call to the rolling window."""
+        self._loops.append(self._current_loop)
+        self._current_loop = {}
+        self._num_loops += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the samples in the rolling window, per phase."""
+        samples_by_phase: dict[str, list[PhaseSample]] = {}
+        for loop in self._loops:
+            for name, sample in loop.items():
+                samples_by_phase.setdefault(name, []).append(sample)
+
+        phases = {}
+        for name, samples in samples_by_phase.items():
+            durations = sorted(s.duration for s in samples)
+            phases[name] = {
+                "count": len(samples),
+                "duration_mean": sum(durations) / len(durations),
+                "duration_p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                "duration_max": durations[-1],
+                "queries_mean": sum(s.queries for s in samples) / len(samples),
+                "rows_mean": sum(s.rows for s in samples) / len(samples),
+            }
+        return {
+            "pid": os.getpid(),
+            "updated_at": timezone.utcnow().isoformat(),
+            "total_loops": self._num_loops,
+            "window_loops": len(self._loops),
+            "phases": phases,
+        }
+
+    def write(self) -> None:
+        """Write the summary to the profile file, so it can be read by other processes."""
+        path = get_profile_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.summary(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            log.warning("Failed to write the scheduler profile to %s", path, exc_info=True)
@@ -0,0 +1,280 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Wake up idle schedulers as soon as there is new work for them.
+
+On Postgres, wakeups are published with ``NOTIFY`` on the metadata database, so they reach every
+scheduler and are only delivered once the transaction that created the work has been committed.
+On other databases, wakeups are sent to the local Unix datagram sockets of the schedulers of the same
+host, which is enough for SQLite (where a single scheduler runs next to its workers) and for tests.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import select
+import socket
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+from airflow import settings
+from airflow.configuration import conf
+from airflow.utils.log.logging_mixin import LoggingMixin
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+log = logging.getLogger(__name__)
+
+SCHEDULER_WAKEUP_CHANNEL = "airflow_scheduler_wakeup"
+
+# Maximum length of the path of a Unix socket, including the terminating null byte, on Linux
+_MAX_SOCKET_PATH_LENGTH = 108
+_SOCKET_SUFFIX = ".sock"
+
+
+def wakeup_notifications_enabled() -> bool:
+    """Whether ``[scheduler] use_wakeup_notifications`` is enabled."""
+    return conf.getboolean("scheduler", "use_wakeup_notifications")
+
+
+def _get_socket_name(pid: int | None = None) -> str:
+    return f"{socket.gethostname()}-{pid or os.getpid()}{_SOCKET_SUFFIX}"
+
+
+def get_wakeup_socket_dir() -> str:
+    """
+    Return the directory of the local sockets used for wakeups on databases other than Postgres.
+
+    Each scheduler listens on its own socket in this directory. It is in ``AIRFLOW_HOME``, unless the
+    paths of the sockets would be too long for Unix sockets, in which case it is in the temporary
+    directory, under a name derived from ``AIRFLOW_HOME``.
+    """
+    directory = os.path.join(settings.AIRFLOW_HOME, "scheduler-wakeup")
+    if len(os.fsencode(os.path.join(directory, _get_socket_name()))) < _MAX_SOCKET_PATH_LENGTH:
+        return directory
+    airflow_home_hash = hashlib.sha1(os.fsencode(settings.AIRFLOW_HOME)).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"airflow-scheduler-wakeup-{airflow_home_hash}")
+
+
+def get_wakeup_socket_path() -> str:
+    """Return the path of the local socket this scheduler listens on for wakeups."""
+    return os.path.join(get_wakeup_socket_dir(), _get_socket_name())
+
+
+def _get_local_socket_paths() -> list[str]:
+    """Return the paths of the sockets of the schedulers of this host."""
+    prefix = f"{socket.gethostname()}-"
+    try:
+        return [
+            entry.path
+            for entry in os.scandir(get_wakeup_socket_dir())
+            if entry.name.startswith(prefix) and entry.name.endswith(_SOCKET_SUFFIX)
+        ]
+    except FileNotFoundError:
+        return []
+
+
+def notify_scheduler(session: Session) -> None:
+    """
+    Wake up idle schedulers, as there is new work for them.
+
+    This never raises, nor leaves the transaction of the session failed: a lost wakeup only means
+    that the scheduler picks up the work at its next regular loop.
+
+    :param session: The session the work was written with. On Postgres the wakeup is
+        only delivered when this session commits.
+    """
+    if not wakeup_notifications_enabled():
+        return
+    try:
+        if session.get_bind().dialect.name == "postgresql":
+            # A failed statement aborts the whole transaction on Postgres, so the NOTIFY is sent in a
+            # savepoint, which alone is rolled back if it fails.
+            with session.begin_nested():
+                session.execute(text(f"NOTIFY {SCHEDULER_WAKEUP_CHANNEL}"))
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            for path in _get_local_socket_paths():
+                try:
+                    sock.sendto(b"\x00", path)
+                except OSError:
+                    # The scheduler stopped, or its socket buffer is full and a wakeup is pending anyway.
+                    pass
+    except Exception:
+        log.warning("Failed to send scheduler wakeup notification", exc_info=True)
+
+
+class SchedulerWakeupListener(LoggingMixin):
+    """
+    Receive the wakeups published by :func:`notify_scheduler`.
+
+    If it cannot listen for wakeups, e.g. when the connection to Postgres is lost, :meth:`wait` sleeps
+    for the whole timeout instead, and the listener connects again at the next wait.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._started = False
+        self._raw_connection = None
+        self._socket: socket.socket | None = None
+        self._socket_path: str | None = None
+
+    def start(self) -> None:
+        """Start listening for wakeups."""
+        self._started = True
+        if settings.engine.dialect.name == "postgresql":
+            self._listen()
+        else:
+            self._bind()
+
+    def _listen(self) -> bool:
+        raw_connection = None
+        try:
+            raw_connection = settings.engine.raw_connection()
+            # The connection stays in LISTEN mode for the lifetime of the scheduler, so it must not
+            # be returned to the pool.
+            raw_connection.detach()
+            driver_connection = raw_connection.driver_connection
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {SCHEDULER_WAKEUP_CHANNEL}")
+        except Exception:
+            self.log.warning(
+                "Could not listen for scheduler wakeups, waiting for the next scheduler loop instead",
+                exc_info=True,
+            )
+            if raw_connection is not None:
+                self._close_quietly(raw_connection)
+            return False
+        self._raw_connection = raw_connection
+        self.log.info("Listening for scheduler wakeups on channel %s", SCHEDULER_WAKEUP_CHANNEL)
+        return True
+
+    def _bind(self) -> None:
+        path = get_wakeup_socket_path()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._remove_stale_sockets()
+            if os.path.exists(path):
+                # Left behind by a scheduler of this host which had the same PID
+                os.unlink(path)
+            sock.bind(path)
+        except OSError:
+            sock.close()
+            self.log.warning(
+                "Could not listen for scheduler wakeups on socket %s, waiting for the next scheduler loop "
+                "instead",
+                path,
+                exc_info=True,
+            )
+            return
+        sock.setblocking(False)
+        self._socket = sock
+        self._socket_path = path
+        self.log.info("Listening for scheduler wakeups on socket %s", path)
+
+    @staticmethod
+    def _remove_stale_sockets() -> None:
+        """Remove the sockets of the schedulers of this host which are not running anymore."""
+        for path in _get_local_socket_paths():
+            pid = os.path.basename(path)[: -len(_SOCKET_SUFFIX)].rsplit("-", 1)[-1]
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except (ValueError, OSError):
+                # Not a socket of a scheduler, or a process of another user
+                pass
+
+    def fileno(self) -> int:
+        if self._socket:
+            return self._socket.fileno()
+        if self._raw_connection:
+            return self._raw_connection.driver_connection.fileno()
+        raise RuntimeError("The scheduler wakeup listener is not started")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until a wakeup is received or the timeout expires.
+
+        :param timeout: Maximum number of seconds to wait.
+        :return: Whether a wakeup was received.
+        """
+        if self._started and not self._socket and not self._raw_connection and not self._reconnect():
+            time.sleep(max(timeout, 0))
+            return False
+        readable, _, _ = select.select([self], [], [], max(timeout, 0))
+        if not readable:
+            return False
+        self._drain()
+        return True
+
+    def _reconnect(self) -> bool:
+        """Listen for wakeups again after the connection to Postgres was lost."""
+        return settings.engine.dialect.name == "postgresql" and self._listen()
+
+    def _drain(self) -> None:
+        # Several wakeups may have been published since the last loop; one loop handles all of them.
+        if self._socket:
+            while True:
+                try:
+                    self._socket.recv(64)
+                except BlockingIOError:
+                    break
+        elif self._raw_connection:
+            driver_connection = self._raw_connection.driver_connection
+            try:
+                driver_connection.poll()
+            except Exception:
+                # E.g. Postgres restarted or failed over, the connection is opened again at the next wait
+                self.log.warning("Lost the connection listening for scheduler wakeups", exc_info=True)
+                self._close_quietly(self._raw_connection)
+                self._raw_connection = None
+                return
+            driver_connection.notifies.clear()
+
+    def _close_quietly(self, raw_connection) -> None:
+        try:
+            raw_connection.close()
+        except Exception:
+            self.log.debug("Failed to close the connection listening for scheduler wakeups", exc_info=True)
+
+    def close(self) -> None:
+        """Stop listening for wakeups."""
+        self._started = False
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.unlink(self._socket_path)
+            except FileNotFoundError:
+                pass
+            self._socket_path = None
+        if self._raw_connection:
+            self._raw_connection.close()
+            self._raw_connection = None
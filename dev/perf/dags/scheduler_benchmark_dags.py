@@ -0,0 +1,123 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Synthetic DAGs used by the scheduler benchmark (``dev/perf/scheduler_benchmark.py``).
+
+The DAGs are configured by environment variables:
+
+* ``PERF_BENCHMARK_SHAPE``: one of ``wide``, ``deep``, ``mapped`` or ``dataset``
+* ``PERF_BENCHMARK_SIZE``: number of tasks (or mapped task instances) per DAG
+* ``PERF_BENCHMARK_DAGS_COUNT``: number of DAGs of the shape to generate
+* ``PERF_MAX_RUNS``: number of runs of each scheduled DAG
+"""
+from __future__ import annotations
+
+import datetime
+import enum
+import os
+
+from airflow.datasets import Dataset
+from airflow.models.baseoperator import chain
+from airflow.models.dag import DAG
+from airflow.operators.bash import BashOperator
+
+
+@enum.unique
+class BenchmarkShape(enum.Enum):
+    """Shapes of the DAGs the scheduler is benchmarked with."""
+
+    WIDE = "wide"
+    DEEP = "deep"
+    MAPPED = "mapped"
+    DATASET = "dataset"
+
+
+DAG_PREFIX = "scheduler_benchmark"
+START_DATE = datetime.datetime(2020, 1, 1)
+
+# The tasks are never run by the benchmark, only scheduled, so their command does not matter.
+COMMAND = "true"
+
+
+def benchmark_dag_id(shape: BenchmarkShape, dag_no: int, suffix: str = "") -> str:
+    """Return the ID of a benchmark DAG."""
+    return f"{DAG_PREFIX}__{shape.value}__{dag_no}{suffix}"
+
+
+def dataset_uri(dag_no: int, task_no: int) -> str:
+    """Return the URI of a dataset produced by a task of the dataset benchmark DAGs."""
+    return f"benchmark://{DAG_PREFIX}/{dag_no}/{task_no}"
+
+
+def _scheduled_dag(dag_id: str, num_runs: int) -> DAG:
+    return DAG(
+        dag_id=dag_id,
+        schedule=datetime.timedelta(days=1),
+        start_date=START_DATE,
+        end_date=START_DATE + datetime.timedelta(days=num_runs - 1),
+        catchup=True,
+        max_active_tasks=10_000,
+        is_paused_upon_creation=False,
+    )
+
+
+def build_dags(shape: BenchmarkShape, size: int, dags_count: int, num_runs: int) -> list[DAG]:
+    """Build the benchmark DAGs of the given shape."""
+    dags = []
+    for dag_no in range(1, dags_count + 1):
+        if shape == BenchmarkShape.WIDE:
+            # One task fanning out to all the others, which are joined again by the last one
+            with _scheduled_dag(benchmark_dag_id(shape, dag_no), num_runs) as dag:
+                tasks = [BashOperator(task_id=f"task_{i}", bash_command=COMMAND) for i in range(size)]
+                if size > 2:
+                    tasks[0] >> tasks[1:-1] >> tasks[-1]
+            dags.append(dag)
+        elif shape == BenchmarkShape.DEEP:
+            with _scheduled_dag(benchmark_dag_id(shape, dag_no), num_runs) as dag:
+                chain(*(BashOperator(task_id=f"task_{i}", bash_command=COMMAND) for i in range(size)))
+            dags.append(dag)
+        elif shape == BenchmarkShape.MAPPED:
+            with _scheduled_dag(benchmark_dag_id(shape, dag_no), num_runs) as dag:
+                mapped = BashOperator.partial(task_id="mapped").expand(bash_command=[COMMAND] * size)
+                mapped >> BashOperator(task_id="reduce", bash_command=COMMAND)
+            dags.append(dag)
+        elif shape == BenchmarkShape.DATASET:
+            # A scheduled DAG updating datasets, and a DAG triggered once all of them are updated
+            datasets = [Dataset(dataset_uri(dag_no, i)) for i in range(size)]
+            with _scheduled_dag(benchmark_dag_id(shape, dag_no, "_producer"), num_runs) as producer:
+                for i, dataset in enumerate(datasets):
+                    BashOperator(task_id=f"produce_{i}", bash_command=COMMAND, outlets=[dataset])
+            with DAG(
+                dag_id=benchmark_dag_id(shape, dag_no, "_consumer"),
+                schedule=datasets,
+                start_date=START_DATE,
+                is_paused_upon_creation=False,
+            ) as consumer:
+                BashOperator(task_id="consume", bash_command=COMMAND)
+            dags.extend((producer, consumer))
+    return dags
+
+
+if "PERF_BENCHMARK_SHAPE" in os.environ:
+    for _dag in build_dags(
+        shape=BenchmarkShape(os.environ["PERF_BENCHMARK_SHAPE"]),
+        size=int(os.environ.get("PERF_BENCHMARK_SIZE", "10")),
+        dags_count=int(os.environ.get("PERF_BENCHMARK_DAGS_COUNT", "1")),
+        num_runs=int(os.environ.get("PERF_MAX_RUNS", "1")),
+    ):
+        globals()[_dag.dag_id] = _dag
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark how long executor heartbeats take to pick the tasks to run from a large backlog of queued tasks.
+
+Run it from the root of the repository, e.g.::
+
+    python -m dev.perf.executor_queue_benchmark --backlog 50000 --open-slots 32
+"""
+from __future__ import annotations
+
+import random
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import rich_click as click
+
+from dev.perf.scheduler_benchmark import percentile
+
+# How the queued tasks of the executor are stored: indexed by priority (the default), or in a plain
+# dict sorted on every heartbeat (as before the queued tasks were indexed by priority)
+STORES = ("priority_dict", "sorted_dict")
+
+
+def make_executor(store: str):
+    from airflow.executors.base_executor import BaseExecutor
+
+    class NoOpExecutor(BaseExecutor):
+        """Executor which does not run the tasks it is given."""
+
+        def execute_async(self, key, command, queue=None, executor_config=None) -> None:
+            pass
+
+        def sync(self) -> None:
+            pass
+
+    executor = NoOpExecutor()
+    if store == "sorted_dict":
+        executor.queued_tasks = {}
+    return executor
+
+
+def queue_tasks(executor, first_index: int, count: int, rng: random.Random) -> None:
+    from airflow.models.taskinstancekey import TaskInstanceKey
+
+    for index in range(first_index, first_index + count):
+        key = TaskInstanceKey("benchmark_dag", f"task_{index}", "benchmark_run", 1)
+        ti = SimpleNamespace(key=key, executor_config=None, queued_dttm=None)
+        executor.queued_tasks[key] = (["airflow", "tasks", "run"], rng.randrange(100), None, ti)
+
+
+def run_benchmark(store: str, backlog: int, open_slots: int, heartbeats: int, seed: int) -> dict[str, Any]:
+    """Run heartbeats, each dispatching open_slots tasks and queueing as many to keep the backlog."""
+    rng = random.Random(seed)
+    executor = make_executor(store)
+    queue_tasks(executor, 0, backlog, rng)
+    next_index = backlog
+
+    durations = []
+    for _ in range(heartbeats):
+        start = time.perf_counter()
+        executor.trigger_tasks(open_slots)
+        durations.append(time.perf_counter() - start)
+        # The dispatched tasks finish, and the scheduler queues new ones
+        dispatched = len(executor.running)
+        executor.running.clear()
+        queue_tasks(executor, next_index, dispatched, rng)
+        next_index += dispatched
+
+    durations.sort()
+    return {
+        "store": store,
+        "backlog": backlog,
+        "open_slots": open_slots,
+        "heartbeats": heartbeats,
+        "heartbeat_mean": sum(durations) / len(durations),
+        "heartbeat_p50": percentile(durations, 50),
+        "heartbeat_p95": percentile(durations, 95),
+    }
+
+
+@click.command()
+@click.option(
+    "--backlog", default=50000, show_default=True, help="Number of tasks kept queued in the executor"
+)
+@click.option("--open-slots", default=32, show_default=True, help="Number of tasks dispatched per heartbeat")
+@click.option("--heartbeats", default=200, show_default=True, help="Number of heartbeats to measure")
+@click.option(
+    "--store",
+    "stores",
+    type=click.Choice(STORES),
+    multiple=True,
+    help="How the queued tasks are stored, can be given several times. Defaults to all of them.",
+)
+@click.option("--seed", default=0, help="Seed of the random priorities of the tasks")
+def main(backlog, open_slots, heartbeats, stores, seed):
+    """
+    Measure the heartbeats of an executor with a large backlog of queued tasks.
+
+    Tasks are not run: each heartbeat dispatches as many tasks as there are open slots to an executor
+    which does nothing with them, and as many tasks are queued again before the next heartbeat.
+    """
+    for store in stores or STORES:
+        result = run_benchmark(store, backlog, open_slots, heartbeats, seed)
+        click.echo(
+            f"{store:>13}: mean {result['heartbeat_mean'] * 1000:.3f}ms, "
+            f"p50 {result['heartbeat_p50'] * 1000:.3f}ms, p95 {result['heartbeat_p95'] * 1000:.3f}ms "
+            f"per heartbeat with {backlog} queued tasks and {open_slots} open slots"
+        )
+
+
+if __name__ == "__main__":
+    main()
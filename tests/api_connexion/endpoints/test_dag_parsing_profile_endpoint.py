@@ -0,0 +1,132 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import pytest
+
+from airflow.models.dagparsingprofile import DagParsingProfile
+from airflow.security import permissions
+from airflow.utils import timezone
+from tests.test_utils.api_connexion_utils import assert_401, create_user, delete_user
+from tests.test_utils.db import clear_db_dag_parsing_profiles
+
+
+@pytest.fixture(scope="module")
+def configured_app(minimal_app_for_api):
+    app = minimal_app_for_api
+    create_user(
+        app,  # type:ignore
+        username="test",
+        role_name="Test",
+        permissions=[(permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG_CODE)],  # type: ignore
+    )
+    create_user(app, username="test_no_permissions", role_name="TestNoPermissions")  # type: ignore
+
+    yield app
+
+    delete_user(app, username="test")  # type: ignore
+    delete_user(app, username="test_no_permissions")  # type: ignore
+
+
+class TestDagParsingProfileEndpoint:
+    timestamp = "2020-06-10T12:00"
+
+    @pytest.fixture(autouse=True)
+    def setup_attrs(self, configured_app, session) -> None:
+        self.app = configured_app
+        self.client = self.app.test_client()  # type:ignore
+
+        clear_db_dag_parsing_profiles()
+        session.add_all(
+            DagParsingProfile(
+                fileloc=f"/dags/dag_{i}.py",
+                processor_subdir="/dags",
+                timestamp=timezone.parse(self.timestamp, timezone="UTC"),
+                duration=float(i),
+                peak_rss=100,
+                phases={"imports": i * 0.75, "dag_construction": i * 0.25},
+                imports={"pandas": i * 0.75},
+            )
+            for i in range(1, 4)
+        )
+        session.commit()
+
+    def teardown_method(self) -> None:
+        clear_db_dag_parsing_profiles()
+
+    def test_get_dag_parsing_profile(self, url_safe_serializer):
+        file_token = url_safe_serializer.dumps("/dags/dag_2.py")
+        response = self.client.get(
+            f"/api/v1/dagParsingProfiles/{file_token}", environ_overrides={"REMOTE_USER": "test"}
+        )
+
+        assert response.status_code == 200
+        assert response.json == {
+            "fileloc": "/dags/dag_2.py",
+            "timestamp": "2020-06-10T12:00:00+00:00",
+            "duration": 2.0,
+            "peak_rss": 100,
+            "phases": {"imports": 1.5, "dag_construction": 0.5},
+            "imports": {"pandas": 1.5},
+        }
+
+    @pytest.mark.parametrize("path", ["/dags/not_profiled.py", None])
+    def test_get_dag_parsing_profile_404(self, url_safe_serializer, path):
+        file_token = url_safe_serializer.dumps(path) if path else "invalid_token"
+        response = self.client.get(
+            f"/api/v1/dagParsingProfiles/{file_token}", environ_overrides={"REMOTE_USER": "test"}
+        )
+        assert response.status_code == 404
+
+    def test_get_dag_parsing_profiles_slowest_first(self):
+        response = self.client.get(
+            "/api/v1/dagParsingProfiles?limit=2", environ_overrides={"REMOTE_USER": "test"}
+        )
+
+        assert response.status_code == 200
+        assert response.json["total_entries"] == 3
+        assert [p["fileloc"] for p in response.json["dag_parsing_profiles"]] == [
+            "/dags/dag_3.py",
+            "/dags/dag_2.py",
+        ]
+
+    def test_get_dag_parsing_profiles_order_by(self):
+        response = self.client.get(
+            "/api/v1/dagParsingProfiles?order_by=fileloc", environ_overrides={"REMOTE_USER": "test"}
+        )
+
+        assert response.status_code == 200
+        assert [p["fileloc"] for p in response.json["dag_parsing_profiles"]] == [
+            "/dags/dag_1.py",
+            "/dags/dag_2.py",
+            "/dags/dag_3.py",
+        ]
+
+    def test_get_dag_parsing_profiles_order_by_unknown_field(self):
+        response = self.client.get(
+            "/api/v1/dagParsingProfiles?order_by=phases", environ_overrides={"REMOTE_USER": "test"}
+        )
+        assert response.status_code == 400
+
+    def test_should_raises_401_unauthenticated(self):
+        assert_401(self.client.get("/api/v1/dagParsingProfiles"))
+
+    def test_should_raise_403_forbidden(self):
+        response = self.client.get(
+            "/api/v1/dagParsingProfiles", environ_overrides={"REMOTE_USER": "test_no_permissions"}
+        )
+        assert response.status_code == 403
@@ -38,6 +38,7 @@ from airflow.exceptions import AirflowException
 from airflow.models import DagBag, DagModel, DagRun
 from airflow.models.baseoperator import BaseOperator
 from airflow.models.dag import _StopDagTest
+from airflow.models.dagparsingprofile import DagParsingProfile
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.triggers.temporal import TimeDeltaTrigger
 from airflow.utils import timezone
@@ -45,7 +46,7 @@ from airflow.utils.session import create_session
 from airflow.utils.types import DagRunType
 from tests.models import TEST_DAGS_FOLDER
 from tests.test_utils.config import conf_vars
-from tests.test_utils.db import clear_db_dags, clear_db_runs
+from tests.test_utils.db import clear_db_dag_parsing_profiles, clear_db_dags, clear_db_runs
 
 DEFAULT_DATE = timezone.make_aware(datetime(2015, 1, 1), timezone=timezone.utc)
 
@@ -112,6 +113,20 @@ class TestCliDags:
             serialized_dags_after_reserialize = session.query(SerializedDagModel).all()
         assert len(serialized_dags_after_reserialize) == 1  # Serialized DAG back
 
+    def test_reserialize_in_parallel(self):
+        def get_dag_hashes():
+            with create_session() as session:
+                return dict(session.query(SerializedDagModel.dag_id, SerializedDagModel.dag_hash))
+
+        dag_command.dag_reserialize(self.parser.parse_args(["dags", "reserialize"]))
+        dag_hashes = get_dag_hashes()
+
+        dag_command.dag_reserialize(self.parser.parse_args(["dags", "reserialize", "--parallelism", "2"]))
+
+        # The same DAGs are serialized as by a sequential reserialize
+        assert len(dag_hashes) >= 40
+        assert get_dag_hashes() == dag_hashes
+
     @mock.patch("airflow.cli.commands.dag_command.DAG.run")
     def test_backfill(self, mock_run):
         dag_command.dag_backfill(
@@ -499,6 +514,43 @@ class TestCliDags:
         assert "airflow/example_dags/example_complex.py" in out
         assert "example_complex" in out
 
+    def test_cli_report_profile(self, tmp_path):
+        dag_file = os.path.join(tmp_path, "dag.py")
+        with create_session() as session:
+            session.add(
+                DagParsingProfile(
+                    fileloc=dag_file,
+                    processor_subdir=str(tmp_path),
+                    duration=2.5,
+                    peak_rss=200 * 2**20,
+                    phases={"imports": 2.0, "dag_construction": 0.5},
+                    imports={"pandas": 1.5, "numpy": 0.5},
+                )
+            )
+            session.add(DagParsingProfile(fileloc="/other/dag.py", duration=1, phases={}, imports={}))
+
+        try:
+            args = self.parser.parse_args(
+                ["dags", "report", "--profile", "--subdir", str(tmp_path), "--output", "json"]
+            )
+            with contextlib.redirect_stdout(StringIO()) as temp_stdout:
+                dag_command.dag_report(args)
+
+            profiles = json.loads(temp_stdout.getvalue())
+            assert len(profiles) == 1
+            assert profiles[0]["file"] == dag_file
+            assert profiles[0]["imports"] == 2.0
+            assert profiles[0]["dag_construction"] == 0.5
+            assert profiles[0]["peak_rss_mb"] == 200
+            assert profiles[0]["slowest_imports"] == {"pandas": 1.5, "numpy": 0.5}
+        finally:
+            clear_db_dag_parsing_profiles()
+
+    def test_cli_report_profile_without_profiles(self, tmp_path):
+        args = self.parser.parse_args(["dags", "report", "--profile", "--subdir", str(tmp_path)])
+        with pytest.raises(SystemExit, match="enable_dag_parsing_profiling"):
+            dag_command.dag_report(args)
+
     @conf_vars({("core", "load_examples"): "true"})
     def test_cli_get_dag_details(self):
         args = self.parser.parse_args(["dags", "details", "example_complex", "--output", "yaml"])
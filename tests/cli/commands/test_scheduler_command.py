@@ -17,6 +17,7 @@
 # under the License.
 from __future__ import annotations
 
+import json
 from http.server import BaseHTTPRequestHandler
 from unittest import mock
 from unittest.mock import MagicMock
@@ -163,6 +164,28 @@ class TestSchedulerCommand:
         mock_process.assert_called_once_with(target=serve_logs)
         mock_process().terminate.assert_called_once_with()
 
+    @mock.patch("airflow.cli.commands.scheduler_command.read_profile")
+    def test_scheduler_profile(self, mock_read_profile, capsys):
+        mock_read_profile.return_value = {
+            "pid": 1,
+            "updated_at": "2023-01-01T00:00:00+00:00",
+            "total_loops": 10,
+            "window_loops": 5,
+            "phases": {"critical_section": {"count": 5, "duration_mean": 0.5}},
+        }
+        args = self.parser.parse_args(["scheduler-profile", "--output", "json"])
+        scheduler_command.scheduler_profile(args)
+
+        assert json.loads(capsys.readouterr().out) == [
+            {"phase": "critical_section", "count": 5, "duration_mean": 0.5}
+        ]
+
+    @mock.patch("airflow.cli.commands.scheduler_command.read_profile", return_value=None)
+    def test_scheduler_profile_not_enabled(self, mock_read_profile):
+        args = self.parser.parse_args(["scheduler-profile"])
+        with pytest.raises(SystemExit, match="enable_profiling"):
+            scheduler_command.scheduler_profile(args)
+
 
 # Creating MockServer subclass of the HealthServer handler so that we can test the do_GET logic
 class MockServer(HealthServer):
@@ -210,3 +233,22 @@ class TestSchedulerHealthServer:
         mock_session.return_value.__enter__.return_value.query.return_value = None
         self.mock_server.do_GET("/health")
         mock_send_error.assert_called_with(503)
+
+    @mock.patch.object(BaseHTTPRequestHandler, "wfile", create=True)
+    @mock.patch.object(BaseHTTPRequestHandler, "end_headers")
+    @mock.patch.object(BaseHTTPRequestHandler, "send_header")
+    @mock.patch.object(BaseHTTPRequestHandler, "send_response")
+    @mock.patch("airflow.utils.scheduler_health.read_profile")
+    def test_profile(
+        self, mock_read_profile, mock_send_response, mock_send_header, mock_end_headers, mock_wfile
+    ):
+        mock_read_profile.return_value = {"phases": {}}
+        self.mock_server.do_GET("/profile")
+        mock_send_response.assert_called_once_with(200)
+        mock_wfile.write.assert_called_once_with(b'{"phases": {}}')
+
+    @mock.patch.object(BaseHTTPRequestHandler, "send_error")
+    @mock.patch("airflow.utils.scheduler_health.read_profile", return_value=None)
+    def test_profile_not_enabled(self, mock_read_profile, mock_send_error):
+        self.mock_server.do_GET("/profile")
+        mock_send_error.assert_called_with(404, "Scheduler profiling is not enabled")
@@ -281,6 +281,48 @@ class TestCliTasks:
             external_executor_id=None,
         )
 
+    @mock.patch.object(TaskInstance, "schedule_downstream_tasks")
+    @mock.patch.object(TaskInstance, "_run_raw_task")
+    @mock.patch.object(TaskInstance, "check_and_change_state_before_execution")
+    @mock.patch("airflow.cli.commands.task_command.LocalTaskJobRunner")
+    def test_run_lightweight_task_in_process(
+        self, mock_local_job_runner, mock_check_state, mock_run_raw_task, mock_schedule_downstream
+    ):
+        """Test that a lightweight task from the LocalExecutor is run without a LocalTaskJob"""
+        args = self.parser.parse_args(
+            ["tasks", "run", "--local", self.dag_id, self.dag.task_ids[0], self.run_id]
+        )
+        args.lightweight = True
+        mock_check_state.return_value = True
+        mock_run_raw_task.return_value = None
+
+        task_command.task_run(args, dag=self.dag)
+
+        mock_local_job_runner.assert_not_called()
+        mock_check_state.assert_called_once_with(
+            mark_success=False,
+            ignore_all_deps=False,
+            ignore_depends_on_past=False,
+            wait_for_past_depends_before_skipping=False,
+            ignore_task_deps=False,
+            ignore_ti_state=False,
+            pool=None,
+            external_executor_id=None,
+        )
+        mock_run_raw_task.assert_called_once_with(mark_success=False, pool=None)
+        mock_schedule_downstream.assert_called_once()
+
+    @mock.patch.object(TaskInstance, "_run_raw_task")
+    @mock.patch.object(TaskInstance, "check_and_change_state_before_execution", return_value=False)
+    def test_run_lightweight_task_not_able_to_run(self, mock_check_state, mock_run_raw_task):
+        args = self.parser.parse_args(
+            ["tasks", "run", "--local", self.dag_id, self.dag.task_ids[0], self.run_id]
+        )
+        args.lightweight = True
+
+        assert task_command.task_run(args, dag=self.dag) is None
+        mock_run_raw_task.assert_not_called()
+
     @pytest.mark.parametrize(
         "from_db",
         [True, False],
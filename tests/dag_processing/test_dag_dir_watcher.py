@@ -0,0 +1,172 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import shutil
+import sys
+from unittest import mock
+
+import pytest
+
+from airflow.dag_processing.dag_dir_watcher import (
+    DagDirectoryChanges,
+    InotifyDagDirectoryWatcher,
+    PollingDagDirectoryWatcher,
+    _load_libc,
+    get_dag_directory_watcher,
+)
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher(request, tmp_path):
+    if request.param == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is only available on Linux")
+    (tmp_path / "dag.py").write_text("")
+    watcher = get_dag_directory_watcher(request.param, tmp_path, poll_interval=0)
+    yield watcher
+    watcher.close()
+
+
+class TestDagDirectoryWatcher:
+    def test_first_changes_ask_for_rescan(self, watcher):
+        assert watcher.get_changes() == DagDirectoryChanges(paths=set(), rescan=True)
+        assert watcher.get_changes() == DagDirectoryChanges(paths=set(), rescan=False)
+
+    def test_changes(self, watcher, tmp_path):
+        watcher.get_changes()
+
+        (tmp_path / "new_dag.py").write_text("")
+        (tmp_path / "dag.py").write_text("# changed")
+        (tmp_path / "subdir").mkdir()
+        (tmp_path / "subdir" / "nested_dag.py").write_text("")
+        assert watcher.get_changes() == DagDirectoryChanges(
+            paths={
+                os.path.join(tmp_path, "new_dag.py"),
+                os.path.join(tmp_path, "dag.py"),
+                os.path.join(tmp_path, "subdir", "nested_dag.py"),
+            },
+            rescan=False,
+        )
+
+        (tmp_path / "subdir" / "other_nested_dag.py").write_text("")
+        os.remove(tmp_path / "new_dag.py")
+        assert watcher.get_changes() == DagDirectoryChanges(
+            paths={
+                os.path.join(tmp_path, "subdir", "other_nested_dag.py"),
+                os.path.join(tmp_path, "new_dag.py"),
+            },
+            rescan=False,
+        )
+
+    def test_ignored_directories_are_not_watched(self, watcher, tmp_path):
+        (tmp_path / ".airflowignore").write_text("node_modules")
+        (tmp_path / "node_modules").mkdir()
+        watcher.get_changes()
+
+        (tmp_path / "node_modules" / "package.py").write_text("")
+        (tmp_path / "new_dag.py").write_text("")
+
+        assert watcher.get_changes() == DagDirectoryChanges(
+            paths={os.path.join(tmp_path, "new_dag.py")}, rescan=False
+        )
+
+    def test_ignore_file_changes(self, watcher, tmp_path):
+        watcher.get_changes()
+
+        (tmp_path / ".airflowignore").write_text("dag")
+
+        changes = watcher.get_changes()
+        # The directory is listed again, as the files ignored changed
+        assert changes.rescan or os.path.join(tmp_path, ".airflowignore") in changes.paths
+
+    def test_deleted_directory(self, watcher, tmp_path):
+        (tmp_path / "subdir").mkdir()
+        (tmp_path / "subdir" / "nested_dag.py").write_text("")
+        watcher.get_changes()
+
+        shutil.rmtree(tmp_path / "subdir")
+
+        changes = watcher.get_changes()
+        assert not changes.rescan
+        # Inotify only reports the deleted directory, polling the deleted files in it
+        assert changes.paths & {
+            os.path.join(tmp_path, "subdir"),
+            os.path.join(tmp_path, "subdir", "nested_dag.py"),
+        }
+
+
+def test_polling_watcher_waits_for_poll_interval(tmp_path):
+    watcher = PollingDagDirectoryWatcher(tmp_path, poll_interval=60)
+    watcher.get_changes()
+
+    (tmp_path / "new_dag.py").write_text("")
+
+    with mock.patch("airflow.dag_processing.dag_dir_watcher.time.monotonic", return_value=1e9):
+        assert watcher.get_changes().paths == {os.path.join(tmp_path, "new_dag.py")}
+
+
+@mock.patch("airflow.dag_processing.dag_dir_watcher._load_libc", return_value=None)
+def test_inotify_watcher_falls_back_to_polling(_, tmp_path):
+    assert isinstance(get_dag_directory_watcher("inotify", tmp_path, 5), PollingDagDirectoryWatcher)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+def test_inotify_watcher_rescans_when_directory_link_changes(tmp_path):
+    (tmp_path / "v1").mkdir()
+    (tmp_path / "v2").mkdir()
+    os.symlink(tmp_path / "v1", tmp_path / "dags")
+    watcher = get_dag_directory_watcher("inotify", tmp_path / "dags", poll_interval=0)
+    assert isinstance(watcher, InotifyDagDirectoryWatcher)
+    watcher.get_changes()
+
+    os.symlink(tmp_path / "v2", tmp_path / "new_link")
+    os.replace(tmp_path / "new_link", tmp_path / "dags")
+
+    assert watcher.get_changes().rescan
+    watcher.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+def test_inotify_watcher_lists_directory_periodically_when_it_cannot_watch_it(tmp_path, caplog):
+    (tmp_path / "subdir").mkdir()
+    libc = _load_libc()
+
+    def add_watch_failing_for_subdir(fd, path, mask):
+        if path.endswith(b"subdir"):
+            # As when reaching the max_user_watches limit
+            ctypes.set_errno(errno.ENOSPC)
+            return -1
+        return libc.inotify_add_watch(fd, path, mask)
+
+    mock_libc = mock.Mock(inotify_init1=libc.inotify_init1, inotify_add_watch=add_watch_failing_for_subdir)
+    watcher = InotifyDagDirectoryWatcher(tmp_path, mock_libc, poll_interval=60)
+
+    with mock.patch(
+        "airflow.dag_processing.dag_dir_watcher.time.monotonic", return_value=0
+    ) as mock_monotonic:
+        with caplog.at_level("WARNING", logger="airflow.dag_processing.dag_dir_watcher"):
+            assert watcher.get_changes().rescan
+        assert "Could not watch 1 directories" in caplog.text
+
+        assert not watcher.get_changes().rescan
+        mock_monotonic.return_value = 60
+        assert watcher.get_changes().rescan
+    watcher.close()
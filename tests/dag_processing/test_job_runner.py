@@ -58,10 +58,17 @@ from airflow.models.serialized_dag import SerializedDagModel
 from airflow.utils import timezone
 from airflow.utils.net import get_hostname
 from airflow.utils.session import create_session
+from airflow.utils.state import JobState
 from tests.core.test_logging_config import SETTINGS_FILE_VALID, settings_context
 from tests.models import TEST_DAGS_FOLDER
 from tests.test_utils.config import conf_vars
-from tests.test_utils.db import clear_db_callbacks, clear_db_dags, clear_db_runs, clear_db_serialized_dags
+from tests.test_utils.db import (
+    clear_db_callbacks,
+    clear_db_dags,
+    clear_db_jobs,
+    clear_db_runs,
+    clear_db_serialized_dags,
+)
 
 TEST_DAG_FOLDER = pathlib.Path(__file__).parents[1].resolve() / "dags"
 
@@ -505,6 +512,87 @@ class TestDagProcessorJobRunner:
             ["file_4.py", "file_3.py", "file_2.py", "file_1.py"]
         )
 
+    def test_get_live_dag_processor_job_ids(self):
+        now = timezone.utcnow()
+        with create_session() as session:
+            live_job = Job(job_type="DagProcessorJob", state=JobState.RUNNING, latest_heartbeat=now)
+            dead_job = Job(
+                job_type="DagProcessorJob",
+                state=JobState.RUNNING,
+                latest_heartbeat=now - timedelta(hours=1),
+            )
+            finished_job = Job(job_type="DagProcessorJob", state=JobState.SUCCESS, latest_heartbeat=now)
+            scheduler_job = Job(job_type="SchedulerJob", state=JobState.RUNNING, latest_heartbeat=now)
+            session.add_all([live_job, dead_job, finished_job, scheduler_job])
+            session.flush()
+            live_job_id = live_job.id
+
+        try:
+            assert DagFileProcessorManager.get_live_dag_processor_job_ids() == [live_job_id]
+        finally:
+            clear_db_jobs()
+
+    @conf_vars(
+        {
+            ("scheduler", "standalone_dag_processor"): "True",
+            ("scheduler", "dag_processor_sharding"): "True",
+            ("scheduler", "file_parsing_sort_mode"): "alphabetical",
+        }
+    )
+    @mock.patch.object(DagFileProcessorManager, "get_live_dag_processor_job_ids")
+    def test_dag_processor_sharding(self, mock_get_live_job_ids, tmp_path):
+        """Check that live DAG processors split the DAG files, and rebalance when one of them leaves"""
+        dag_files = [os.fspath(tmp_path / f"file_{i}.py") for i in range(20)]
+        managers = []
+        for job_id in (1, 2):
+            manager = DagFileProcessorManager(
+                dag_directory=os.fspath(tmp_path),
+                max_runs=1,
+                processor_timeout=timedelta(days=365),
+                signal_conn=MagicMock(),
+                dag_ids=[],
+                pickle_dags=False,
+                async_mode=True,
+            )
+            manager.job_id = job_id
+            manager.set_file_paths(dag_files)
+            managers.append(manager)
+
+        mock_get_live_job_ids.return_value = [1, 2]
+        for manager in managers:
+            manager._refresh_dag_processor_shard()
+            manager.prepare_file_path_queue()
+
+        queued_files = [set(manager._file_path_queue) for manager in managers]
+        assert queued_files[0]
+        assert queued_files[1]
+        assert queued_files[0].isdisjoint(queued_files[1])
+        assert queued_files[0] | queued_files[1] == set(dag_files)
+
+        # The other DAG processor left, so this one takes over all the files
+        mock_get_live_job_ids.return_value = [1]
+        manager = managers[0]
+        manager._last_shard_refresh_time = 0.0
+        manager._refresh_dag_processor_shard()
+        assert set(manager._file_path_queue) == set(dag_files)
+
+    @conf_vars({("scheduler", "dag_processor_sharding"): "True"})
+    @mock.patch.object(DagFileProcessorManager, "get_live_dag_processor_job_ids")
+    def test_dag_processor_sharding_requires_standalone_dag_processor(self, mock_get_live_job_ids):
+        manager = DagFileProcessorManager(
+            dag_directory="directory",
+            max_runs=1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+        manager.job_id = 1
+        manager._refresh_dag_processor_shard()
+        mock_get_live_job_ids.assert_not_called()
+        assert manager._owns_file("directory/file_1.py")
+
     @conf_vars({("scheduler", "file_parsing_sort_mode"): "modified_time"})
     @mock.patch("airflow.settings.TIMEZONE", timezone.utc)
     @mock.patch("zipfile.is_zipfile", return_value=True)
@@ -573,6 +661,132 @@ class TestDagProcessorJobRunner:
                 > (freezed_base_time - manager.processor.get_last_finish_time("file_1.py")).total_seconds()
             )
 
+    @conf_vars(
+        {
+            ("scheduler", "file_parsing_sort_mode"): "alphabetical",
+            ("scheduler", "skip_unchanged_dag_files"): "True",
+            ("scheduler", "unchanged_dag_file_max_staleness"): "3600",
+        }
+    )
+    @mock.patch.object(DagFileProcessorManager, "mark_dags_of_unchanged_files_parsed")
+    def test_unchanged_file_is_not_parsed(self, mock_mark_parsed, tmp_path):
+        """Test files are only parsed again if they or the local modules they import changed"""
+        dag_file = tmp_path / "dag.py"
+        dag_file.write_text("from helpers import make_dag\n")
+        helpers_file = tmp_path / "helpers.py"
+        helpers_file.write_text("def make_dag(): pass\n")
+        dag_files = [os.fspath(dag_file)]
+
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=-1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+
+        freezed_base_time = timezone.datetime(2020, 1, 5, 0, 0, 0)
+        last_finish_time = freezed_base_time - timedelta(minutes=1)
+        manager._file_stats = {
+            dag_files[0]: DagFileStat(
+                1,
+                0,
+                last_finish_time,
+                timedelta(seconds=1.0),
+                1,
+                content_hash=manager._get_content_hash(dag_files[0]),
+            ),
+        }
+        manager.set_file_paths(dag_files)
+
+        with time_machine.travel(freezed_base_time, tick=False):
+            manager.prepare_file_path_queue()
+        assert manager._file_path_queue == deque()
+        assert manager._file_stats[dag_files[0]].last_skipped_time == freezed_base_time
+        assert manager._file_stats[dag_files[0]].last_finish_time == last_finish_time
+        mock_mark_parsed.assert_called_once_with(dag_files)
+
+        # The file is not checked again before min_file_process_interval passes
+        helpers_file.write_text("def make_dag(): return None\n")
+        with time_machine.travel(freezed_base_time + timedelta(seconds=10), tick=False):
+            manager.prepare_file_path_queue()
+        assert manager._file_path_queue == deque()
+
+        # A change to an imported module changes the hash of the file
+        with time_machine.travel(freezed_base_time + timedelta(minutes=1), tick=False):
+            manager.prepare_file_path_queue()
+        assert manager._file_path_queue == deque(dag_files)
+
+    @conf_vars(
+        {
+            ("scheduler", "skip_unchanged_dag_files"): "True",
+            ("scheduler", "unchanged_dag_file_max_staleness"): "600",
+        }
+    )
+    @mock.patch.object(DagFileProcessorManager, "mark_dags_of_unchanged_files_parsed")
+    def test_unchanged_file_is_parsed_after_max_staleness(self, mock_mark_parsed, tmp_path):
+        dag_file = tmp_path / "dag.py"
+        dag_file.write_text("from airflow import DAG\n")
+        dag_files = [os.fspath(dag_file)]
+
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=-1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+
+        freezed_base_time = timezone.datetime(2020, 1, 5, 0, 0, 0)
+        manager._file_stats = {
+            dag_files[0]: DagFileStat(
+                1,
+                0,
+                freezed_base_time - timedelta(minutes=10),
+                timedelta(seconds=1.0),
+                1,
+                content_hash=manager._get_content_hash(dag_files[0]),
+            ),
+        }
+        manager.set_file_paths(dag_files)
+
+        with time_machine.travel(freezed_base_time, tick=False):
+            manager.prepare_file_path_queue()
+        assert manager._file_path_queue == deque(dag_files)
+        mock_mark_parsed.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "mp_start_method, expected_imports",
+        [
+            ("fork", [mock.call("pandas"), mock.call("airflow.operators.bash")]),
+            ("spawn", []),
+        ],
+    )
+    @mock.patch("airflow.dag_processing.manager.importlib.import_module")
+    def test_warm_up(self, mock_import_module, mp_start_method, expected_imports):
+        with conf_vars(
+            {
+                ("core", "mp_start_method"): mp_start_method,
+                ("scheduler", "parsing_warm_up_modules"): "pandas, airflow.operators.bash",
+            }
+        ):
+            manager = DagFileProcessorManager(
+                dag_directory="directory",
+                max_runs=1,
+                processor_timeout=timedelta(days=365),
+                signal_conn=MagicMock(),
+                dag_ids=[],
+                pickle_dags=False,
+                async_mode=True,
+            )
+            manager._warm_up()
+
+        assert mock_import_module.call_args_list == expected_imports
+
     def test_scan_stale_dags(self):
         """
         Ensure that DAGs are marked inactive when the file is parsed but the
@@ -932,6 +1146,46 @@ class TestDagProcessorJobRunner:
             any_order=True,
         )
 
+    @conf_vars(
+        {("scheduler", "dag_dir_watcher"): "polling", ("scheduler", "dag_dir_watcher_poll_interval"): "0"}
+    )
+    def test_refresh_dag_dir_with_watcher(self, tmp_path):
+        """Test the changes seen by the dag dir watcher are applied without listing the dag dir"""
+        dag_file = tmp_path / "dag.py"
+        dag_file.write_text("# airflow DAG")
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+
+        # The dag dir is listed when the watcher starts
+        assert manager._refresh_dag_dir()
+        assert manager.file_paths == [os.fspath(dag_file)]
+
+        new_dag_file = tmp_path / "new_dag.py"
+        new_dag_file.write_text("# airflow DAG")
+        (tmp_path / "not_a_dag.py").write_text("")
+        dag_file.write_text("# airflow DAG, changed")
+        with mock.patch("airflow.dag_processing.manager.list_py_file_paths") as mock_list_py_file_paths:
+            assert manager._refresh_dag_dir()
+            mock_list_py_file_paths.assert_not_called()
+        assert manager.file_paths == [os.fspath(dag_file), os.fspath(new_dag_file)]
+        assert set(manager._file_path_queue) == {os.fspath(dag_file), os.fspath(new_dag_file)}
+
+        os.remove(dag_file)
+        assert manager._refresh_dag_dir()
+        assert manager.file_paths == [os.fspath(new_dag_file)]
+
+        # The dag dir is listed again when the ignore rules change
+        (tmp_path / ".airflowignore").write_text("new_dag")
+        assert manager._refresh_dag_dir()
+        assert manager.file_paths == []
+
     def test_refresh_dags_dir_doesnt_delete_zipped_dags(self, tmp_path):
         """Test DagProcessorJobRunner._refresh_dag_dir method"""
         manager = DagProcessorJobRunner(
@@ -0,0 +1,82 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import builtins
+import sys
+import threading
+from unittest import mock
+
+from airflow.dag_processing.parsing_profiler import DagFileParsingProfiler, get_peak_rss
+
+
+class TestDagFileParsingProfiler:
+    def test_phases(self):
+        profiler = DagFileParsingProfiler()
+        with mock.patch("airflow.dag_processing.parsing_profiler.time.monotonic", side_effect=[1, 3, 4, 5]):
+            with profiler.phase("callbacks"):
+                pass
+            with profiler.phase("callbacks"):
+                pass
+        assert profiler.to_dict()["phases"] == {"callbacks": 3}
+
+    def test_parsing_is_split_into_imports_and_dag_construction(self, monkeypatch, tmp_path):
+        monkeypatch.syspath_prepend(str(tmp_path))
+        (tmp_path / "profiled_package").mkdir()
+        (tmp_path / "profiled_package" / "__init__.py").write_text("")
+        (tmp_path / "profiled_package" / "module.py").write_text("import profiled_other_module\n")
+        (tmp_path / "profiled_other_module.py").write_text("")
+        monkeypatch.delitem(sys.modules, "profiled_package", raising=False)
+        monkeypatch.delitem(sys.modules, "profiled_package.module", raising=False)
+        monkeypatch.delitem(sys.modules, "profiled_other_module", raising=False)
+
+        profiler = DagFileParsingProfiler()
+        with profiler.phase("parsing"), profiler.record_imports():
+            import json  # noqa: F401 - already imported, so not recorded
+
+            import profiled_package.module  # noqa: F401
+
+        profile = profiler.to_dict()
+        # Nested imports are part of the time of the top-level module importing them
+        assert list(profile["imports"]) == ["profiled_package"]
+        assert set(profile["phases"]) == {"imports", "dag_construction"}
+        assert profile["phases"]["imports"] == profile["imports"]["profiled_package"]
+        assert profile["phases"]["dag_construction"] >= 0
+
+    def test_imports_of_other_threads_are_not_recorded(self, monkeypatch, tmp_path):
+        monkeypatch.syspath_prepend(str(tmp_path))
+        (tmp_path / "profiled_thread_module.py").write_text("")
+        monkeypatch.delitem(sys.modules, "profiled_thread_module", raising=False)
+
+        profiler = DagFileParsingProfiler()
+        with profiler.record_imports():
+            thread = threading.Thread(target=lambda: __import__("profiled_thread_module"))
+            thread.start()
+            thread.join()
+        assert profiler.to_dict()["imports"] == {}
+
+    def test_import_hook_is_removed(self):
+        original_import = builtins.__import__
+        profiler = DagFileParsingProfiler()
+        with profiler.record_imports():
+            assert builtins.__import__ is not original_import
+        assert builtins.__import__ is original_import
+
+
+def test_get_peak_rss():
+    assert get_peak_rss() > 0
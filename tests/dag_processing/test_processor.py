@@ -31,6 +31,7 @@ from airflow.configuration import TEST_DAGS_FOLDER, conf
 from airflow.dag_processing.manager import DagFileProcessorAgent
 from airflow.dag_processing.processor import DagFileProcessor, DagFileProcessorProcess
 from airflow.models import DagBag, DagModel, SlaMiss, TaskInstance, errors
+from airflow.models.dagparsingprofile import DagParsingProfile
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import SimpleTaskInstance
 from airflow.operators.empty import EmptyOperator
@@ -40,6 +41,7 @@ from airflow.utils.state import State
 from airflow.utils.types import DagRunType
 from tests.test_utils.config import conf_vars, env_vars
 from tests.test_utils.db import (
+    clear_db_dag_parsing_profiles,
     clear_db_dags,
     clear_db_import_errors,
     clear_db_jobs,
@@ -82,6 +84,7 @@ class TestDagFileProcessor:
         clear_db_import_errors()
         clear_db_jobs()
         clear_db_serialized_dags()
+        clear_db_dag_parsing_profiles()
 
     def setup_class(self):
         self.clean_db()
@@ -678,6 +681,35 @@ class TestDagFileProcessor:
 
             session.rollback()
 
+    @conf_vars({("scheduler", "enable_dag_parsing_profiling"): "True"})
+    def test_process_file_records_parsing_profile(self, monkeypatch, tmp_path, session):
+        monkeypatch.syspath_prepend(os.fspath(tmp_path))
+        (tmp_path / "parsing_profile_helper_module.py").write_text("VALUE = 1\n")
+        dag_file = tmp_path / TEMP_DAG_FILENAME
+        dag_file.write_text(
+            "import parsing_profile_helper_module\n"
+            "from airflow.models.dag import DAG\n"
+            "dag = DAG('test_parsing_profile', schedule=None)\n"
+        )
+
+        self._process_file(os.fspath(dag_file), dag_directory=tmp_path, session=session)
+
+        profile = session.query(DagParsingProfile).one()
+        assert profile.fileloc == os.fspath(dag_file)
+        assert profile.processor_subdir == os.fspath(tmp_path)
+        assert set(profile.phases) == {"imports", "dag_construction", "callbacks", "serialization", "db_sync"}
+        assert "parsing_profile_helper_module" in profile.imports
+        assert profile.duration >= sum(profile.phases.values())
+        assert profile.peak_rss > 0
+
+    def test_process_file_does_not_record_parsing_profile_by_default(self, tmp_path, session):
+        dag_file = tmp_path / TEMP_DAG_FILENAME
+        dag_file.write_text(PARSEABLE_DAG_FILE_CONTENTS)
+
+        self._process_file(os.fspath(dag_file), dag_directory=tmp_path, session=session)
+
+        assert session.query(DagParsingProfile).count() == 0
+
     @conf_vars({("core", "dagbag_import_error_tracebacks"): "False"})
     def test_new_import_error_replaces_old(self, tmpdir):
         unparseable_filename = os.path.join(tmpdir, TEMP_DAG_FILENAME)
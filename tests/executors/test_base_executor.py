@@ -30,6 +30,8 @@ from airflow.models.taskinstance import TaskInstance, TaskInstanceKey
 from airflow.utils import timezone
 from airflow.utils.state import State
 
+DEFAULT_DATE = timezone.datetime(2017, 1, 1)
+
 
 def test_supports_sentry():
     assert not BaseExecutor.supports_sentry
@@ -65,6 +67,33 @@ def test_no_cli_commands_vended():
     assert not BaseExecutor.get_cli_commands()
 
 
+def test_send_callbacks():
+    executor = BaseExecutor()
+    executor.callback_sink = mock.MagicMock()
+    requests = [mock.MagicMock(), mock.MagicMock()]
+
+    executor.send_callbacks(requests)
+
+    executor.callback_sink.send_many.assert_called_once_with(requests)
+    executor.callback_sink.send.assert_not_called()
+
+
+def test_send_callbacks_with_overridden_send_callback():
+    class CustomExecutor(BaseExecutor):
+        def send_callback(self, request):
+            self.sent.append(request)
+
+    executor = CustomExecutor()
+    executor.sent = []
+    executor.callback_sink = mock.MagicMock()
+    requests = [mock.MagicMock(), mock.MagicMock()]
+
+    executor.send_callbacks(requests)
+
+    assert executor.sent == requests
+    executor.callback_sink.send_many.assert_not_called()
+
+
 def test_get_event_buffer():
     executor = BaseExecutor()
 
@@ -138,6 +167,96 @@ def test_trigger_queued_tasks(dag_maker, open_slots):
     assert executor.execute_async.call_count == open_slots
 
 
+@pytest.mark.parametrize("plain_dict", [False, True])
+def test_order_queued_tasks_by_priority(plain_dict):
+    executor = BaseExecutor()
+    if plain_dict:
+        executor.queued_tasks = {}
+    for i, priority in enumerate([2, 5, 1, 5, 3]):
+        key = TaskInstanceKey("dag_id", f"task_{i}", "run_id", 1)
+        executor.queued_tasks[key] = (["airflow"], priority, None, mock.MagicMock())
+
+    ordered = [key.task_id for key, _ in executor.order_queued_tasks_by_priority()]
+    top = [key.task_id for key, _ in executor.order_queued_tasks_by_priority(limit=2)]
+
+    assert ordered == ["task_1", "task_3", "task_4", "task_0", "task_2"]
+    assert top == ["task_1", "task_3"]
+
+
+def test_trigger_tasks_submits_them_in_one_go(dag_maker):
+    executor, dagrun = setup_trigger_tasks(dag_maker)
+    executor.execute_async_many = mock.Mock()
+    executor.trigger_tasks(open_slots=3)
+
+    executor.execute_async_many.assert_called_once()
+    (task_tuples,) = executor.execute_async_many.call_args.args
+    assert {key for key, _, _, _ in task_tuples} == {ti.key for ti in dagrun.task_instances}
+    assert executor.running == {ti.key for ti in dagrun.task_instances}
+    assert not executor.queued_tasks
+    executor.execute_async.assert_not_called()
+
+
+@mock.patch("airflow.executors.base_executor.Stats")
+def test_trigger_tasks_dispatch_metrics(mock_stats, dag_maker):
+    executor, _ = setup_trigger_tasks(dag_maker)
+    executor.trigger_tasks(open_slots=2)
+
+    tags = {"name": "BaseExecutor"}
+    mock_stats.timer.assert_called_once_with("executor.dispatch_duration", tags=tags)
+    mock_stats.incr.assert_called_once_with("executor.dispatched_tasks", 2, tags=tags)
+
+
+@mock.patch("airflow.executors.base_executor.Stats")
+def test_trigger_tasks_dispatch_latency(mock_stats, dag_maker):
+    executor, _ = setup_trigger_tasks(dag_maker)
+    for minutes, (_, _, _, ti) in enumerate(executor.queued_tasks.values(), start=1):
+        ti.queued_dttm = DEFAULT_DATE - timedelta(minutes=minutes)
+
+    with time_machine.travel(DEFAULT_DATE, tick=False):
+        executor.trigger_tasks(open_slots=3)
+
+    mock_stats.timing.assert_called_once_with(
+        "executor.dispatch_latency", timedelta(minutes=3), tags={"name": "BaseExecutor"}
+    )
+
+
+@mock.patch("airflow.executors.base_executor.Stats")
+def test_trigger_tasks_dispatch_latency_without_queued_dttm(mock_stats, dag_maker):
+    executor, _ = setup_trigger_tasks(dag_maker)
+    executor.trigger_tasks(open_slots=3)
+
+    mock_stats.timing.assert_not_called()
+
+
+def test_trigger_tasks_failed_submission_drops_only_the_failed_task(dag_maker):
+    executor, _ = setup_trigger_tasks(dag_maker)
+    executor.execute_async.side_effect = [None, RuntimeError("boom"), None]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        executor.trigger_tasks(open_slots=3)
+
+    # The first task was submitted, the second dropped, and the third is still queued
+    assert len(executor.running) == 1
+    assert len(executor.queued_tasks) == 1
+    assert executor.running.isdisjoint(executor.queued_tasks)
+
+
+def test_trigger_tasks_failed_batch_submission_leaves_the_tasks_queued(dag_maker):
+    class BatchExecutor(BaseExecutor):
+        def execute_async_many(self, task_tuples):
+            raise RuntimeError("boom")
+
+    dagrun = setup_dagrun(dag_maker)
+    executor = BatchExecutor()
+    enqueue_tasks(executor, dagrun)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        executor.trigger_tasks(open_slots=3)
+
+    assert not executor.running
+    assert set(executor.queued_tasks) == {ti.key for ti in dagrun.task_instances}
+
+
 @pytest.mark.parametrize(
     "can_try_num, change_state_num, second_exec",
     [
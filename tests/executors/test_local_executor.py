@@ -21,10 +21,13 @@ import datetime
 import subprocess
 from unittest import mock
 
+import pytest
+
 from airflow import settings
 from airflow.exceptions import AirflowException
-from airflow.executors.local_executor import LocalExecutor
+from airflow.executors.local_executor import LocalExecutor, QueuedLocalWorker
 from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
 
 
 class TestLocalExecutor:
@@ -125,6 +128,99 @@ class TestLocalExecutor:
     def test_execution_limited_parallelism_fork(self):
         self.execution_parallelism_fork(parallelism=2)
 
+    @conf_vars({("core", "local_executor_warm_up"): "True"})
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", False)
+    def test_execution_limited_parallelism_fork_with_warm_up(self):
+        self.execution_parallelism_fork(parallelism=2)
+
+    @conf_vars(
+        {
+            ("core", "local_executor_warm_up"): "True",
+            ("core", "local_executor_warm_up_modules"): "json, missing_module",
+        }
+    )
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", False)
+    @mock.patch("airflow.providers_manager.ProvidersManager")
+    @mock.patch("airflow.executors.local_executor.importlib.import_module")
+    def test_worker_warm_up(self, mock_import_module, mock_providers_manager):
+        def fake_import_module(module):
+            if module == "missing_module":
+                raise ImportError(module)
+
+        mock_import_module.side_effect = fake_import_module
+        worker = QueuedLocalWorker(task_queue=mock.MagicMock(), result_queue=mock.MagicMock())
+        worker.warm_up()
+
+        assert [call.args[0] for call in mock_import_module.call_args_list] == [
+            "airflow.cli.commands.task_command",
+            "airflow.task.task_runner.standard_task_runner",
+            "json",
+            "missing_module",
+        ]
+        mock_providers_manager.return_value.initialize_providers_hooks.assert_called_once()
+
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", True)
+    @mock.patch("airflow.executors.local_executor.importlib.import_module")
+    def test_worker_warm_up_skipped_without_fork(self, mock_import_module):
+        worker = QueuedLocalWorker(task_queue=mock.MagicMock(), result_queue=mock.MagicMock())
+        with conf_vars({("core", "local_executor_warm_up"): "True"}):
+            worker.warm_up()
+        mock_import_module.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "enabled, executor_config, expected",
+        [
+            (True, {"lightweight": True}, True),
+            (True, {"lightweight": False}, False),
+            (True, {}, False),
+            (True, None, False),
+            (False, {"lightweight": True}, False),
+        ],
+    )
+    def test_is_lightweight_task(self, enabled, executor_config, expected):
+        with conf_vars({("core", "local_executor_lightweight_tasks"): str(enabled)}):
+            executor = LocalExecutor()
+        assert executor.is_lightweight_task(executor_config) is expected
+
+    @conf_vars({("core", "local_executor_lightweight_tasks"): "True"})
+    def test_execute_async_sends_lightweight_flag_to_workers(self):
+        command = ["airflow", "tasks", "run", "success", "some_parameter", "2020-10-07"]
+        executor = LocalExecutor(parallelism=1)
+        executor.impl = LocalExecutor.LimitedParallelism(executor)
+        executor.impl.queue = mock.MagicMock()
+
+        key = "success", "fake_ti", datetime.datetime.now(), 0
+        executor.execute_async(key=key, command=command, executor_config={"lightweight": True})
+        executor.execute_async(key=key, command=command, executor_config={})
+
+        assert executor.impl.queue.put.call_args_list == [
+            mock.call((key, command, True)),
+            mock.call((key, command, False)),
+        ]
+
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", False)
+    @mock.patch.object(QueuedLocalWorker, "_execute_work_in_fork", return_value=State.SUCCESS)
+    def test_worker_executes_lightweight_task(self, mock_execute_work_in_fork):
+        command = ["airflow", "tasks", "run", "success", "some_parameter", "2020-10-07"]
+        result_queue = mock.MagicMock()
+        worker = QueuedLocalWorker(task_queue=mock.MagicMock(), result_queue=result_queue)
+        key = "success", "fake_ti", datetime.datetime.now(), 0
+
+        worker.execute_work(key=key, command=command, lightweight=True)
+
+        mock_execute_work_in_fork.assert_called_once_with(command, lightweight=True)
+        result_queue.put.assert_called_once_with((key, State.SUCCESS))
+
+    @conf_vars({("core", "local_executor_lightweight_tasks"): "True"})
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", True)
+    def test_lightweight_tasks_disabled_without_fork(self):
+        executor = LocalExecutor(parallelism=1)
+        executor.start()
+        try:
+            assert not executor.is_lightweight_task({"lightweight": True})
+        finally:
+            executor.end()
+
     @mock.patch("airflow.executors.local_executor.LocalExecutor.sync")
     @mock.patch("airflow.executors.base_executor.BaseExecutor.trigger_tasks")
     @mock.patch("airflow.executors.base_executor.Stats.gauge")
@@ -30,7 +30,8 @@ from unittest.mock import MagicMock, patch
 import psutil
 import pytest
 import time_machine
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
 
 import airflow.example_dags
 from airflow import settings
@@ -46,7 +47,7 @@ from airflow.executors.executor_loader import ExecutorLoader
 from airflow.jobs.backfill_job_runner import BackfillJobRunner
 from airflow.jobs.job import Job, run_job
 from airflow.jobs.local_task_job_runner import LocalTaskJobRunner
-from airflow.jobs.scheduler_job_runner import SchedulerJobRunner
+from airflow.jobs.scheduler_job_runner import SchedulerJobRunner, SchedulingStateCache
 from airflow.models.dag import DAG, DagModel
 from airflow.models.dagbag import DagBag
 from airflow.models.dagrun import DagRun
@@ -54,6 +55,7 @@ from airflow.models.dataset import DatasetDagRunQueue, DatasetEvent, DatasetMode
 from airflow.models.db_callback_request import DbCallbackRequest
 from airflow.models.pool import Pool
 from airflow.models.serialized_dag import SerializedDagModel
+from airflow.models.taskfail import TaskFail
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance, TaskInstanceKey
 from airflow.operators.bash import BashOperator
 from airflow.operators.empty import EmptyOperator
@@ -378,7 +380,7 @@ class TestSchedulerJob:
             "finished (failed) although the task says it's queued. (Info: None) "
             "Was the task killed externally?",
         )
-        scheduler_job.executor.callback_sink.send.assert_called_once_with(task_callback)
+        scheduler_job.executor.callback_sink.send_many.assert_called_once_with([task_callback])
         scheduler_job.executor.callback_sink.reset_mock()
         mock_stats_incr.assert_called_once_with(
             "scheduler.tasks.killed_externally",
@@ -388,6 +390,91 @@ class TestSchedulerJob:
             },
         )
 
+    def test_process_executor_events_batches_callbacks(self, dag_maker):
+        """Each DAG is loaded once, and the callbacks of the TIs killed externally are sent together"""
+        session = settings.Session()
+        tis = []
+        for dag_id in ("test_batched_executor_events_1", "test_batched_executor_events_2"):
+            with dag_maker(dag_id=dag_id, fileloc=f"/{dag_id}.py", session=session):
+                for task_id in ("task_1", "task_2"):
+                    EmptyOperator(task_id=task_id, on_failure_callback=lambda context: None)
+            tis.extend(dag_maker.create_dagrun().get_task_instances(session=session))
+
+        executor = MockExecutor(do_update=False)
+        scheduler_job = Job(executor=executor)
+        self.job_runner = SchedulerJobRunner(scheduler_job)
+        self.job_runner.processor_agent = mock.MagicMock()
+        for ti in tis:
+            ti.state = State.QUEUED
+            session.merge(ti)
+            executor.event_buffer[ti.key] = State.FAILED, None
+        session.commit()
+
+        with mock.patch.object(
+            self.job_runner.dagbag, "get_dag", wraps=self.job_runner.dagbag.get_dag
+        ) as mock_get_dag:
+            self.job_runner._process_executor_events(session=session)
+
+        assert mock_get_dag.call_count == 2
+        executor.callback_sink.send.assert_not_called()
+        executor.callback_sink.send_many.assert_called_once()
+        (requests,) = executor.callback_sink.send_many.call_args.args
+        assert sorted(request.simple_task_instance.key for request in requests) == sorted(
+            ti.key for ti in tis
+        )
+
+    def test_process_executor_events_sends_callbacks_without_send_callbacks(self, dag_maker):
+        """Executors which do not subclass BaseExecutor may not have send_callbacks"""
+        session = settings.Session()
+        with dag_maker(dag_id="test_executor_without_send_callbacks", session=session):
+            EmptyOperator(task_id="task", on_failure_callback=lambda context: None)
+        (ti,) = dag_maker.create_dagrun().get_task_instances(session=session)
+
+        executor = mock.MagicMock(spec=["get_event_buffer", "has_task", "send_callback"])
+        executor.get_event_buffer.return_value = {ti.key: (State.FAILED, None)}
+        executor.has_task.return_value = False
+        scheduler_job = Job(executor=executor)
+        self.job_runner = SchedulerJobRunner(scheduler_job)
+        self.job_runner.processor_agent = mock.MagicMock()
+        ti.state = State.QUEUED
+        session.merge(ti)
+        session.commit()
+
+        self.job_runner._process_executor_events(session=session)
+
+        executor.send_callback.assert_called_once()
+        assert executor.send_callback.call_args.args[0].simple_task_instance.key == ti.key
+
+    def test_process_executor_events_fails_tis_without_callbacks_at_once(self, dag_maker):
+        session = settings.Session()
+        with dag_maker(dag_id="test_fail_tis_at_once", session=session):
+            EmptyOperator(task_id="no_retries")
+            EmptyOperator(task_id="retries", retries=1)
+            EmptyOperator(task_id="email", email="test@example.com")
+        tis = dag_maker.create_dagrun().get_task_instances(session=session)
+
+        executor = MockExecutor(do_update=False)
+        scheduler_job = Job(executor=executor)
+        self.job_runner = SchedulerJobRunner(scheduler_job)
+        self.job_runner.processor_agent = mock.MagicMock()
+        for ti in tis:
+            ti.state = State.QUEUED
+            session.merge(ti)
+            executor.event_buffer[ti.key] = State.FAILED, None
+        session.commit()
+
+        with mock.patch.object(TaskInstance, "handle_failure", autospec=True) as mock_handle_failure:
+            self.job_runner._process_executor_events(session=session)
+        session.commit()
+
+        # Only the task sending emails goes through handle_failure
+        assert [call.args[0].task_id for call in mock_handle_failure.call_args_list] == ["email"]
+        states = {ti.task_id: ti.state for ti in dag_maker.dag_run.get_task_instances(session=session)}
+        assert states["no_retries"] == State.FAILED
+        assert states["retries"] == State.UP_FOR_RETRY
+        query = select(func.count()).select_from(TaskFail).where(TaskFail.dag_id == "test_fail_tis_at_once")
+        assert session.scalar(query) == 2
+
     @mock.patch("airflow.jobs.scheduler_job_runner.TaskCallbackRequest")
     @mock.patch("airflow.jobs.scheduler_job_runner.Stats.incr")
     def test_process_executor_event_missing_dag(self, mock_stats_incr, mock_task_callback, dag_maker, caplog):
@@ -578,6 +665,26 @@ class TestSchedulerJob:
         assert ti_with_dagrun.key in res_keys
         session.rollback()
 
+    @time_machine.travel(DEFAULT_DATE, tick=False)
+    def test_find_executable_task_instances_sets_queued_dttm(self, dag_maker, session):
+        with dag_maker(dag_id="test_find_executable_task_instances_sets_queued_dttm", session=session):
+            EmptyOperator(task_id="dummy")
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        dr = dag_maker.create_dagrun()
+        ti = dr.get_task_instance("dummy", session=session)
+        # Queued by a previous try
+        ti.queued_dttm = DEFAULT_DATE - timedelta(hours=1)
+        ti.state = State.SCHEDULED
+        session.flush()
+
+        (res,) = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+
+        # The executor reads it from the returned TI to emit executor.dispatch_latency
+        assert res.queued_dttm == DEFAULT_DATE
+        session.rollback()
+
     def test_find_executable_task_instances_pool(self, dag_maker):
         dag_id = "SchedulerJobTest.test_find_executable_task_instances_pool"
         task_id_1 = "dummy"
@@ -836,6 +943,7 @@ class TestSchedulerJob:
         self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
 
         self.job_runner.dagbag = mock.MagicMock()
+        self.job_runner.dagbag.get_scheduling_view.return_value = None
         self.job_runner.dagbag.get_dag.return_value = None
 
         dr = dag_maker.create_dagrun(state=DagRunState.RUNNING)
@@ -848,6 +956,8 @@ class TestSchedulerJob:
         res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
         session.flush()
         assert 0 == len(res)
+        self.job_runner.dagbag.get_scheduling_view.assert_called_once_with(dag_id, session=session)
+        self.job_runner.dagbag.get_dag.assert_not_called()
         tis = dr.get_task_instances(session=session)
         assert len(tis) == 2
         assert all(ti.state == State.FAILED for ti in tis)
@@ -1027,6 +1137,98 @@ class TestSchedulerJob:
         assert 0 == len(res)
         session.rollback()
 
+    @conf_vars({("scheduler", "scheduling_state_cache_refresh_loops"): "5"})
+    def test_find_executable_task_instances_with_scheduling_state_cache(self, dag_maker, session):
+        dag_id = "SchedulerJobTest.test_find_executable_task_instances_with_scheduling_state_cache"
+        with dag_maker(dag_id=dag_id, max_active_tasks=1, session=session):
+            EmptyOperator(task_id="dummy")
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        assert self.job_runner._scheduling_state_cache is not None
+
+        dr1 = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        dr2 = dag_maker.create_dagrun_after(dr1, run_type=DagRunType.SCHEDULED)
+        ti1 = dr1.task_instances[0]
+        ti2 = dr2.task_instances[0]
+        ti1.state = State.SCHEDULED
+        ti2.state = State.SCHEDULED
+        session.merge(ti1)
+        session.merge(ti2)
+        session.flush()
+
+        with mock.patch.object(
+            SchedulingStateCache, "refresh", autospec=True, side_effect=SchedulingStateCache.refresh
+        ) as mock_refresh:
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+            assert [ti.key for ti in res] == [ti1.key]
+
+            # The queued TI was recorded in the cache, so the DAG limit holds without re-reading the DB
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+            assert res == []
+
+            # Once the executor reports the TI as finished, its slot is freed
+            ti1.state = State.SUCCESS
+            self.job_runner._scheduling_state_cache.record_inactive([ti1])
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+            assert [ti.key for ti in res] == [ti2.key]
+
+        assert mock_refresh.call_count == 1
+        session.rollback()
+
+    def test_scheduling_state_cache_refresh_after_loops(self):
+        cache = SchedulingStateCache(refresh_loops=2)
+        assert cache.needs_refresh
+
+        cache.refresh(session=mock.MagicMock())
+        assert not cache.needs_refresh
+        cache.tick()
+        assert not cache.needs_refresh
+        cache.tick()
+        assert cache.needs_refresh
+
+        cache.refresh(session=mock.MagicMock())
+        cache.invalidate()
+        assert cache.needs_refresh
+
+    @pytest.mark.parametrize("lock_not_available", [True, False])
+    @conf_vars({("scheduler", "scheduling_state_cache_refresh_loops"): "5"})
+    def test_scheduling_state_cache_invalidated_when_critical_section_fails(
+        self, dag_maker, session, lock_not_available
+    ):
+        with dag_maker(dag_id="test_scheduling_state_cache_rollback", session=session):
+            EmptyOperator(task_id="dummy")
+        ti = dag_maker.create_dagrun(session=session).task_instances[0]
+        session.commit()
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        scheduler_job.executor = MockExecutor(do_update=False)
+        self.job_runner.processor_agent = mock.MagicMock(spec=DagFileProcessorAgent)
+        cache = self.job_runner._scheduling_state_cache
+        cache.refresh(session=session)
+
+        def queue_then_fail(session):
+            # The TI is recorded as queued, but its state change is rolled back
+            cache.record_active([ti])
+            raise OperationalError("SELECT", {}, Exception("lock"))
+
+        with mock.patch.object(
+            self.job_runner, "_critical_section_enqueue_task_instances", side_effect=queue_then_fail
+        ), mock.patch(
+            "airflow.jobs.scheduler_job_runner.is_lock_not_available_error", return_value=lock_not_available
+        ):
+            if lock_not_available:
+                assert self.job_runner._do_scheduling(session) == 0
+            else:
+                with pytest.raises(OperationalError):
+                    self.job_runner._do_scheduling(session)
+
+        assert cache.needs_refresh
+        cache.refresh(session=session)
+        assert cache.get_concurrency_map().dag_active_tasks_map["test_scheduling_state_cache_rollback"] == 0
+        session.rollback()
+
     def test_find_executable_task_instances_concurrency_queued(self, dag_maker):
         dag_id = "SchedulerJobTest.test_find_executable_task_instances_concurrency_queued"
         with dag_maker(dag_id=dag_id, max_active_tasks=3):
@@ -1140,6 +1342,44 @@ class TestSchedulerJob:
         assert 1 == len(res)
         session.rollback()
 
+    def test_find_executable_task_instances_loads_task_concurrency_limits_once_per_dag(self, dag_maker):
+        dag_id = "SchedulerJobTest.test_find_executable_task_instances_loads_task_concurrency_limits"
+        session = settings.Session()
+        with dag_maker(dag_id=dag_id, max_active_tasks=16, session=session):
+            EmptyOperator(task_id="dummy1", max_active_tis_per_dag=1)
+            EmptyOperator(task_id="dummy2", max_active_tis_per_dagrun=1)
+            EmptyOperator(task_id="dummy3")
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+
+        dr1 = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        dr2 = dag_maker.create_dagrun_after(dr1, run_type=DagRunType.SCHEDULED)
+        for dr in (dr1, dr2):
+            for ti in dr.task_instances:
+                ti.state = State.SCHEDULED
+                session.merge(ti)
+        session.flush()
+
+        with mock.patch.object(
+            self.job_runner.dagbag, "get_scheduling_view", wraps=self.job_runner.dagbag.get_scheduling_view
+        ) as mock_get_scheduling_view, mock.patch.object(self.job_runner.dagbag, "get_dag") as mock_get_dag:
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+
+        assert mock_get_scheduling_view.call_count == 1
+        mock_get_dag.assert_not_called()
+        # dummy1 is limited to one TI across runs, the other tasks run once per DAG run
+        assert sorted((ti.run_id, ti.task_id) for ti in res) == sorted(
+            [
+                (dr1.run_id, "dummy1"),
+                (dr1.run_id, "dummy2"),
+                (dr1.run_id, "dummy3"),
+                (dr2.run_id, "dummy2"),
+                (dr2.run_id, "dummy3"),
+            ]
+        )
+        session.rollback()
+
     def test_change_state_for_executable_task_instances_no_tis_with_state(self, dag_maker):
         dag_id = "SchedulerJobTest.test_change_state_for__no_tis_with_state"
         task_id_1 = "dummy"
@@ -1639,6 +1879,38 @@ class TestSchedulerJob:
         ti2 = dr2.get_task_instance(task_id=op1.task_id, session=session)
         assert ti2.state == State.QUEUED, "Tasks run by Backfill Jobs should not be reset"
 
+    @conf_vars({("scheduler", "dag_sharding"): "True"})
+    def test_refresh_dag_shard(self, session):
+        dag_ids = {f"test_refresh_dag_shard_{i}" for i in range(20)}
+        for dag_id in dag_ids:
+            session.add(DagModel(dag_id=dag_id, is_active=True))
+
+        runners = []
+        for _ in range(2):
+            scheduler_job = Job(state=State.RUNNING, latest_heartbeat=timezone.utcnow())
+            runners.append(SchedulerJobRunner(job=scheduler_job, subdir=os.devnull))
+            session.add(scheduler_job)
+        dead_job = Job(state=State.RUNNING, latest_heartbeat=timezone.utcnow() - timedelta(hours=1))
+        SchedulerJobRunner(job=dead_job, subdir=os.devnull)
+        session.add(dead_job)
+        session.flush()
+
+        for runner in runners:
+            assert runner._owned_dag_ids is None
+            runner._refresh_dag_shard(session=session)
+
+        first_shard, second_shard = (runner._owned_dag_ids for runner in runners)
+        assert first_shard and second_shard
+        assert first_shard.isdisjoint(second_shard)
+        assert first_shard | second_shard == dag_ids
+
+        # When the other scheduler stops heartbeating, its DAGs are taken over
+        runners[1].job.latest_heartbeat = timezone.utcnow() - timedelta(hours=1)
+        session.flush()
+        runners[0]._refresh_dag_shard(session=session)
+        assert runners[0]._owned_dag_ids == dag_ids
+        session.rollback()
+
     def test_fail_stuck_queued_tasks(self, dag_maker, session):
         with dag_maker("test_fail_stuck_queued_tasks"):
             op1 = EmptyOperator(task_id="op1")
@@ -1739,6 +2011,28 @@ class TestSchedulerJob:
         assert session.query(DagRun.state).filter(DagRun.state == State.QUEUED).count() == 0
         assert orm_dag.next_dagrun_create_after is None
 
+    @conf_vars({("scheduler", "enable_profiling"): "True"})
+    def test_do_scheduling_records_profile(self, dag_maker, session):
+        with dag_maker(session=session):
+            EmptyOperator(task_id="task")
+        dag_maker.create_dagrun(state=State.RUNNING, session=session)
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        scheduler_job.executor = MockExecutor(do_update=False)
+        self.job_runner.processor_agent = mock.MagicMock(spec=DagFileProcessorAgent)
+        self.job_runner._profiler.start()
+        try:
+            self.job_runner._do_scheduling(session)
+        finally:
+            self.job_runner._profiler.stop()
+        self.job_runner._profiler.end_loop()
+
+        phases = self.job_runner._profiler.summary()["phases"]
+        assert set(phases) == {"create_dagruns", "schedule_dag_runs", "critical_section"}
+        assert phases["critical_section"]["queries_mean"] > 0
+        session.rollback()
+
     def test_runs_are_created_after_max_active_runs_was_reached(self, dag_maker, session):
         """
         Test that when creating runs once max_active_runs is reached the runs does not stick
@@ -3526,6 +3820,34 @@ class TestSchedulerJob:
 
         assert dag.get_last_dagrun().creating_job_id == scheduler_job.id
 
+    def test_create_dag_runs_creates_task_instances_in_bulk(self, dag_maker, session):
+        dag_models = []
+        for i in range(3):
+            with dag_maker(dag_id=f"test_create_dag_runs_in_bulk_{i}", session=session):
+                EmptyOperator(task_id="dummy1")
+                EmptyOperator(task_id="dummy2")
+            dag_models.append(dag_maker.dag_model)
+
+        scheduler_job = Job(executor=self.null_exec)
+        self.job_runner = SchedulerJobRunner(job=scheduler_job)
+
+        with mock.patch.object(
+            DagRun, "bulk_verify_integrity", wraps=DagRun.bulk_verify_integrity
+        ) as mock_bulk_verify_integrity, mock.patch.object(
+            DagRun, "verify_integrity"
+        ) as mock_verify_integrity:
+            self.job_runner._create_dag_runs(dag_models, session)
+
+        assert mock_bulk_verify_integrity.call_count == 1
+        mock_verify_integrity.assert_not_called()
+        for dag_model in dag_models:
+            dr = session.scalars(select(DagRun).where(DagRun.dag_id == dag_model.dag_id)).one()
+            assert dr.state == State.QUEUED
+            assert dr.creating_job_id == scheduler_job.id
+            assert {ti.task_id for ti in dr.get_task_instances(session=session)} == {"dummy1", "dummy2"}
+            assert dag_model.next_dagrun > dr.execution_date
+        session.rollback()
+
     @pytest.mark.need_serialized_dag
     def test_create_dag_runs_datasets(self, session, dag_maker):
         """
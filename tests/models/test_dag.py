@@ -59,7 +59,13 @@ from airflow.models.dag import (
     get_dataset_triggered_next_run_info,
 )
 from airflow.models.dagrun import DagRun
-from airflow.models.dataset import DatasetDagRunQueue, DatasetEvent, DatasetModel, TaskOutletDatasetReference
+from airflow.models.dataset import (
+    DagScheduleDatasetReference,
+    DatasetDagRunQueue,
+    DatasetEvent,
+    DatasetModel,
+    TaskOutletDatasetReference,
+)
 from airflow.models.param import DagParam, Param, ParamsDict
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskfail import TaskFail
@@ -879,14 +885,14 @@ class TestDag:
                 assert row[0] is not None
 
         # Re-sync should do fewer queries
-        with assert_queries_count(8):
+        with assert_queries_count(12):
             DAG.bulk_write_to_db(dags)
-        with assert_queries_count(8):
+        with assert_queries_count(12):
             DAG.bulk_write_to_db(dags)
         # Adding tags
         for dag in dags:
             dag.tags.append("test-dag2")
-        with assert_queries_count(9):
+        with assert_queries_count(13):
             DAG.bulk_write_to_db(dags)
         with create_session() as session:
             assert {"dag-bulk-sync-0", "dag-bulk-sync-1", "dag-bulk-sync-2", "dag-bulk-sync-3"} == {
@@ -905,7 +911,7 @@ class TestDag:
         # Removing tags
         for dag in dags:
             dag.tags.remove("test-dag")
-        with assert_queries_count(9):
+        with assert_queries_count(13):
             DAG.bulk_write_to_db(dags)
         with create_session() as session:
             assert {"dag-bulk-sync-0", "dag-bulk-sync-1", "dag-bulk-sync-2", "dag-bulk-sync-3"} == {
@@ -924,7 +930,7 @@ class TestDag:
         # Removing all tags
         for dag in dags:
             dag.tags = None
-        with assert_queries_count(9):
+        with assert_queries_count(13):
             DAG.bulk_write_to_db(dags)
         with create_session() as session:
             assert {"dag-bulk-sync-0", "dag-bulk-sync-1", "dag-bulk-sync-2", "dag-bulk-sync-3"} == {
@@ -1082,6 +1088,20 @@ class TestDag:
             .all()
         ) == {(task_id, dag_id1, d2_orm.id)}
 
+    def test_bulk_write_to_db_datasets_query_count(self):
+        """The stored datasets are looked up together, not one by one."""
+        datasets = [Dataset(f"s3://dataset{i}") for i in range(20)]
+        dag = DAG(dag_id="test_dataset_query_count", start_date=DEFAULT_DATE, schedule=datasets)
+        BashOperator(dag=dag, task_id="task", bash_command="echo 1", outlets=datasets)
+        DAG.bulk_write_to_db([dag])
+
+        with assert_queries_count(13):
+            DAG.bulk_write_to_db([dag])
+        with create_session() as session:
+            assert session.query(DatasetModel).count() == 20
+            assert session.query(DagScheduleDatasetReference).count() == 20
+            assert session.query(TaskOutletDatasetReference).count() == 20
+
     def test_bulk_write_to_db_unorphan_datasets(self):
         """
         Datasets can lose their last reference and be orphaned, but then if a reference to them reappears, we
@@ -2470,6 +2490,18 @@ my_postgres_conn:
         orm_dag_owners = DagOwnerAttributes.get_all(session)
         assert orm_dag_owners == expected_owners
 
+        # Test dag owner links are updated
+        dag = DAG(
+            "dag",
+            start_date=DEFAULT_DATE,
+            owner_links={"owner1": "https://myotherlink.com", "owner3": "https://mylink.com"},
+        )
+        dag.sync_to_db(session=session)
+
+        expected_owners = {"dag": {"owner1": "https://myotherlink.com", "owner3": "https://mylink.com"}}
+        orm_dag_owners = DagOwnerAttributes.get_all(session)
+        assert orm_dag_owners == expected_owners
+
         # Test dag owner links are removed completely
         dag = DAG(
             "dag",
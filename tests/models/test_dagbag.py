@@ -38,7 +38,7 @@ import airflow.example_dags
 from airflow import settings
 from airflow.exceptions import SerializationError
 from airflow.models.dag import DAG, DagModel
-from airflow.models.dagbag import DagBag
+from airflow.models.dagbag import DagBag, _DagCacheBudget
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.utils.dates import timezone as tz
@@ -865,7 +865,7 @@ class TestDagBag:
         # and the session was roll-backed before even reaching 'SerializedDagModel.write_dag'
         mock_s10n_write_dag.assert_has_calls(
             [
-                mock.call(mock_dag, min_update_interval=mock.ANY, session=mock_session),
+                mock.call(mock_dag, min_update_interval=mock.ANY, stored_state=None, session=mock_session),
             ]
         )
 
@@ -977,6 +977,41 @@ class TestDagBag:
         assert set(updated_ser_dag_1.tags) == {"example", "example2", "new_tag"}
         assert updated_ser_dag_1_update_time > ser_dag_1_update_time
 
+    @patch("airflow.models.dagbag.settings.MIN_SERIALIZED_DAG_UPDATE_INTERVAL", 5)
+    @patch("airflow.models.dagbag.settings.MIN_SERIALIZED_DAG_FETCH_INTERVAL", 5)
+    def test_get_scheduling_view(self):
+        """
+        Test that the scheduling view of a DAG is refreshed when the Serialized DAG is updated,
+        after 'min_serialized_dag_fetch_interval' seconds are passed, without building the DAG.
+        """
+        with time_machine.travel((tz.datetime(2020, 1, 5, 0, 0, 0)), tick=False):
+            example_bash_op_dag = DagBag(include_examples=True).dags.get("example_bash_operator")
+            SerializedDagModel.write_dag(dag=example_bash_op_dag)
+
+            dag_bag = DagBag(read_dags_from_db=True)
+            view = dag_bag.get_scheduling_view("example_bash_operator")
+            assert sorted(view.task_ids) == sorted(example_bash_op_dag.task_ids)
+            assert "example_bash_operator" not in dag_bag.dags
+
+        with time_machine.travel((tz.datetime(2020, 1, 5, 0, 0, 4)), tick=False):
+            with assert_queries_count(0):
+                assert dag_bag.get_scheduling_view("example_bash_operator") is view
+
+        with time_machine.travel((tz.datetime(2020, 1, 5, 0, 0, 6)), tick=False):
+            example_bash_op_dag.get_task("runme_0").priority_weight = 10
+            SerializedDagModel.write_dag(dag=example_bash_op_dag)
+
+        with time_machine.travel((tz.datetime(2020, 1, 5, 0, 0, 8)), tick=False):
+            updated_view = dag_bag.get_scheduling_view("example_bash_operator")
+
+        assert updated_view is not view
+        assert updated_view.get_task("runme_0").priority_weight == 10
+
+    def test_get_scheduling_view_missing_dag(self):
+        dag_bag = DagBag(read_dags_from_db=True)
+
+        assert dag_bag.get_scheduling_view("missing_dag") is None
+
     @patch("airflow.models.dagbag.settings.MIN_SERIALIZED_DAG_UPDATE_INTERVAL", 5)
     @patch("airflow.models.dagbag.settings.MIN_SERIALIZED_DAG_FETCH_INTERVAL", 5)
     def test_get_dag_refresh_race_condition(self):
@@ -1045,6 +1080,133 @@ class TestDagBag:
             assert serialized_dag.dag_id == dag.dag_id
             assert set(serialized_dag.task_dict) == set(dag.task_dict)
 
+    @conf_vars({("core", "dagbag_cache_max_dags"): "2"})
+    @patch("airflow.models.dagbag.Stats")
+    def test_get_dag_evicts_least_recently_used_dags(self, mock_stats):
+        """DAGs read from the database are evicted from the bag beyond the cache limits"""
+        db.clear_db_serialized_dags()
+        dag_ids = ["example_bash_operator", "example_branch_operator", "example_python_operator"]
+        example_dagbag = DagBag(str(example_dags_folder), include_examples=False)
+        for dag_id in dag_ids:
+            SerializedDagModel.write_dag(example_dagbag.dags[dag_id])
+
+        dagbag = DagBag(read_dags_from_db=True)
+        dagbag.get_dag("example_bash_operator")
+        dagbag.get_dag("example_branch_operator")
+        # The DAG is now the most recently used
+        dagbag.get_dag("example_bash_operator")
+        dagbag.get_dag("example_python_operator")
+
+        assert set(dagbag.dags) == {"example_bash_operator", "example_python_operator"}
+        assert set(dagbag.dags_hash) == {"example_bash_operator", "example_python_operator"}
+        assert set(dagbag.dags_last_fetched) == {"example_bash_operator", "example_python_operator"}
+        mock_stats.incr.assert_has_calls(
+            [
+                mock.call("dagbag.cache_miss"),
+                mock.call("dagbag.cache_miss"),
+                mock.call("dagbag.cache_hit"),
+                mock.call("dagbag.cache_miss"),
+                mock.call("dagbag.cache_eviction"),
+            ]
+        )
+
+        # An evicted DAG is read from the database again
+        assert dagbag.get_dag("example_branch_operator").dag_id == "example_branch_operator"
+        assert set(dagbag.dags) == {"example_branch_operator", "example_python_operator"}
+
+    @pytest.mark.parametrize("max_size_mb, sized", [("0", False), ("512", True)])
+    def test_get_dag_sizes_dags_only_with_size_limit(self, max_size_mb, sized):
+        """DAGs read from the database are only sized when their total size is limited"""
+        db.clear_db_serialized_dags()
+        example_dagbag = DagBag(str(example_dags_folder), include_examples=False)
+        SerializedDagModel.write_dag(example_dagbag.dags["example_bash_operator"])
+
+        with conf_vars({("core", "dagbag_cache_max_size_mb"): max_size_mb}):
+            dagbag = DagBag(read_dags_from_db=True)
+        with patch(
+            "airflow.models.dagbag._estimate_serialized_size", return_value=100
+        ) as mock_estimate_size, patch("airflow.models.dagbag.Stats") as mock_stats:
+            dagbag.get_dag("example_bash_operator")
+
+        assert mock_estimate_size.called == sized
+        assert dagbag._cache_budget.total_size == (100 if sized else 0)
+        assert mock_stats.gauge.called == sized
+
+    def test_dag_cache_budget(self):
+        budget = _DagCacheBudget(max_entries=0, max_size=100)
+
+        assert budget.add("a", 40) == []
+        assert budget.add("b", 40) == []
+        budget.touch("a")
+        assert budget.add("c", 40) == ["b"]
+        assert budget.total_size == 80
+        # Replacing an entry replaces its size
+        assert budget.add("a", 10) == []
+        assert budget.total_size == 50
+        # An entry larger than the budget evicts all the others, but is kept
+        assert budget.add("d", 200) == ["c", "a"]
+        assert len(budget) == 1
+        budget.remove("d")
+        assert budget.total_size == 0
+
+    def test_collect_dags_in_parallel(self):
+        """DAGs parsed by a pool of processes are the same as the DAGs parsed sequentially"""
+        dagbag = DagBag(dag_folder=str(example_dags_folder), include_examples=False)
+        parallel_dagbag = DagBag(dag_folder=str(example_dags_folder), include_examples=False, parallelism=2)
+
+        assert set(parallel_dagbag.dag_ids) == set(dagbag.dag_ids)
+        assert parallel_dagbag.import_errors == dagbag.import_errors
+        assert parallel_dagbag.file_last_changed == dagbag.file_last_changed
+        assert sorted(stat[:1] + stat[2:] for stat in parallel_dagbag.dagbag_stats) == sorted(
+            stat[:1] + stat[2:] for stat in dagbag.dagbag_stats
+        )
+        for dag_id, dag in dagbag.dags.items():
+            parallel_dag = parallel_dagbag.dags[dag_id]
+            assert isinstance(parallel_dag, SerializedDAG)
+            assert parallel_dag.fileloc == dag.fileloc
+            assert set(parallel_dag.task_dict) == set(dag.task_dict)
+
+    def test_collect_dags_in_parallel_reports_duplicated_dag_ids(self, tmp_path):
+        for name in ("a.py", "b.py"):
+            (tmp_path / name).write_text(
+                "import datetime\n"
+                "from airflow.models.dag import DAG\n"
+                "dag = DAG('duplicated', start_date=datetime.datetime(2021, 1, 1))\n"
+            )
+
+        dagbag = DagBag(dag_folder=os.fspath(tmp_path), include_examples=False, parallelism=2)
+
+        assert dagbag.dag_ids == ["duplicated"]
+        assert dagbag.dags["duplicated"].fileloc == os.fspath(tmp_path / "a.py")
+        assert list(dagbag.import_errors) == [os.fspath(tmp_path / "b.py")]
+        assert "AirflowDagDuplicatedIdException" in dagbag.import_errors[os.fspath(tmp_path / "b.py")]
+
+    def test_sync_to_db_writes_dags_serialized_in_parallel(self, tmp_path):
+        """DAGs serialized by the worker processes are written as when parsed sequentially"""
+        (tmp_path / "dag.py").write_text(
+            "import datetime\n"
+            "from airflow.models.dag import DAG\n"
+            "from airflow.operators.empty import EmptyOperator\n"
+            "with DAG('parallel_sync', start_date=datetime.datetime(2021, 1, 1)):\n"
+            "    EmptyOperator(task_id='task')\n"
+        )
+
+        def get_dag_hash():
+            with create_session() as session:
+                return SerializedDagModel.get_latest_version_hash("parallel_sync", session=session)
+
+        db.clear_db_serialized_dags()
+        DagBag(dag_folder=os.fspath(tmp_path), include_examples=False).sync_to_db()
+        dag_hash = get_dag_hash()
+
+        db.clear_db_serialized_dags()
+        dagbag = DagBag(dag_folder=os.fspath(tmp_path), include_examples=False, parallelism=2)
+        with patch("airflow.models.serialized_dag.SerializedDAG.to_dict") as mock_to_dict:
+            dagbag.sync_to_db()
+
+        mock_to_dict.assert_not_called()
+        assert get_dag_hash() == dag_hash
+
     @patch("airflow.settings.task_policy", cluster_policies.example_task_policy)
     def test_task_cluster_policy_violation(self):
         """
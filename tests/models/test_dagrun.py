@@ -18,6 +18,7 @@
 from __future__ import annotations
 
 import datetime
+import logging
 from functools import reduce
 from typing import TYPE_CHECKING, Mapping
 from unittest import mock
@@ -993,6 +994,69 @@ def test_verify_integrity_task_start_and_end_date(Stats_incr, session, run_type,
     )
 
 
+@mock.patch.object(Stats, "incr")
+def test_bulk_verify_integrity(Stats_incr, session):
+    """Test that the tasks of several runs are created like by verify_integrity on each run"""
+
+    with DAG("test", start_date=DEFAULT_DATE) as dag:
+        EmptyOperator(task_id="without")
+        EmptyOperator(task_id="with_start_date", start_date=DEFAULT_DATE + datetime.timedelta(1))
+
+    dag_runs = []
+    for run_type in (DagRunType.MANUAL, DagRunType.BACKFILL_JOB):
+        dag_run = DagRun(
+            dag_id=dag.dag_id,
+            run_type=run_type,
+            execution_date=DEFAULT_DATE,
+            run_id=DagRun.generate_run_id(run_type, DEFAULT_DATE),
+        )
+        dag_run.dag = dag
+        session.add(dag_run)
+        dag_runs.append(dag_run)
+    session.flush()
+    DagRun.bulk_verify_integrity(dag_runs, session=session)
+
+    manual_run, backfill_run = dag_runs
+    assert [ti.task_id for ti in manual_run.task_instances] == ["without"]
+    assert sorted(ti.task_id for ti in backfill_run.task_instances) == ["with_start_date", "without"]
+    for run_type, expected_tis in ((DagRunType.MANUAL, 1), (DagRunType.BACKFILL_JOB, 2)):
+        Stats_incr.assert_any_call(
+            "task_instance_created_EmptyOperator", expected_tis, tags={"dag_id": "test", "run_type": run_type}
+        )
+        Stats_incr.assert_any_call(
+            "task_instance_created",
+            expected_tis,
+            tags={"dag_id": "test", "run_type": run_type, "task_type": "EmptyOperator"},
+        )
+
+
+def test_bulk_verify_integrity_rolls_back_on_integrity_error(session, caplog):
+    """Test that the session is rolled back when the task instances of a run already exist"""
+
+    with DAG("test", start_date=DEFAULT_DATE) as dag:
+        EmptyOperator(task_id="task")
+
+    dag_run = DagRun(
+        dag_id=dag.dag_id,
+        run_type=DagRunType.MANUAL,
+        execution_date=DEFAULT_DATE,
+        run_id=DagRun.generate_run_id(DagRunType.MANUAL, DEFAULT_DATE),
+    )
+    dag_run.dag = dag
+    session.add(dag_run)
+    session.flush()
+
+    with caplog.at_level(logging.INFO), mock.patch.object(
+        session, "rollback", wraps=session.rollback
+    ) as mock_rollback:
+        # Creating the task instances a second time violates the primary key
+        DagRun.bulk_verify_integrity([dag_run], session=session)
+        DagRun.bulk_verify_integrity([dag_run], session=session)
+
+    mock_rollback.assert_called_once_with()
+    assert f"Hit IntegrityError while creating the TIs for test- {dag_run.run_id}" in caplog.text
+
+
 @pytest.mark.parametrize("is_noop", [True, False])
 def test_expand_mapped_task_instance_at_create(is_noop, dag_maker, session):
     with mock.patch("airflow.settings.task_instance_mutation_hook") as mock_mut:
@@ -22,6 +22,7 @@ from unittest import mock
 
 import pendulum
 import pytest
+from sqlalchemy import select
 
 import airflow.example_dags as example_dags_module
 from airflow.datasets import Dataset
@@ -184,9 +185,29 @@ class TestSerializedDagModel:
             DAG("dag_2"),
             DAG("dag_3"),
         ]
-        with assert_queries_count(10):
+        with assert_queries_count(4):
             SDM.bulk_sync_to_db(dags)
 
+        # Whether the DAGs changed is checked in one query
+        with assert_queries_count(1):
+            SDM.bulk_sync_to_db(dags)
+
+    @mock.patch("airflow.models.serialized_dag.MIN_SERIALIZED_DAG_UPDATE_INTERVAL", 0)
+    def test_bulk_sync_to_db_updates_changed_dags(self):
+        dags = [DAG("dag_1"), DAG("dag_2")]
+        SDM.bulk_sync_to_db(dags)
+        dags[1].tags = ["new_tag"]
+
+        with mock.patch.object(SDM, "get_stored_states", wraps=SDM.get_stored_states) as get_stored_states:
+            SDM.bulk_sync_to_db(dags)
+        get_stored_states.assert_called_once()
+
+        with create_session() as session:
+            s_dag_1, s_dag_2 = session.scalars(select(SDM).order_by(SDM.dag_id))
+            assert s_dag_1.data["dag"].get("tags", []) == []
+            assert s_dag_2.data["dag"]["tags"] == ["new_tag"]
+            assert s_dag_2.dag_hash == SDM(dags[1]).dag_hash
+
     @pytest.mark.parametrize("dag_dependencies_fields", [{"dag_dependencies": None}, {}])
     def test_get_dag_dependencies_default_to_empty(self, dag_dependencies_fields):
         """Test a pre-2.1.0 serialized DAG can deserialize DAG dependencies."""
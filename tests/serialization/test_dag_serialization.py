@@ -43,6 +43,7 @@ from airflow.decorators import teardown
 from airflow.decorators.base import DecoratedOperator
 from airflow.exceptions import AirflowException, SerializationError
 from airflow.hooks.base import BaseHook
+from airflow.models.abstractoperator import AbstractOperator
 from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
 from airflow.models.connection import Connection
 from airflow.models.dag import DAG
@@ -69,6 +70,7 @@ from airflow.timetables.simple import NullTimetable, OnceTimetable
 from airflow.utils import timezone
 from airflow.utils.operator_resources import Resources
 from airflow.utils.task_group import TaskGroup
+from airflow.utils.weight_rule import WeightRule
 from airflow.utils.xcom import XCOM_RETURN_KEY
 from tests.test_utils.config import conf_vars
 from tests.test_utils.mock_operators import AirflowLink2, CustomOperator, GoogleLink, MockOperator
@@ -222,6 +224,7 @@ serialized_simple_dag_ground_truth = {
         },
         "edge_info": {},
         "dag_dependencies": [],
+        "priority_weights": {},
         "params": {},
     },
 }
@@ -1171,6 +1174,7 @@ class TestStringifiedDAGs:
             "has_on_failure_callback",
             "dag_dependencies",
             "params",
+            "priority_weights",
         }
 
         keys_for_backwards_compat: set = {
@@ -1179,6 +1183,40 @@ class TestStringifiedDAGs:
         dag_params: set = set(dag_schema.keys()) - ignored_keys - keys_for_backwards_compat
         assert set(DAG.get_serialized_fields()) == dag_params
 
+    @pytest.mark.parametrize("weight_rule", [WeightRule.DOWNSTREAM, WeightRule.UPSTREAM, WeightRule.ABSOLUTE])
+    def test_priority_weights_are_precomputed(self, weight_rule):
+        with DAG("test_priority_weights", start_date=datetime(2019, 8, 1)) as dag:
+            start = EmptyOperator(task_id="start", weight_rule=weight_rule)
+            middle = [
+                EmptyOperator(task_id=f"middle_{i}", priority_weight=i, weight_rule=weight_rule)
+                for i in range(3)
+            ]
+            end = EmptyOperator(task_id="end", priority_weight=10, weight_rule=weight_rule)
+            start >> middle >> end
+            EmptyOperator(task_id="unrelated", weight_rule=weight_rule)
+
+        expected = {task.task_id: task.priority_weight_total for task in dag.tasks}
+        assert dag.get_priority_weights() == expected
+
+        serialized_dag = SerializedDAG.to_dict(dag)
+        SerializedDAG.validate_schema(serialized_dag)
+        deserialized_dag = SerializedDAG.from_dict(serialized_dag)
+
+        assert deserialized_dag._priority_weights is not None
+        with mock.patch.object(AbstractOperator, "get_flat_relative_ids") as mock_get_flat_relative_ids:
+            assert {task.task_id: task.priority_weight_total for task in deserialized_dag.tasks} == expected
+        mock_get_flat_relative_ids.assert_not_called()
+
+    def test_priority_weights_of_partial_subset(self):
+        with DAG("test_priority_weights_subset", start_date=datetime(2019, 8, 1)) as dag:
+            EmptyOperator(task_id="first") >> EmptyOperator(task_id="second")
+        deserialized_dag = SerializedDAG.from_dict(SerializedDAG.to_dict(dag))
+
+        subset = deserialized_dag.partial_subset("first", include_downstream=False)
+
+        assert deserialized_dag.get_task("first").priority_weight_total == 2
+        assert subset.get_task("first").priority_weight_total == 1
+
     def test_operator_subclass_changing_base_defaults(self):
         assert (
             BaseOperator(task_id="dummy").do_xcom_push is True
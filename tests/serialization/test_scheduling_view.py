@@ -0,0 +1,93 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from airflow.exceptions import TaskNotFound
+from airflow.models.dag import DAG
+from airflow.operators.empty import EmptyOperator
+from airflow.serialization.scheduling_view import SchedulingDagView
+from airflow.serialization.serialized_objects import SerializedDAG
+from airflow.utils.trigger_rule import TriggerRule
+from airflow.utils.weight_rule import WeightRule
+
+SCHEDULING_ATTRIBUTES = [
+    "trigger_rule",
+    "downstream_task_ids",
+    "upstream_task_ids",
+    "pool",
+    "pool_slots",
+    "priority_weight",
+    "weight_rule",
+    "max_active_tis_per_dag",
+    "max_active_tis_per_dagrun",
+]
+
+
+@pytest.fixture
+def serialized_data():
+    with DAG(dag_id="test_scheduling_view", start_date=datetime(2023, 1, 1)) as dag:
+        start = EmptyOperator(task_id="start")
+        limited = EmptyOperator(
+            task_id="limited",
+            pool="other_pool",
+            pool_slots=2,
+            priority_weight=5,
+            weight_rule=WeightRule.UPSTREAM,
+            max_active_tis_per_dag=1,
+            max_active_tis_per_dagrun=2,
+        )
+        mapped = EmptyOperator.partial(
+            task_id="mapped", pool="mapped_pool", max_active_tis_per_dag=3
+        ).expand_kwargs([{}, {}])
+        end = EmptyOperator(task_id="end", trigger_rule=TriggerRule.ALL_DONE)
+        start >> [limited, mapped] >> end
+    return SerializedDAG.to_dict(dag)
+
+
+class TestSchedulingDagView:
+    def test_tasks_match_deserialized_dag(self, serialized_data):
+        view = SchedulingDagView(serialized_data, dag_hash="hash")
+        dag = SerializedDAG.from_dict(serialized_data)
+
+        assert view.dag_id == dag.dag_id
+        assert sorted(view.task_ids) == sorted(dag.task_ids)
+        for task_id in dag.task_ids:
+            task_view = view.get_task(task_id)
+            task = dag.get_task(task_id)
+            for attr in SCHEDULING_ATTRIBUTES:
+                assert getattr(task_view, attr) == getattr(task, attr), (task_id, attr)
+            assert task_view.is_mapped == (task_id == "mapped")
+
+    def test_does_not_reference_serialized_data(self, serialized_data):
+        view = SchedulingDagView(serialized_data)
+        serialized_data["dag"]["tasks"].clear()
+
+        assert view.has_task("limited")
+        assert view.get_task("limited").max_active_tis_per_dag == 1
+        assert view.get_task("end").upstream_task_ids == {"limited", "mapped"}
+
+    def test_missing_task(self, serialized_data):
+        view = SchedulingDagView(serialized_data)
+
+        assert not view.has_task("missing")
+        with pytest.raises(TaskNotFound):
+            view.get_task("missing")
@@ -39,6 +39,7 @@ from airflow.models import (
 )
 from airflow.models.dag import DagOwnerAttributes
 from airflow.models.dagcode import DagCode
+from airflow.models.dagparsingprofile import DagParsingProfile
 from airflow.models.dagwarning import DagWarning
 from airflow.models.dataset import (
     DagScheduleDatasetReference,
@@ -144,6 +145,11 @@ def clear_db_dag_warnings():
         session.query(DagWarning).delete()
 
 
+def clear_db_dag_parsing_profiles():
+    with create_session() as session:
+        session.query(DagParsingProfile).delete()
+
+
 def clear_db_xcom():
     with create_session() as session:
         session.query(XCom).delete()
@@ -197,6 +203,7 @@ def clear_all():
     clear_rendered_ti_fields()
     clear_db_import_errors()
     clear_db_dag_warnings()
+    clear_db_dag_parsing_profiles()
     clear_db_logs()
     clear_db_jobs()
     clear_db_task_fail()
@@ -1242,6 +1242,44 @@ def test_mapped_task_check_before_expand(dag_maker, session):
     assert results[0].passed is False
 
 
+def test_mapped_task_upstream_states_calculated_once_per_dep_context(dag_maker, session):
+    with dag_maker(session=session):
+
+        @task
+        def t(x):
+            return x
+
+        @task
+        def t2(x):
+            return x
+
+        t2.expand(x=t.expand(x=[1, 2, 3]))
+
+    dr: DagRun = dag_maker.create_dagrun()
+    t2_ti = dr.get_task_instance("t2", session=session)
+    t2_ti.task = dr.dag.get_task("t2")
+    t2_ti.map_index = 0
+    t2_tis = [t2_ti]
+    for map_index in (1, 2):
+        t2_tis.append(TaskInstance(t2_ti.task, run_id=dr.run_id, map_index=map_index))
+        t2_tis[-1].dag_run = dr
+        session.add(t2_tis[-1])
+    for ti in dr.get_task_instances(session=session):
+        if ti.task_id == "t":
+            ti.state = SKIPPED
+    session.flush()
+
+    dep_context = DepContext(flag_upstream_failed=True)
+    with mock.patch.object(
+        _UpstreamTIStates, "calculate", side_effect=_UpstreamTIStates.calculate
+    ) as mock_calculate:
+        for ti in t2_tis:
+            assert not TriggerRuleDep().is_met(ti=ti, session=session, dep_context=dep_context)
+            assert ti.state == SKIPPED
+
+    assert mock_calculate.call_count == 1
+
+
 class TestTriggerRuleDepSetupConstraint:
     @staticmethod
     def get_ti(dr, task_id):
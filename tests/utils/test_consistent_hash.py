@@ -0,0 +1,54 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from airflow.utils.consistent_hash import ConsistentHashRing
+
+KEYS = [f"dag_{i}" for i in range(1000)]
+
+
+class TestConsistentHashRing:
+    def test_get_node_is_deterministic(self):
+        ring = ConsistentHashRing(["1", "2", "3"])
+        other_ring = ConsistentHashRing(["3", "1", "2"])
+
+        assert [ring.get_node(key) for key in KEYS] == [other_ring.get_node(key) for key in KEYS]
+
+    def test_keys_are_spread_over_all_nodes(self):
+        ring = ConsistentHashRing(["1", "2", "3"])
+
+        counts = Counter(ring.get_node(key) for key in KEYS)
+
+        assert set(counts) == {"1", "2", "3"}
+        assert min(counts.values()) > 200
+
+    def test_only_keys_of_removed_node_move(self):
+        ring = ConsistentHashRing(["1", "2", "3"])
+        smaller_ring = ConsistentHashRing(["1", "2"])
+
+        for key in KEYS:
+            if ring.get_node(key) != "3":
+                assert smaller_ring.get_node(key) == ring.get_node(key)
+
+    def test_empty_ring(self):
+        with pytest.raises(ValueError, match="empty hash ring"):
+            ConsistentHashRing([]).get_node("dag")
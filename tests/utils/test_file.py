@@ -25,7 +25,13 @@ from unittest import mock
 import pytest
 
 from airflow.utils import file as file_utils
-from airflow.utils.file import correct_maybe_zipped, find_path_from_directory, open_maybe_zipped
+from airflow.utils.file import (
+    correct_maybe_zipped,
+    find_path_from_directory,
+    is_path_ignored,
+    open_maybe_zipped,
+    walk_not_ignored,
+)
 from tests.models import TEST_DAGS_FOLDER
 from tests.test_utils.config import conf_vars
 
@@ -152,6 +158,88 @@ class TestListPyFilesPath:
         assert os.path.join(test_dir, "symlink", "hello_world.py") in found
         assert os.path.join(test_dir, "folder", "hello_world.py") not in found
 
+    @pytest.mark.parametrize(
+        "ignore_file_name, ignore_file_syntax",
+        [(".airflowignore", "regexp"), (".airflowignore_glob", "glob")],
+    )
+    def test_is_path_ignored(self, ignore_file_name, ignore_file_syntax):
+        found = set(find_path_from_directory(TEST_DAGS_FOLDER, ignore_file_name, ignore_file_syntax))
+
+        for root, _, files in os.walk(TEST_DAGS_FOLDER):
+            for file in files:
+                path = os.path.join(root, file)
+                assert is_path_ignored(TEST_DAGS_FOLDER, path, ignore_file_name, ignore_file_syntax) == (
+                    path not in found
+                ), path
+
+    def test_is_path_ignored_respects_symlinks(self, test_dir):
+        ignore_list_file = ".airflowignore"
+
+        symlinked_file = os.path.join(test_dir, "symlink", "hello_world.py")
+        ignored_file = os.path.join(test_dir, "folder", "hello_world.py")
+
+        assert not is_path_ignored(test_dir, symlinked_file, ignore_list_file)
+        assert is_path_ignored(test_dir, ignored_file, ignore_list_file)
+
+    @pytest.mark.parametrize(
+        "ignore_file_syntax, pattern_format", [("regexp", "dag_{}"), ("glob", "dag_{}*")]
+    )
+    def test_find_path_from_directory_reads_ignore_file_again_when_changed(
+        self, tmp_path, ignore_file_syntax, pattern_format
+    ):
+        ignore_file = tmp_path / ".airflowignore"
+        ignore_file.write_text(pattern_format.format("a"))
+        for name in ("dag_a.py", "dag_bc.py"):
+            (tmp_path / name).write_text("")
+
+        with mock.patch.object(file_utils, "_ignore_file_rules_cache", {}):
+            found = list(find_path_from_directory(tmp_path, ".airflowignore", ignore_file_syntax))
+            assert found == [os.path.join(tmp_path, "dag_bc.py")]
+
+            # The rules of the unchanged ignore file are not read again
+            with mock.patch.object(file_utils.re2, "sub") as mock_sub:
+                found = list(find_path_from_directory(tmp_path, ".airflowignore", ignore_file_syntax))
+                assert found == [os.path.join(tmp_path, "dag_bc.py")]
+                mock_sub.assert_not_called()
+
+            ignore_file.write_text(pattern_format.format("bc"))
+            found = list(find_path_from_directory(tmp_path, ".airflowignore", ignore_file_syntax))
+            assert found == [os.path.join(tmp_path, "dag_a.py")]
+
+    @pytest.mark.parametrize(
+        "ignore_file_syntax, pattern", [("regexp", "node_modules"), ("glob", "node_modules/")]
+    )
+    def test_walk_not_ignored(self, tmp_path, ignore_file_syntax, pattern):
+        (tmp_path / ".airflowignore").write_text(pattern)
+        for directory in ("dags/node_modules/package", "dags/subdir", "node_modules"):
+            (tmp_path / directory).mkdir(parents=True)
+
+        walked = [root for root, _, _ in walk_not_ignored(tmp_path, ".airflowignore", ignore_file_syntax)]
+        walked_from_subdir = [
+            root
+            for root, _, _ in walk_not_ignored(
+                tmp_path, ".airflowignore", ignore_file_syntax, start_dir_path=tmp_path / "dags"
+            )
+        ]
+        walked_from_ignored = list(
+            walk_not_ignored(
+                tmp_path, ".airflowignore", ignore_file_syntax, start_dir_path=tmp_path / "dags/node_modules"
+            )
+        )
+
+        assert sorted(walked) == sorted(map(str, [tmp_path, tmp_path / "dags", tmp_path / "dags/subdir"]))
+        assert sorted(walked_from_subdir) == sorted(map(str, [tmp_path / "dags", tmp_path / "dags/subdir"]))
+        assert walked_from_ignored == []
+
+    def test_glob_ignore_rules_are_matched_in_order(self, tmp_path):
+        (tmp_path / ".airflowignore").write_text("*.py\n!keep_*.py\nkeep_not_this.py\n")
+        for name in ("dag.py", "keep_this.py", "keep_not_this.py"):
+            (tmp_path / name).write_text("")
+
+        found = list(find_path_from_directory(tmp_path, ".airflowignore", "glob"))
+
+        assert found == [os.path.join(tmp_path, "keep_this.py")]
+
     def test_find_path_from_directory_fails_on_recursive_link(self, test_dir):
         # add a recursive link
         recursing_src = os.path.join(test_dir, "folder2", "recursor")
@@ -206,6 +294,65 @@ class TestListPyFilesPath:
         assert "airflow.if_branch" not in modules
         assert "airflow.else_branch" not in modules
 
+    def test_get_file_content_hash(self, tmp_path):
+        package = tmp_path / "package"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "module.py").write_text("VALUE = 1\n")
+        (tmp_path / "helpers.py").write_text("from package import module\n")
+        dag_file = tmp_path / "dag.py"
+        dag_file.write_text("import os\nimport helpers\n")
+
+        content_hash = file_utils.get_file_content_hash(os.fspath(dag_file), [os.fspath(tmp_path)])
+        assert content_hash == file_utils.get_file_content_hash(os.fspath(dag_file), [os.fspath(tmp_path)])
+
+        # Modules imported by imported modules are hashed too
+        (package / "module.py").write_text("VALUE = 2\n")
+        new_content_hash = file_utils.get_file_content_hash(os.fspath(dag_file), [os.fspath(tmp_path)])
+        assert new_content_hash != content_hash
+
+        # Modules outside the search paths are not hashed
+        assert file_utils.get_file_content_hash(os.fspath(dag_file), []) != new_content_hash
+
+    def test_get_file_content_hash_relative_imports(self, tmp_path):
+        team = tmp_path / "team"
+        team.mkdir()
+        (team / "__init__.py").write_text("")
+        (team / "helpers.py").write_text("VALUE = 1\n")
+        (team / "utils.py").write_text("VALUE = 1\n")
+        (tmp_path / "common.py").write_text("VALUE = 1\n")
+        dag_file = team / "dag.py"
+        dag_file.write_text("from .helpers import VALUE\nfrom . import utils\nfrom ..common import VALUE\n")
+
+        # The modules are looked up next to the DAG file, not in the search paths
+        content_hash = file_utils.get_file_content_hash(os.fspath(dag_file), [])
+        for module in (team / "helpers.py", team / "utils.py", tmp_path / "common.py"):
+            module.write_text("VALUE = 2\n")
+            new_content_hash = file_utils.get_file_content_hash(os.fspath(dag_file), [])
+            assert new_content_hash != content_hash, module
+            content_hash = new_content_hash
+
+    def test_get_file_content_hash_nested_imports(self, tmp_path):
+        (tmp_path / "fallback.py").write_text("VALUE = 1\n")
+        (tmp_path / "lazy.py").write_text("VALUE = 1\n")
+        dag_file = tmp_path / "dag.py"
+        dag_file.write_text(
+            "try:\n"
+            "    import missing\n"
+            "except ImportError:\n"
+            "    import fallback\n"
+            "if True:\n"
+            "    def f():\n"
+            "        from lazy import VALUE\n"
+        )
+
+        content_hash = file_utils.get_file_content_hash(os.fspath(dag_file), [os.fspath(tmp_path)])
+        for module in (tmp_path / "fallback.py", tmp_path / "lazy.py"):
+            module.write_text("VALUE = 2\n")
+            new_content_hash = file_utils.get_file_content_hash(os.fspath(dag_file), [os.fspath(tmp_path)])
+            assert new_content_hash != content_hash, module
+            content_hash = new_content_hash
+
     def test_get_modules_from_invalid_file(self):
         file_path = os.path.join(TEST_DAGS_FOLDER, "README.md")  # just getting a non-python file
 
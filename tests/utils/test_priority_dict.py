@@ -0,0 +1,98 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import pickle
+import random
+from operator import itemgetter
+
+import pytest
+
+from airflow.utils.priority_dict import PriorityDict
+
+
+def sort_by_priority(items: dict) -> list:
+    return sorted(items.items(), key=lambda item: item[1][1], reverse=True)
+
+
+class TestPriorityDict:
+    def test_top(self):
+        items = PriorityDict(itemgetter(1), {"a": ("a", 1), "b": ("b", 3), "c": ("c", 2)})
+
+        assert items.top(2) == [("b", ("b", 3)), ("c", ("c", 2))]
+        assert items.top(10) == [("b", ("b", 3)), ("c", ("c", 2)), ("a", ("a", 1))]
+        assert items.top(0) == []
+        # Reading the top items does not remove them
+        assert len(items) == 3
+
+    def test_equal_priorities_are_ordered_by_insertion(self):
+        items = PriorityDict(itemgetter(1))
+        for key in ("c", "a", "b"):
+            items[key] = (key, 1)
+        # Replacing an item keeps its position
+        items["c"] = ("c2", 1)
+
+        assert [key for key, _ in items.top(3)] == ["c", "a", "b"]
+
+    def test_removed_and_replaced_items(self):
+        items = PriorityDict(itemgetter(1), {"a": ("a", 1), "b": ("b", 3), "c": ("c", 2), "d": ("d", 0)})
+        del items["b"]
+        assert items.pop("c") == ("c", 2)
+        assert items.pop("c", None) is None
+        with pytest.raises(KeyError):
+            items.pop("c")
+        items["d"] = ("d", 5)
+
+        assert items.top(3) == [("d", ("d", 5)), ("a", ("a", 1))]
+        items.clear()
+        assert items.top(3) == []
+
+    def test_matches_sorting(self):
+        rng = random.Random(42)
+        items = PriorityDict(itemgetter(1))
+        expected: dict[int, tuple[str, int]] = {}
+        for _ in range(5000):
+            key = rng.randrange(500)
+            if key in expected and rng.random() < 0.5:
+                del items[key]
+                del expected[key]
+            else:
+                items[key] = expected[key] = (str(key), rng.randrange(20))
+            n = rng.randrange(30)
+            assert items.top(n) == sort_by_priority(expected)[:n]
+        assert items == expected
+        # Stale entries of the heap do not accumulate
+        assert len(items._heap) <= 2 * len(items) + 64
+
+    def test_dict_methods(self):
+        items = PriorityDict(itemgetter(1))
+        items.update({"a": ("a", 1)}, b=("b", 2))
+        items.setdefault("c", ("c", 3))
+        items |= {"d": ("d", 4)}
+
+        assert [key for key, _ in items.top(4)] == ["d", "c", "b", "a"]
+        assert type(items.copy()) is dict
+        assert items.copy() == items
+
+    def test_pickle(self):
+        items = PriorityDict(itemgetter(1), {"a": ("a", 1), "b": ("b", 3)})
+
+        unpickled = pickle.loads(pickle.dumps(items))
+
+        assert isinstance(unpickled, PriorityDict)
+        assert unpickled.top(2) == items.top(2)
@@ -0,0 +1,84 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from airflow.utils.scheduler_profiler import SchedulerProfiler, read_profile
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    path = str(tmp_path / "scheduler_profile.json")
+    with mock.patch("airflow.utils.scheduler_profiler.get_profile_path", return_value=path):
+        yield path
+
+
+class TestSchedulerProfiler:
+    def test_phase_counts_queries(self, engine):
+        profiler = SchedulerProfiler(window_size=10, engine=engine)
+        profiler.start()
+        with engine.connect() as conn:
+            with profiler.phase("a"):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            with profiler.phase("b"):
+                conn.execute(text("SELECT 1"))
+            profiler.stop()
+            with profiler.phase("b"):
+                conn.execute(text("SELECT 1"))
+        profiler.end_loop()
+
+        phases = profiler.summary()["phases"]
+        assert phases["a"]["queries_mean"] == 2
+        # Phases run several times in a loop are summed up
+        assert phases["b"]["queries_mean"] == 1
+        assert phases["b"]["count"] == 1
+
+    def test_rolling_window(self, engine):
+        profiler = SchedulerProfiler(window_size=3, engine=engine)
+        for _ in range(5):
+            with profiler.phase("a"):
+                pass
+            profiler.end_loop()
+
+        summary = profiler.summary()
+        assert summary["total_loops"] == 5
+        assert summary["window_loops"] == 3
+        assert summary["phases"]["a"]["count"] == 3
+
+    def test_write_and_read(self, engine, profile_path):
+        assert read_profile() is None
+
+        profiler = SchedulerProfiler(window_size=3, engine=engine)
+        with profiler.phase("critical_section"):
+            pass
+        profiler.end_loop()
+        profiler.write()
+
+        profile = read_profile()
+        assert profile["window_loops"] == 1
+        assert set(profile["phases"]) == {"critical_section"}
@@ -0,0 +1,184 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import socket
+from unittest import mock
+
+import pytest
+
+from airflow.utils.scheduler_wakeup import (
+    SchedulerWakeupListener,
+    get_wakeup_socket_dir,
+    get_wakeup_socket_path,
+    notify_scheduler,
+)
+from tests.test_utils.config import conf_vars
+
+
+@pytest.fixture
+def socket_dir(tmp_path):
+    path = str(tmp_path / "wakeup")
+    with mock.patch("airflow.utils.scheduler_wakeup.get_wakeup_socket_dir", return_value=path):
+        yield path
+
+
+@pytest.fixture
+def sqlite_session():
+    session = mock.MagicMock()
+    session.get_bind.return_value.dialect.name = "sqlite"
+    return session
+
+
+@pytest.fixture
+def listener(socket_dir):
+    with mock.patch("airflow.utils.scheduler_wakeup.settings.engine") as mock_engine:
+        mock_engine.dialect.name = "sqlite"
+        listener = SchedulerWakeupListener()
+        listener.start()
+    yield listener
+    listener.close()
+
+
+class TestSchedulerWakeup:
+    @conf_vars({("scheduler", "use_wakeup_notifications"): "True"})
+    def test_wait_returns_on_notification(self, listener, sqlite_session):
+        assert not listener.wait(timeout=0)
+
+        notify_scheduler(session=sqlite_session)
+        notify_scheduler(session=sqlite_session)
+
+        assert listener.wait(timeout=1)
+        # Pending wakeups are all consumed by a single wait
+        assert not listener.wait(timeout=0)
+
+    @conf_vars({("scheduler", "use_wakeup_notifications"): "False"})
+    def test_notify_disabled(self, listener, sqlite_session):
+        notify_scheduler(session=sqlite_session)
+
+        assert not listener.wait(timeout=0)
+
+    @conf_vars({("scheduler", "use_wakeup_notifications"): "True"})
+    def test_notify_without_listener_does_not_fail(self, socket_dir, sqlite_session):
+        notify_scheduler(session=sqlite_session)
+
+    @conf_vars({("scheduler", "use_wakeup_notifications"): "True"})
+    def test_notify_postgres_uses_notify(self):
+        session = mock.MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+
+        notify_scheduler(session=session)
+
+        assert str(session.execute.call_args.args[0]) == "NOTIFY airflow_scheduler_wakeup"
+        session.begin_nested.assert_called_once_with()
+
+    @conf_vars({("scheduler", "use_wakeup_notifications"): "True"})
+    def test_notify_postgres_failure_only_rolls_back_savepoint(self, caplog):
+        session = mock.MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute.side_effect = RuntimeError("NOTIFY failed")
+
+        notify_scheduler(session=session)
+
+        # The savepoint is exited with the error, which rolls it back
+        exc_type = session.begin_nested.return_value.__exit__.call_args.args[0]
+        assert exc_type is RuntimeError
+        session.rollback.assert_not_called()
+        assert "Failed to send scheduler wakeup notification" in caplog.text
+
+    @conf_vars({("scheduler", "use_wakeup_notifications"): "True"})
+    def test_notify_wakes_up_every_scheduler_of_the_host(self, listener, socket_dir, sqlite_session):
+        with mock.patch("airflow.utils.scheduler_wakeup.os.getpid", return_value=os.getppid()):
+            other_listener = SchedulerWakeupListener()
+            with mock.patch("airflow.utils.scheduler_wakeup.settings.engine") as mock_engine:
+                mock_engine.dialect.name = "sqlite"
+                other_listener.start()
+        try:
+            # Each scheduler listens on its own socket
+            assert len(os.listdir(socket_dir)) == 2
+
+            notify_scheduler(session=sqlite_session)
+
+            assert listener.wait(timeout=1)
+            assert other_listener.wait(timeout=1)
+        finally:
+            other_listener.close()
+
+    def test_stale_sockets_are_removed(self, socket_dir):
+        os.makedirs(socket_dir)
+        stale_path = os.path.join(socket_dir, f"{socket.gethostname()}-999999999.sock")
+        other_host_path = os.path.join(socket_dir, "other-host-999999999.sock")
+        for path in (stale_path, other_host_path):
+            open(path, "w").close()
+
+        with mock.patch("airflow.utils.scheduler_wakeup.settings.engine") as mock_engine:
+            mock_engine.dialect.name = "sqlite"
+            listener = SchedulerWakeupListener()
+            listener.start()
+        listener.close()
+
+        assert os.listdir(socket_dir) == ["other-host-999999999.sock"]
+
+    def test_socket_path(self, tmp_path):
+        with mock.patch("airflow.utils.scheduler_wakeup.settings.AIRFLOW_HOME", str(tmp_path)):
+            path = get_wakeup_socket_path()
+        assert path == os.path.join(
+            tmp_path, "scheduler-wakeup", f"{socket.gethostname()}-{os.getpid()}.sock"
+        )
+
+    def test_socket_dir_with_long_airflow_home(self, tmp_path):
+        airflow_home = str(tmp_path / ("a" * 100))
+        with mock.patch("airflow.utils.scheduler_wakeup.settings.AIRFLOW_HOME", airflow_home):
+            socket_dir = get_wakeup_socket_dir()
+            path = get_wakeup_socket_path()
+        assert not socket_dir.startswith(airflow_home)
+        assert len(os.fsencode(path)) < 108
+
+    def test_postgres_connection_lost(self):
+        listener = SchedulerWakeupListener()
+        with mock.patch("airflow.utils.scheduler_wakeup.settings.engine") as mock_engine:
+            mock_engine.dialect.name = "postgresql"
+            lost_connection = mock_engine.raw_connection.return_value
+            listener.start()
+            lost_connection.driver_connection.poll.side_effect = Exception("server closed the connection")
+
+            with mock.patch(
+                "airflow.utils.scheduler_wakeup.select.select", return_value=([listener], [], [])
+            ):
+                assert listener.wait(timeout=0)
+            lost_connection.close.assert_called_once()
+
+            new_connection = mock.MagicMock()
+            mock_engine.raw_connection.return_value = new_connection
+            with mock.patch("airflow.utils.scheduler_wakeup.select.select", return_value=([], [], [])):
+                assert not listener.wait(timeout=0)
+            cursor = new_connection.driver_connection.cursor.return_value.__enter__.return_value
+            cursor.execute.assert_called_once_with("LISTEN airflow_scheduler_wakeup")
+
+    @mock.patch("airflow.utils.scheduler_wakeup.time.sleep")
+    def test_wait_sleeps_when_postgres_is_unavailable(self, mock_sleep):
+        listener = SchedulerWakeupListener()
+        with mock.patch("airflow.utils.scheduler_wakeup.settings.engine") as mock_engine:
+            mock_engine.dialect.name = "postgresql"
+            mock_engine.raw_connection.side_effect = Exception("could not connect to server")
+            listener.start()
+
+            assert not listener.wait(timeout=5)
+
+        mock_sleep.assert_called_once_with(5)